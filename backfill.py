@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Bulk Summary Backfill
+Re-summarizes a JSONL or Parquet article dump through BatchSummarizer,
+resumably, into sharded JSONL result files
+
+Usage:
+    python backfill.py articles.jsonl --output backfill-out/
+    python backfill.py articles.parquet --output backfill-out/ --concurrency 16 --chunk-size 500
+    python backfill.py articles.jsonl --output backfill-out/ --writeback   # also update the database
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import signal
+import logging
+import argparse
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Consumed JSONL pages are dropped from the mapping in steps of this many bytes
+RELEASE_BYTES = 64 * 1024 * 1024
+
+
+def iter_jsonl(path: str, start: int = 0, stats: Optional[Dict[str, int]] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    (resume offset, article) for each line from byte offset start.
+
+    The file is memory-mapped and read sequentially; pages behind the
+    cursor are released as it goes, so resident memory doesn't grow with
+    the file. The resume offset is the start of the next line.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or start >= size:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            can_release = hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_DONTNEED')
+            released = start - start % mmap.PAGESIZE
+
+            position = start
+            while position < size:
+                end = mm.find(b'\n', position)
+                if end == -1:
+                    end = size
+                line = mm[position:end]
+                line_start, position = position, end + 1
+
+                if can_release and position - released >= RELEASE_BYTES:
+                    boundary = position - position % mmap.PAGESIZE
+                    mm.madvise(mmap.MADV_DONTNEED, released, boundary - released)
+                    released = boundary
+
+                if not line.strip():
+                    continue
+                try:
+                    article = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping invalid JSON at byte {line_start}")
+                    if stats is not None:
+                        stats['invalid'] = stats.get('invalid', 0) + 1
+                    continue
+
+                if isinstance(article, dict):
+                    yield min(position, size), article
+                elif stats is not None:
+                    stats['invalid'] = stats.get('invalid', 0) + 1
+
+
+def iter_parquet(path: str, start: int = 0, batch_rows: int = 1000,
+                 stats: Optional[Dict[str, int]] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    (resume row, article) for each row from row index start.
+    The file is memory-mapped and decoded one record batch at a time,
+    starting at the row group that holds row start.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError(f"Parquet input requires pyarrow: {str(e)}")
+
+    parquet = pq.ParquetFile(path, memory_map=True)
+    metadata = parquet.metadata
+
+    first_group = 0
+    skip = start
+    while first_group < metadata.num_row_groups and skip >= metadata.row_group(first_group).num_rows:
+        skip -= metadata.row_group(first_group).num_rows
+        first_group += 1
+    if first_group >= metadata.num_row_groups:
+        return
+
+    row = start - skip
+    for batch in parquet.iter_batches(batch_size=batch_rows,
+                                      row_groups=range(first_group, metadata.num_row_groups)):
+        articles = batch.to_pylist()
+        row += len(articles)
+        if skip:
+            if skip >= len(articles):
+                skip -= len(articles)
+                continue
+            articles = articles[skip:]
+            skip = 0
+
+        first_row = row - len(articles)
+        for index, article in enumerate(articles):
+            yield first_row + index + 1, article
+
+
+def detect_format(path: str) -> str:
+    return 'parquet' if path.lower().endswith(('.parquet', '.pq')) else 'jsonl'
+
+
+class ShardedResultWriter:
+    """
+    Appends results as JSONL to numbered shard files, starting a new shard
+    every shard_size results. state() after sync() is what a checkpoint
+    records; restore() truncates the open shard back to it, dropping results
+    written after the last checkpoint so a resumed run writes them once.
+    """
+
+    def __init__(self, directory: str, shard_size: int = 10000, prefix: str = 'results'):
+        self.directory = directory
+        self.shard_size = shard_size
+        self.prefix = prefix
+        self.shard = 0
+        self.lines = 0
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, shard: int) -> str:
+        return os.path.join(self.directory, f"{self.prefix}-{shard:05d}.jsonl")
+
+    def restore(self, state: Optional[Dict[str, int]]):
+        """
+        Go back to a checkpointed state; None is the empty state, dropping
+        whatever a run that died before its first checkpoint wrote
+        """
+        state = state or {'shard': 0, 'lines': 0, 'bytes': 0}
+        self.shard = state['shard']
+        self.lines = state['lines']
+        path = self.path(self.shard)
+        if os.path.exists(path):
+            with open(path, 'r+b') as f:
+                f.truncate(state['bytes'])
+
+        # Shards started after the checkpoint only hold results that will be redone
+        shard = self.shard + 1
+        while os.path.exists(self.path(shard)):
+            os.remove(self.path(shard))
+            shard += 1
+
+    def write(self, results: List[Dict[str, Any]]):
+        for result in results:
+            if self._file is None or self.lines >= self.shard_size:
+                self._rotate()
+            self._file.write(json.dumps(result, default=str) + '\n')
+            self.lines += 1
+
+    def _rotate(self):
+        if self._file is not None:
+            self._close_file()
+            self.shard += 1
+            self.lines = 0
+        self._file = open(self.path(self.shard), 'a', encoding='utf-8')
+
+    def sync(self):
+        """
+        Make everything written so far durable
+        """
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def state(self) -> Dict[str, int]:
+        path = self.path(self.shard)
+        return {
+            'shard': self.shard,
+            'lines': self.lines,
+            'bytes': os.path.getsize(path) if os.path.exists(path) else 0
+        }
+
+    def _close_file(self):
+        self.sync()
+        self._file.close()
+        self._file = None
+
+    def close(self):
+        if self._file is not None:
+            self._close_file()
+
+
+class Backfill:
+    """
+    Streams an article dump through BatchSummarizer in chunks.
+
+    After each chunk the results are written and fsynced, then the
+    checkpoint (input position, counters, output shard state) is
+    atomically replaced. A killed run resumes from the last checkpoint
+    and repeats at most the one unfinished chunk. Only one chunk of
+    articles and results is held in memory at a time.
+    """
+
+    def __init__(self, input_path: str, output_dir: str, batch_processor, input_format: Optional[str] = None,
+                 chunk_size: int = 200, shard_size: int = 10000, writer=None,
+                 skip_existing: bool = False, limit: Optional[int] = None,
+                 report_interval: float = 10.0):
+        self.input_path = input_path
+        self.output_dir = output_dir
+        self.batch_processor = batch_processor
+        self.input_format = input_format or detect_format(input_path)
+        self.chunk_size = chunk_size
+        self.writer = writer
+        self.skip_existing = skip_existing
+        self.limit = limit
+        self.report_interval = report_interval
+
+        self.results = ShardedResultWriter(output_dir, shard_size)
+        self.checkpoint_path = os.path.join(output_dir, 'checkpoint.json')
+        self._stopping = False
+        self._exhausted = False
+
+        self.position = 0
+        self.stats = {
+            'read': 0,
+            'summarized': 0,
+            'successful': 0,
+            'skipped': 0,
+            'invalid': 0,
+            'chunks': 0
+        }
+
+    def _input_identity(self) -> Dict[str, Any]:
+        info = os.stat(self.input_path)
+        return {'path': os.path.abspath(self.input_path), 'size': info.st_size, 'mtime': info.st_mtime}
+
+    def load_checkpoint(self, restart: bool = False) -> bool:
+        """
+        Pick up a previous run's progress; True if one was resumed
+        """
+        if not os.path.exists(self.checkpoint_path):
+            self.results.restore(None)
+            return False
+        if restart:
+            os.remove(self.checkpoint_path)
+            for name in os.listdir(self.output_dir):
+                if name.startswith(self.results.prefix + '-'):
+                    os.remove(os.path.join(self.output_dir, name))
+            return False
+
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+
+        if checkpoint['input'] != self._input_identity():
+            raise RuntimeError(f"{self.checkpoint_path} belongs to a different or modified input; "
+                               f"use --restart to start over")
+
+        self.position = checkpoint['position']
+        self.stats.update(checkpoint['stats'])
+        self.results.restore(checkpoint['output'])
+        logger.info(f"Resuming backfill at {self.input_format} position {self.position} "
+                    f"({self.stats['read']} articles already read)")
+        return True
+
+    def save_checkpoint(self, complete: bool = False):
+        checkpoint = {
+            'input': self._input_identity(),
+            'format': self.input_format,
+            'position': self.position,
+            'stats': self.stats,
+            'output': self.results.state(),
+            'complete': complete,
+            'updated_at': datetime.now().isoformat()
+        }
+        temporary = self.checkpoint_path + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.checkpoint_path)
+
+    def _articles(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        if self.input_format == 'parquet':
+            return iter_parquet(self.input_path, self.position, batch_rows=self.chunk_size, stats=self.stats)
+        return iter_jsonl(self.input_path, self.position, stats=self.stats)
+
+    def _chunks(self) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        remaining = None if self.limit is None else self.limit - self.stats['read']
+        if remaining is not None and remaining <= 0:
+            return
+
+        chunk = []
+        position = self.position
+        for position, article in self._articles():
+            chunk.append(article)
+            if remaining is not None:
+                remaining -= 1
+                if remaining <= 0:
+                    break
+            if len(chunk) >= self.chunk_size:
+                yield position, chunk
+                chunk = []
+        else:
+            self._exhausted = True
+        if chunk:
+            yield position, chunk
+
+    def process_chunk(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        batch = articles
+        if self.skip_existing:
+            batch = self.batch_processor.filter_articles_needing_summary(articles)
+            self.stats['skipped'] += len(articles) - len(batch)
+        if not batch:
+            return []
+
+        self.batch_processor.reset_stats()
+        return self.batch_processor.process_batch(batch)
+
+    def run(self) -> Dict[str, Any]:
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+
+        start = time.monotonic()
+        summarized_at_start = self.stats['summarized']
+        last_report = start
+
+        try:
+            for position, articles in self._chunks():
+                results = self.process_chunk(articles)
+
+                self.results.write(results)
+                self.results.sync()
+                if self.writer is not None:
+                    self.writer.add_results(results)
+                    # Database rows must be durable before the checkpoint moves past them
+                    self.writer.flush()
+
+                self.position = position
+                self.stats['read'] += len(articles)
+                self.stats['summarized'] += len(results)
+                self.stats['successful'] += sum(1 for r in results if r.get('success', False))
+                self.stats['chunks'] += 1
+                self.save_checkpoint()
+
+                now = time.monotonic()
+                if now - last_report >= self.report_interval:
+                    last_report = now
+                    rate = (self.stats['summarized'] - summarized_at_start) / (now - start)
+                    logger.info(f"Backfill: {self.stats['read']} read, {self.stats['summarized']} summarized, "
+                                f"{rate:.1f} articles/s sustained")
+
+                if self._stopping:
+                    logger.info("Backfill stopping at checkpoint")
+                    break
+            else:
+                self.save_checkpoint(complete=self._exhausted)
+        except KeyboardInterrupt:
+            # The last checkpoint stands; the interrupted chunk is redone on resume
+            logger.info("Backfill interrupted; resume from the last checkpoint")
+        finally:
+            self.results.close()
+
+        elapsed = time.monotonic() - start
+        summarized = self.stats['summarized'] - summarized_at_start
+        report = dict(self.stats)
+        report.update({
+            'position': self.position,
+            'complete': self._exhausted and not self._stopping,
+            'elapsed_seconds': round(elapsed, 2),
+            'articles_per_second': round(summarized / elapsed, 2) if elapsed > 0 else 0,
+            'output_dir': self.output_dir
+        })
+        return report
+
+    def stop(self):
+        self._stopping = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resumable bulk summary backfill')
+    parser.add_argument('input', help='JSONL (one article per line) or Parquet article dump')
+    parser.add_argument('--output', required=True, help='Directory for result shards and the checkpoint')
+    parser.add_argument('--format', choices=('jsonl', 'parquet'), help='Input format (default: from extension)')
+    parser.add_argument('--chunk-size', type=int, default=200, help='Articles per checkpointed chunk')
+    parser.add_argument('--concurrency', type=int, help='Concurrent requests (default SUMMARIZE_CONCURRENT_REQUESTS)')
+    parser.add_argument('--shard-size', type=int, default=10000, help='Results per output shard')
+    parser.add_argument('--limit', type=int, help='Stop after this many input articles in total')
+    parser.add_argument('--skip-existing', action='store_true',
+                        help='Skip articles that already have a current summary')
+    parser.add_argument('--writeback', action='store_true',
+                        help='Also write summaries to the configured database')
+    parser.add_argument('--restart', action='store_true', help='Ignore and delete an existing checkpoint')
+    args = parser.parse_args()
+
+    from batch_summarize import BatchSummarizer
+    from summarize import get_summarizer
+
+    batch_processor = BatchSummarizer(summarizer=get_summarizer())
+    if args.concurrency:
+        batch_processor.max_concurrent = args.concurrency
+    # One concurrent pass per chunk, without the handler's pauses between small sub-batches
+    batch_processor.batch_size = args.chunk_size
+
+    writer = None
+    if args.writeback:
+        from summary_writeback import get_summary_writer
+        writer = get_summary_writer()
+        if writer is None:
+            parser.error('--writeback needs SUMMARIZE_QUEUE_DSN or SUMMARIZE_QUEUE_SQLITE_PATH')
+
+    backfill = Backfill(args.input, args.output, batch_processor, input_format=args.format,
+                        chunk_size=args.chunk_size, shard_size=args.shard_size, writer=writer,
+                        skip_existing=args.skip_existing, limit=args.limit)
+    backfill.load_checkpoint(restart=args.restart)
+
+    try:
+        report = backfill.run()
+    finally:
+        batch_processor.close()
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,13 +7,22 @@ Processes multiple articles efficiently using sshleifer model
 import os
 import json
 import logging
-import asyncio
+import threading
+import contextvars
 import concurrent.futures
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
-import requests
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple
+from datetime import datetime
 import time
-from summarize import AtlanticAnvilSummarizer
+import metrics
+import deadlines
+from summarize import AtlanticAnvilSummarizer, get_summarizer
+from summarization_backends import HuggingFaceAPIBackend, create_async_session
+from near_duplicates import NearDuplicateIndex
+from text_processing import normalize_text
+from content_fingerprint import content_fingerprint, has_changed
+from priority_scheduler import PriorityScheduler
+from summary_writeback import get_summary_writer
+from summary_tiering import TierRouter, FULL, FAST, EXTRACTIVE
 
 # Configure logging
 logging.basicConfig(
@@ -28,75 +37,607 @@ class BatchSummarizer:
     Handles rate limiting, concurrent processing, and error recovery
     """
     
-    def __init__(self):
-        self.summarizer = AtlanticAnvilSummarizer()
+    def __init__(self, summarizer: Optional[AtlanticAnvilSummarizer] = None):
+        self.summarizer = summarizer or AtlanticAnvilSummarizer()
         self.batch_size = int(os.getenv('SUMMARIZE_BATCH_SIZE', 10))
         self.max_concurrent = int(os.getenv('SUMMARIZE_CONCURRENT_REQUESTS', 5))
         self.rate_limit_delay = 1.0  # Seconds between requests
         self.max_retries = 3
         
-        # Statistics tracking
-        self.stats = {
+        # End-to-end budget per batch (per article when streaming); 0 means none
+        self.deadline_seconds = float(os.getenv('SUMMARIZE_DEADLINE_SECONDS', 0))
+        # Time allowed after the deadline for cut-off articles to produce their fallback
+        self.deadline_grace = float(os.getenv('SUMMARIZE_DEADLINE_GRACE_SECONDS', 1.0))
+        
+        # asyncio pipeline over a pooled HTTP session instead of per-chunk thread pools
+        self.async_mode = os.getenv('SUMMARIZE_ASYNC', 'false').lower() in ('1', 'true', 'yes')
+        
+        # Near-duplicate clustering so syndicated copies share one summary
+        self.dedup_index = NearDuplicateIndex.from_env()
+        
+        # Fresh and trending stories are summarized first
+        self.scheduler = PriorityScheduler.from_env()
+        
+        # Optional per-batch routing to full, fast or extractive summaries within a latency budget
+        self.router = TierRouter.from_env(self.summarizer, self.max_concurrent, self.scheduler)
+        
+        # 'process' runs CPU-bound summarization in worker processes instead of threads
+        self.execution = os.getenv('SUMMARIZE_EXECUTION', 'thread').lower()
+        self._process_pool = None
+        
+        # Articles whose content fingerprint moved by at most this many SimHash bits keep their summary
+        self.fingerprint_max_distance = int(os.getenv('SUMMARIZE_FINGERPRINT_MAX_DISTANCE', 3))
+        
+        # Statistics tracking, per request context: the warm instance serves concurrent requests
+        self._stats = contextvars.ContextVar(f'batch_stats_{id(self)}', default=None)
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters of the current request (thread, task or copied context)
+        """
+        return self._ensure_stats()
+    
+    def _ensure_stats(self) -> Dict[str, Any]:
+        """
+        This context's counters, created if it has none yet. Contexts copied
+        afterwards (event loop tasks, executor calls) share the same dict.
+        """
+        stats = self._stats.get()
+        if stats is None:
+            stats = self.reset_stats()
+        return stats
+    
+    def reset_stats(self) -> Dict[str, Any]:
+        """
+        Start fresh counters for the request running in this context; other
+        requests on the same instance keep their own
+        """
+        stats = {
             'total_processed': 0,
             'successful': 0,
             'failed': 0,
+            'near_duplicates': 0,
+            'reused_summaries': 0,
+            'skipped': 0,
+            'unchanged': 0,
             'start_time': None,
             'end_time': None
         }
+        self._stats.set(stats)
+        return stats
     
-    def process_batch(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def process_batch(self, articles: List[Dict[str, Any]],
+                      deadline_seconds: Optional[float] = None) -> List[Dict[str, Any]]:
         """
-        Process a batch of articles with concurrent processing
+        Process a batch of articles with concurrent processing.
+        With a deadline (deadline_seconds or SUMMARIZE_DEADLINE_SECONDS) no
+        inference attempt or retry runs past it; articles cut off get the
+        extractive fallback.
         """
-        self.stats['start_time'] = datetime.now()
-        self.stats['total_processed'] = len(articles)
+        with deadlines.scope(self._deadline(deadline_seconds)):
+            if self.async_mode:
+                # asyncio (and aiohttp) load only when the async pipeline is used;
+                # the event loop's tasks inherit the deadline and this request's counters
+                self._ensure_stats()
+                import asyncio
+                return asyncio.run(self.process_batch_async(articles))
+            
+            return self._process_batch(articles)
+    
+    def _new_scheduler(self) -> Optional[PriorityScheduler]:
+        """
+        Scheduler for one batch or stream; the instance is shared between requests
+        """
+        return self.scheduler.spawn() if self.scheduler is not None else None
+    
+    def _deadline(self, seconds: Optional[float] = None) -> Optional[deadlines.Deadline]:
+        seconds = float(seconds or self.deadline_seconds)
+        return deadlines.Deadline(seconds) if seconds and seconds > 0 else None
+    
+    def _process_batch(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self._start_batch(articles)
         
-        logger.info(f"Starting batch processing of {len(articles)} articles")
+        # Only one representative per near-duplicate cluster is summarized
+        articles, clusters, all_results = self._group_near_duplicates(articles)
+        if self.router is not None:
+            articles = self.router.route(articles)
         
-        # Split into smaller chunks for concurrent processing
-        chunks = [articles[i:i + self.batch_size] 
-                 for i in range(0, len(articles), self.batch_size)]
+        if self.execution == 'process':
+            all_results.extend(self._process_with_pool(articles))
+            all_results.extend(self._resolve_near_duplicates(clusters, all_results))
+            self._finish_batch(all_results)
+            return all_results
         
-        all_results = []
+        # Split into smaller chunks for concurrent processing
+        chunk_count = (len(articles) + self.batch_size - 1) // self.batch_size
+        scheduler = self._new_scheduler()
+        if scheduler is not None:
+            # Each chunk takes the highest-priority articles still waiting
+            scheduler.push_many(articles)
+            chunks = (scheduler.pop_batch(self.batch_size) for _ in range(chunk_count))
+        else:
+            chunks = (articles[i:i + self.batch_size] for i in range(0, len(articles), self.batch_size))
         
         for chunk_idx, chunk in enumerate(chunks):
-            logger.info(f"Processing chunk {chunk_idx + 1}/{len(chunks)} ({len(chunk)} articles)")
+            logger.info(f"Processing chunk {chunk_idx + 1}/{chunk_count} ({len(chunk)} articles)")
             
-            # Process chunk with concurrent workers
-            chunk_results = self._process_chunk_concurrent(chunk)
+            # Process chunk as batched forward passes, or with concurrent workers
+            if self.summarizer.batched_inference:
+                chunk_results = self._process_chunk_batched(chunk)
+            else:
+                chunk_results = self._process_chunk_concurrent(chunk)
             all_results.extend(chunk_results)
             
-            # Rate limiting between chunks
-            if chunk_idx < len(chunks) - 1:
+            # Rate limiting between chunks (the shared adaptive limiter paces requests itself)
+            if chunk_idx < chunk_count - 1 and self.summarizer.backend.rate_limiter is None:
                 time.sleep(self.rate_limit_delay)
         
+        all_results.extend(self._resolve_near_duplicates(clusters, all_results))
+        
+        self._finish_batch(all_results)
+        
+        return all_results
+    
+    async def process_batch_async(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process a batch of articles on the asyncio pipeline
+        """
+        return [result async for result in self.stream_batch(articles)]
+    
+    async def stream_batch(self, articles: List[Dict[str, Any]]):
+        """
+        Yield results as each article finishes.
+        Concurrency is bounded by a semaphore and every request shares one
+        keep-alive connection pool, so there are no chunk barriers.
+        """
+        import asyncio
+        self._start_batch(articles)
+        
+        articles, clusters, reused = self._group_near_duplicates(articles)
+        if self.router is not None:
+            articles = self.router.route(articles)
+        all_results = []
+        
+        for result in reused:
+            all_results.append(result)
+            yield result
+        
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        session = None
+        if isinstance(self.summarizer.backend, HuggingFaceAPIBackend):
+            session = create_async_session(self.max_concurrent, timeout=self.summarizer.backend.timeout)
+        
+        scheduler = self._new_scheduler()
+        if scheduler is not None:
+            scheduler.push_many(articles)
+        
+        async def run(article):
+            async with semaphore:
+                if scheduler is not None:
+                    # Whichever task gets a slot takes the highest-priority article waiting
+                    article = scheduler.pop()
+                return await self._process_single_with_retry_async(article, session)
+        
+        tasks = [asyncio.ensure_future(run(article)) for article in articles]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                all_results.append(result)
+                yield result
+        finally:
+            # Consumer stopped early or failed: don't leave requests running
+            for task in tasks:
+                task.cancel()
+            if session is not None:
+                await session.close()
+        
+        # Copies of a cluster whose representative failed are summarized with the
+        # blocking path; run it off the event loop, keeping the deadline and counters
+        loop = asyncio.get_running_loop()
+        duplicates = await loop.run_in_executor(None, contextvars.copy_context().run,
+                                                self._resolve_near_duplicates, clusters, all_results)
+        for result in duplicates:
+            all_results.append(result)
+            yield result
+        
+        self._finish_batch(all_results)
+    
+    def stream_process(self, articles: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Filter and summarize an unbounded stream of articles, yielding each
+        result as it finishes. At most 2 x max_concurrent articles are in
+        flight, so memory stays flat however long the input is.
+        SUMMARIZE_DEADLINE_SECONDS applies to each article from when it starts.
+        """
+        self.stats['start_time'] = datetime.now()
+        self.stats.update({'skipped': 0, 'unchanged': 0, 'near_duplicates': 0, 'reused_summaries': 0})
+        received = completed = successful = 0
+        max_in_flight = self.max_concurrent * 2
+        
+        in_flight = {}  # future -> (article, cluster_id)
+        waiting = {}  # cluster_id -> duplicates of an in-flight representative
+        scheduler = self._new_scheduler()
+        
+        def drain(return_when, timeout=None):
+            nonlocal completed, successful
+            done, _ = concurrent.futures.wait(list(in_flight), timeout=timeout, return_when=return_when)
+            for future in done:
+                article, cluster_id = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {
+                        'success': False,
+                        'error': str(e),
+                        'original_title': article.get('title', 'Unknown'),
+                        'article_id': article.get('id')
+                    }
+                
+                results = [result]
+                if cluster_id is not None:
+                    if result.get('method') == 'sshleifer_model':
+                        self.dedup_index.set_summary(cluster_id, result, self._summary_settings(result))
+                    duplicates = waiting.pop(cluster_id, [])
+                    if result.get('success', False):
+                        results.extend(self._duplicate_result(result, dup, cluster_id) for dup in duplicates)
+                    else:
+                        # Don't spread one article's failure; the copies get their own attempts
+                        for dup in duplicates:
+                            submit((dup, None))
+                
+                for r in results:
+                    completed += 1
+                    successful += 1 if r.get('success', False) else 0
+                    yield r
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+            def submit(item):
+                in_flight[executor.submit(self._process_with_deadline, item[0])] = item
+            
+            for article in articles:
+                received += 1
+                if not self._needs_summary(article):
+                    self.stats['skipped'] += 1
+                    continue
+                
+                cluster_id, stored = self._cluster_article(article)
+                if stored is not None:
+                    self.stats['near_duplicates'] += 1
+                    self.stats['reused_summaries'] += 1
+                    completed += 1
+                    successful += 1 if stored.get('success', False) else 0
+                    yield stored
+                    continue
+                
+                if cluster_id is not None and cluster_id in waiting:
+                    self.stats['near_duplicates'] += 1
+                    waiting[cluster_id].append(article)
+                    continue
+                
+                if cluster_id is not None:
+                    waiting[cluster_id] = []
+                
+                if scheduler is not None:
+                    # While every slot is busy, up to one window of input waits in the
+                    # scheduler and the highest-priority article takes the next free slot
+                    scheduler.push(article, (article, cluster_id))
+                    while len(scheduler) and len(in_flight) < max_in_flight:
+                        submit(scheduler.pop())
+                    
+                    if len(scheduler) >= max_in_flight:
+                        yield from drain(concurrent.futures.FIRST_COMPLETED)
+                    else:
+                        yield from drain(concurrent.futures.FIRST_COMPLETED, timeout=0)
+                    continue
+                
+                submit((article, cluster_id))
+                
+                # Backpressure: stop reading input until a slot frees up
+                if len(in_flight) >= max_in_flight:
+                    yield from drain(concurrent.futures.FIRST_COMPLETED)
+            
+            while scheduler is not None and len(scheduler):
+                if len(in_flight) >= max_in_flight:
+                    yield from drain(concurrent.futures.FIRST_COMPLETED)
+                submit(scheduler.pop())
+            
+            while in_flight:
+                yield from drain(concurrent.futures.FIRST_COMPLETED)
+        
+        self.stats['total_processed'] = received
+        self._record_totals(completed, successful)
+    
+    def _start_batch(self, articles: List[Dict[str, Any]]):
+        self.stats['start_time'] = datetime.now()
+        self.stats['total_processed'] = len(articles)
+        
+        logger.info(f"Starting batch processing of {len(articles)} articles")
+    
+    def _finish_batch(self, all_results: List[Dict[str, Any]]):
+        self._record_totals(len(all_results), sum(1 for r in all_results if r.get('success', False)))
+        if self.router is not None:
+            self.router.finish_batch((self.stats['end_time'] - self.stats['start_time']).total_seconds())
+    
+    def _record_totals(self, completed: int, successful: int):
         self.stats['end_time'] = datetime.now()
-        self.stats['successful'] = sum(1 for r in all_results if r.get('success', False))
-        self.stats['failed'] = len(all_results) - self.stats['successful']
+        self.stats['successful'] = successful
+        self.stats['failed'] = completed - successful
         
         logger.info(f"Batch processing completed: {self.stats['successful']} successful, {self.stats['failed']} failed")
+    
+    def _group_near_duplicates(self, articles: List[Dict[str, Any]]):
+        """
+        Split articles into cluster representatives and near-duplicates.
+        Duplicates of clusters summarized in an earlier batch are answered
+        immediately from the stored summary.
+        """
+        if self.dedup_index is None:
+            return articles, {}, []
         
-        return all_results
+        representatives = []
+        clusters = {}  # cluster_id -> (representative_id, [duplicate articles])
+        reused = []
+        
+        for article in articles:
+            cluster_id, stored = self._cluster_article(article)
+            
+            if cluster_id is None:
+                representatives.append(article)
+                continue
+            
+            if cluster_id in clusters:
+                clusters[cluster_id][1].append(article)
+                continue
+            
+            if stored is not None:
+                reused.append(stored)
+                continue
+            
+            clusters[cluster_id] = (article.get('id'), [])
+            representatives.append(article)
+        
+        in_batch = sum(len(members) for _, members in clusters.values())
+        self.stats['near_duplicates'] = in_batch + len(reused)
+        self.stats['reused_summaries'] = len(reused)
+        
+        if in_batch or reused:
+            logger.info(f"Near-duplicate clustering: {len(representatives)} to summarize, "
+                        f"{in_batch} in-batch duplicates, {len(reused)} reused from earlier batches")
+        
+        return representatives, clusters, reused
+    
+    def _cluster_article(self, article: Dict[str, Any]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Assign an article to its near-duplicate cluster.
+        Returns (cluster_id, stored_result); cluster_id is None when the
+        article is not deduplicated, stored_result is set when an earlier
+        batch already summarized the cluster from another article whose
+        summary still applies.
+        """
+        article_id = article.get('id')
+        content = article.get('content', '') or article.get('description', '') or article.get('summary', '')
+        normalized = normalize_text(content)
+        
+        # Articles without an id can't be linked back, and short ones aren't worth it
+        if self.dedup_index is None or article_id is None or normalized.word_count < 30:
+            return None, None
+        
+        cluster_id = self.dedup_index.assign(article_id, normalized.text)
+        stored = self.dedup_index.get_summary(cluster_id, self.summarizer.generation_key())
+        
+        # The article's own earlier summary, or any made before its content changed, is stale:
+        # summarize it again as the cluster's representative, replacing the stored summary
+        if stored is not None and str(stored.get('article_id')) == str(article_id):
+            return cluster_id, None
+        if stored is not None and article.get('content_fingerprint') and not self.is_unchanged(article):
+            return cluster_id, None
+        
+        if stored is not None:
+            return cluster_id, self._duplicate_result(stored, article, cluster_id)
+        
+        return cluster_id, None
+    
+    def _resolve_near_duplicates(self, clusters: Dict[str, Any], results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Hand each representative's result to the rest of its cluster
+        """
+        results_by_id = {r.get('article_id'): r for r in results if r.get('article_id') is not None}
+        resolved = []
+        
+        for cluster_id, (representative_id, members) in clusters.items():
+            representative = results_by_id.get(representative_id)
+            
+            if representative is None or not representative.get('success', False):
+                # Representative failed or has no result; summarize the copies on their own
+                resolved.extend(self._process_single_with_retry(article) for article in members)
+                continue
+            
+            # Remember model summaries so later batches can reuse them
+            if representative.get('method') == 'sshleifer_model':
+                self.dedup_index.set_summary(cluster_id, representative, self._summary_settings(representative))
+            
+            resolved.extend(self._duplicate_result(representative, article, cluster_id) for article in members)
+        
+        return resolved
+    
+    def _summary_settings(self, result: Dict[str, Any]) -> str:
+        """
+        Generation settings a model result was made with, at its routed tier
+        """
+        return self.summarizer.generation_key(self._generation(result.get('tier')))
+    
+    def _duplicate_result(self, source: Dict[str, Any], article: Dict[str, Any], cluster_id: str) -> Dict[str, Any]:
+        """
+        Copy a cluster's result onto one of its members
+        """
+        result = dict(source)
+        if source.get('article_id') != article.get('id'):
+            result['duplicate_of'] = source.get('article_id')
+        result['article_id'] = article.get('id')
+        result['original_title'] = article.get('title', '')
+        result['cluster_id'] = cluster_id
+        result['processed_at'] = datetime.now().isoformat()
+        
+        # The copy's own body, not the representative's, is what a re-import compares against
+        content = article.get('content', '') or article.get('description', '') or article.get('summary', '')
+        result['content_fingerprint'] = content_fingerprint(normalize_text(content).text)
+        return result
+    
+    def _process_chunk_batched(self, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process a chunk of articles through batched inference, one batch per tier
+        """
+        results = []
+        for tier, group in self._group_by_tier(chunk):
+            start = time.perf_counter()
+            try:
+                if tier == EXTRACTIVE:
+                    group_results = [self.summarizer.summarize_extractive(article) for article in group]
+                else:
+                    group_results = self.summarizer.summarize_batch(group, self._generation(tier))
+            except Exception as e:
+                logger.error(f"Batched inference failed, retrying articles individually: {str(e)}")
+                results.extend(self._process_chunk_concurrent(group))
+                continue
+            
+            # Articles in one batch share its wall time; spread it over the request slots they occupied
+            seconds = (time.perf_counter() - start) * min(len(group), self.max_concurrent) / len(group)
+            processed_at = datetime.now().isoformat()
+            for article, result in zip(group, group_results):
+                result['article_id'] = article.get('id')
+                result['processed_at'] = processed_at
+                result['attempt'] = 1
+                self._observe_tier(article, result, seconds)
+            results.extend(group_results)
+        
+        return results
+    
+    def _group_by_tier(self, articles: List[Dict[str, Any]]) -> List[Tuple[Optional[str], List[Dict[str, Any]]]]:
+        """
+        (tier, articles) groups in FULL, FAST, EXTRACTIVE order; one untiered group without a router
+        """
+        if self.router is None:
+            return [(None, articles)] if articles else []
+        
+        groups = {}
+        for article in articles:
+            groups.setdefault(article.get('_tier', FULL), []).append(article)
+        return [(tier, groups[tier]) for tier in (FULL, FAST, EXTRACTIVE) if tier in groups]
+    
+    def _generation(self, tier: Optional[str]) -> Optional[Dict[str, int]]:
+        return self.router.generation.get(tier) if self.router is not None and tier is not None else None
+    
+    def _summarize(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Summarize one article at its routed tier
+        """
+        tier = article.get('_tier')
+        if tier is None:
+            return self.summarizer.summarize_article(article)
+        
+        start = time.perf_counter()
+        if tier == EXTRACTIVE:
+            result = self.summarizer.summarize_extractive(article)
+        else:
+            result = self.summarizer.summarize_article(article, self._generation(tier))
+        self._observe_tier(article, result, time.perf_counter() - start)
+        return result
+    
+    async def _summarize_async(self, article: Dict[str, Any], session) -> Dict[str, Any]:
+        tier = article.get('_tier')
+        if tier is None:
+            return await self.summarizer.summarize_article_async(article, session)
+        
+        start = time.perf_counter()
+        if tier == EXTRACTIVE:
+            result = self.summarizer.summarize_extractive(article)
+        else:
+            result = await self.summarizer.summarize_article_async(article, session, self._generation(tier))
+        self._observe_tier(article, result, time.perf_counter() - start)
+        return result
+    
+    def _observe_tier(self, article: Dict[str, Any], result: Dict[str, Any], seconds: float):
+        """
+        Tag the result with its tier and feed the router's cost model.
+        Cache hits and fallbacks say nothing about a tier's cost and are skipped.
+        """
+        tier = article.get('_tier')
+        if tier is None:
+            return
+        
+        result['tier'] = tier
+        expected = 'extractive' if tier == EXTRACTIVE else 'sshleifer_model'
+        if result.get('method') == expected and not result.get('cached'):
+            self.router.observe(tier, article.get('_tokens', 0), seconds)
+    
+    def _process_with_pool(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Summarize on the process pool, collecting results as batches stream back
+        """
+        if self._process_pool is None:
+            from process_pool import ProcessPoolRunner
+            self._process_pool = ProcessPoolRunner.from_env()
+        
+        scheduler = self._new_scheduler()
+        if scheduler is not None:
+            scheduler.push_many(articles)
+            articles = scheduler.pop_batch(len(articles))
+        
+        results = []
+        for tier, group in self._group_by_tier(articles):
+            mode = 'extractive' if tier == EXTRACTIVE else 'summarize'
+            start = time.perf_counter()
+            finished = []
+            for article, result in self._process_pool.imap(group, mode, self._generation(tier)):
+                result['article_id'] = article.get('id')
+                result['processed_at'] = datetime.now().isoformat()
+                result['attempt'] = 1
+                finished.append((article, result))
+            
+            # As with batched inference, spread the group's wall time over the worker slots it used
+            seconds = (time.perf_counter() - start) * min(len(group), self._process_pool.workers) / len(group)
+            for article, result in finished:
+                self._observe_tier(article, result, seconds)
+                results.append(result)
+        
+        return results
+    
+    def close(self):
+        """
+        Stop worker processes, if the process pool was started
+        """
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
     
     def _process_chunk_concurrent(self, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Process a chunk of articles with concurrent workers
         """
         results = []
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrent)
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
-            # Submit all articles in chunk
-            future_to_article = {
-                executor.submit(self._process_single_with_retry, article): article 
-                for article in chunk
-            }
-            
+        # Submit all articles in chunk; workers inherit the batch deadline
+        future_to_article = {
+            deadlines.submit(executor, self._process_single_with_retry, article): article
+            for article in chunk
+        }
+        
+        # Without a deadline each attempt is bounded by the backend timeout.
+        # With one, attempts are cut off at the deadline and fall back; the
+        # grace period covers that, and anything still running after it is
+        # reported as failed rather than holding up the batch.
+        left = deadlines.remaining()
+        timeout = None if left is None else max(0.0, left) + self.deadline_grace
+        
+        try:
             # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_article):
-                article = future_to_article[future]
+            for future in concurrent.futures.as_completed(future_to_article, timeout=timeout):
+                article = future_to_article.pop(future)
                 try:
-                    result = future.result(timeout=60)  # 60 second timeout per article
-                    results.append(result)
+                    results.append(future.result())
                 except Exception as e:
                     logger.error(f"Failed to process article '{article.get('title', 'Unknown')}': {str(e)}")
                     results.append({
@@ -105,9 +646,36 @@ class BatchSummarizer:
                         'original_title': article.get('title', 'Unknown'),
                         'article_id': article.get('id')
                     })
+        except concurrent.futures.TimeoutError:
+            logger.warning(f"{len(future_to_article)} articles still running at the batch deadline")
+            for article in future_to_article.values():
+                results.append({
+                    'success': False,
+                    'error': 'Deadline exceeded',
+                    'original_title': article.get('title', 'Unknown'),
+                    'article_id': article.get('id'),
+                    'processed_at': datetime.now().isoformat()
+                })
+        finally:
+            # Don't wait for stragglers; their requests end at the deadline anyway
+            executor.shutdown(wait=False, cancel_futures=True)
         
         return results
     
+    def _process_with_deadline(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        with deadlines.scope(self._deadline()):
+            return self._process_single_with_retry(article)
+    
+    def _retry_wait(self, attempt: int) -> Optional[float]:
+        """
+        Backoff before the next attempt, or None if the deadline leaves no time for it
+        """
+        wait_time = (2 ** attempt) * self.rate_limit_delay
+        left = deadlines.remaining()
+        if left is not None and left <= wait_time:
+            return None
+        return wait_time
+    
     def _process_single_with_retry(self, article: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process a single article with retry logic
@@ -116,7 +684,7 @@ class BatchSummarizer:
         
         for attempt in range(self.max_retries):
             try:
-                result = self.summarizer.summarize_article(article)
+                result = self._summarize(article)
                 
                 # Add metadata
                 result['article_id'] = article.get('id')
@@ -134,8 +702,12 @@ class BatchSummarizer:
                 logger.warning(f"Attempt {attempt + 1} failed for article '{article.get('title', 'Unknown')}': {str(e)}")
                 
                 if attempt < self.max_retries - 1:
-                    # Exponential backoff
-                    wait_time = (2 ** attempt) * self.rate_limit_delay
+                    # Exponential backoff, unless the next attempt would run past the deadline
+                    wait_time = self._retry_wait(attempt)
+                    if wait_time is None:
+                        last_error += ' (no time left before the deadline to retry)'
+                        break
+                    metrics.count_retry(wait_time)
                     time.sleep(wait_time)
         
         # All retries failed
@@ -147,38 +719,99 @@ class BatchSummarizer:
             'processed_at': datetime.now().isoformat()
         }
     
+    async def _process_single_with_retry_async(self, article: Dict[str, Any], session) -> Dict[str, Any]:
+        """
+        Async counterpart of _process_single_with_retry
+        """
+        last_error = None
+        
+        for attempt in range(self.max_retries):
+            try:
+                result = await self._summarize_async(article, session)
+                
+                # Add metadata
+                result['article_id'] = article.get('id')
+                result['processed_at'] = datetime.now().isoformat()
+                result['attempt'] = attempt + 1
+                
+                if result.get('success', False):
+                    return result
+                    
+                # If not successful but no exception, treat as error for retry
+                last_error = result.get('error', 'Unknown summarization error')
+                
+            except Exception as e:
+                last_error = str(e)
+                logger.warning(f"Attempt {attempt + 1} failed for article '{article.get('title', 'Unknown')}': {str(e)}")
+                
+                if attempt < self.max_retries - 1:
+                    # Exponential backoff without blocking other articles
+                    import asyncio
+                    wait_time = self._retry_wait(attempt)
+                    if wait_time is None:
+                        last_error += ' (no time left before the deadline to retry)'
+                        break
+                    metrics.count_retry(wait_time)
+                    await asyncio.sleep(wait_time)
+        
+        # All retries failed
+        return {
+            'success': False,
+            'error': f'Failed after {self.max_retries} attempts: {last_error}',
+            'original_title': article.get('title', 'Unknown'),
+            'article_id': article.get('id'),
+            'processed_at': datetime.now().isoformat()
+        }
+    
     def filter_articles_needing_summary(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Filter articles that need summarization (don't already have good summaries)
         """
-        filtered = []
+        filtered = [article for article in articles if self._needs_summary(article)]
         
-        for article in articles:
-            # Check if article already has a good summary
-            existing_summary = article.get('summary', '') or article.get('ai_summary', '')
-            
+        logger.info(f"Filtered {len(articles)} articles to {len(filtered)} needing summarization")
+        return filtered
+    
+    def is_unchanged(self, article: Dict[str, Any]) -> bool:
+        """
+        Whether the article's content is within fingerprint_max_distance of
+        the fingerprint stored with its summary
+        """
+        content = article.get('content', '') or article.get('description', '') or article.get('summary', '')
+        current = content_fingerprint(normalize_text(content).text)
+        return not has_changed(article.get('content_fingerprint'), current, self.fingerprint_max_distance)
+    
+    def _needs_summary(self, article: Dict[str, Any]) -> bool:
+        """
+        Whether a single article still needs summarization
+        """
+        # Check if article already has a good summary
+        existing_summary = article.get('summary', '') or article.get('ai_summary', '')
+        
+        if article.get('content_fingerprint') and existing_summary:
+            # Summary was made from known content: redo it only if the content changed
+            if self.is_unchanged(article):
+                self.stats['unchanged'] += 1
+                return False
+        elif existing_summary and len(existing_summary.strip()) > 50:
             # Skip if already has a decent summary (more than 50 characters)
-            if existing_summary and len(existing_summary.strip()) > 50:
-                continue
-            
-            # Skip if content is too short to summarize
-            content = article.get('content', '') or article.get('description', '')
-            if not content or len(content.split()) < 30:
-                continue
-                
-            # Skip if article is too old (more than 7 days)
-            if 'published_at' in article:
-                try:
-                    pub_date = datetime.fromisoformat(article['published_at'].replace('Z', '+00:00'))
-                    if (datetime.now().replace(tzinfo=pub_date.tzinfo) - pub_date).days > 7:
-                        continue
-                except:
-                    pass  # Continue if date parsing fails
+            return False
+        
+        # Skip if content is too short to summarize
+        content = article.get('content', '') or article.get('description', '')
+        if not content or len(content.split()) < 30:
+            return False
             
-            filtered.append(article)
+        # Skip if article is too old (more than 7 days)
+        if 'published_at' in article:
+            try:
+                pub_date = datetime.fromisoformat(article['published_at'].replace('Z', '+00:00'))
+                if (datetime.now().replace(tzinfo=pub_date.tzinfo) - pub_date).days > 7:
+                    return False
+            except:
+                pass  # Continue if date parsing fails
         
-        logger.info(f"Filtered {len(articles)} articles to {len(filtered)} needing summarization")
-        return filtered
+        return True
     
     def get_processing_stats(self) -> Dict[str, Any]:
         """
@@ -191,8 +824,56 @@ class BatchSummarizer:
             stats['duration_seconds'] = duration.total_seconds()
             stats['articles_per_second'] = stats['total_processed'] / duration.total_seconds() if duration.total_seconds() > 0 else 0
         
+        if self.summarizer.cache is not None:
+            stats['cache'] = self.summarizer.cache.get_stats()
+        
+        if self.summarizer.single_flight is not None:
+            stats['single_flight'] = self.summarizer.single_flight.get_stats()
+        
+        if self.summarizer.batcher is not None:
+            stats['batching'] = self.summarizer.batcher.get_stats()
+        
+        if self.dedup_index is not None:
+            stats['dedup'] = self.dedup_index.get_stats()
+        
+        if self.scheduler is not None:
+            stats['scheduler'] = self.scheduler.get_stats()
+        
+        if self._process_pool is not None:
+            stats['process_pool'] = self._process_pool.get_stats()
+        
+        if self.router is not None:
+            stats['tiering'] = self.router.get_stats()
+        
+        if self.summarizer.backend.hedging is not None:
+            stats['hedging'] = self.summarizer.backend.hedging.get_stats()
+        
+        if metrics.ENABLED:
+            stats['metrics'] = metrics.snapshot()
+        
+        backend = self.summarizer.backend
+        if backend.rate_limiter is not None:
+            stats['rate_limiter'] = backend.rate_limiter.get_stats()
+        if backend.circuit_breaker is not None:
+            stats['circuit_breaker'] = backend.circuit_breaker.get_stats()
+        
         return stats
 
+# Warm instances keep one BatchSummarizer (and its dedup index and scheduler) between requests
+_BATCH_SUMMARIZER = None
+_BATCH_SUMMARIZER_LOCK = threading.Lock()
+
+
+def get_batch_summarizer() -> BatchSummarizer:
+    """
+    Process-wide BatchSummarizer sharing the process-wide summarizer
+    """
+    global _BATCH_SUMMARIZER
+    with _BATCH_SUMMARIZER_LOCK:
+        if _BATCH_SUMMARIZER is None:
+            _BATCH_SUMMARIZER = BatchSummarizer(summarizer=get_summarizer())
+        return _BATCH_SUMMARIZER
+
 def handler(request):
     """
     Vercel serverless function handler for batch processing
@@ -215,6 +896,10 @@ def handler(request):
             'body': json.dumps({'error': 'Method not allowed'})
         }
     
+    # NDJSON in or out switches to the streaming mode
+    if _wants_stream(request):
+        return stream_handler(request)
+    
     try:
         # Parse request body
         if hasattr(request, 'get_json'):
@@ -236,8 +921,9 @@ def handler(request):
             articles = articles[:max_batch_size]
             logger.warning(f"Limiting batch to {max_batch_size} articles")
         
-        # Initialize batch processor
-        batch_processor = BatchSummarizer()
+        # Reuse the warm batch processor
+        batch_processor = get_batch_summarizer()
+        batch_processor.reset_stats()
         
         # Filter articles that need summarization
         articles_to_process = batch_processor.filter_articles_needing_summary(articles)
@@ -256,10 +942,16 @@ def handler(request):
                 })
             }
         
-        # Process batch
-        results = batch_processor.process_batch(articles_to_process)
+        # Process batch within the caller's time budget, if it gave one
+        results = batch_processor.process_batch(articles_to_process, data.get('deadline_seconds'))
         stats = batch_processor.get_processing_stats()
         
+        # Persist summaries and queue status; instances may freeze after returning, so flush now
+        writer = get_summary_writer()
+        if writer is not None:
+            writer.add_results(results)
+            stats['writeback'] = _flush_writer(writer)
+        
         return {
             'statusCode': 200,
             'headers': {'Access-Control-Allow-Origin': '*'},
@@ -270,7 +962,7 @@ def handler(request):
                 'original_count': len(articles),
                 'processed_count': len(articles_to_process),
                 'timestamp': datetime.now().isoformat()
-            })
+            }, default=str)
         }
         
     except Exception as e:
@@ -286,6 +978,114 @@ def handler(request):
             })
         }
 
+def _flush_writer(writer) -> Dict[str, Any]:
+    """
+    Flush buffered writeback and report it; a database error doesn't fail the request
+    """
+    try:
+        writer.flush()
+        return writer.get_stats()
+    except Exception as e:
+        logger.error(f"Summary writeback failed: {str(e)}")
+        stats = writer.get_stats()
+        stats['error'] = str(e)
+        return stats
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+def _wants_stream(request) -> bool:
+    """
+    Stream when the client sends or accepts NDJSON
+    """
+    headers = getattr(request, 'headers', None) or {}
+    accept = headers.get('Accept', '') or headers.get('accept', '')
+    content_type = headers.get('Content-Type', '') or headers.get('content-type', '')
+    return NDJSON_CONTENT_TYPE in accept or NDJSON_CONTENT_TYPE in content_type
+
+def _iter_request_articles(request, invalid_lines: List[int]) -> Iterator[Dict[str, Any]]:
+    """
+    Read articles from the request body one NDJSON line at a time,
+    so the whole body never has to be held in memory. A plain JSON
+    body with an 'articles' list is accepted too.
+    """
+    source = getattr(request, 'stream', None)
+    if source is None:
+        body = request.body or b''
+        source = body.splitlines() if isinstance(body, (bytes, str)) else body
+    
+    for line_number, line in enumerate(source, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        
+        try:
+            item = json.loads(line)
+        except ValueError:
+            invalid_lines.append(line_number)
+            continue
+        
+        if isinstance(item, dict) and isinstance(item.get('articles'), list):
+            yield from item['articles']
+        elif isinstance(item, dict):
+            yield item
+        else:
+            invalid_lines.append(line_number)
+
+def stream_handler(request):
+    """
+    Streaming variant of the batch handler: the body is a generator that
+    emits one NDJSON line per article as it finishes, then a stats line.
+    There is no batch cap; the request body is consumed incrementally.
+    """
+    batch_processor = get_batch_summarizer()
+    invalid_lines = []
+    
+    writer = get_summary_writer()
+    
+    def body():
+        # Counters belong to whichever context iterates the body
+        batch_processor.reset_stats()
+        try:
+            articles = _iter_request_articles(request, invalid_lines)
+            for result in batch_processor.stream_process(articles):
+                if writer is not None:
+                    # Written in batches as the size or age trigger fires
+                    writer.add_results([result])
+                result['type'] = 'result'
+                yield json.dumps(result) + '\n'
+            
+            stats = batch_processor.get_processing_stats()
+            if writer is not None:
+                stats['writeback'] = _flush_writer(writer)
+            
+            yield json.dumps({
+                'type': 'stats',
+                'success': True,
+                'stats': stats,
+                'invalid_lines': invalid_lines,
+                'timestamp': datetime.now().isoformat()
+            }, default=str) + '\n'
+            
+        except Exception as e:
+            # Headers are already sent; report the failure in-band
+            logger.error(f"Streaming batch handler error: {str(e)}")
+            yield json.dumps({
+                'type': 'error',
+                'success': False,
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            }) + '\n'
+    
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Access-Control-Allow-Origin': '*',
+            'Content-Type': NDJSON_CONTENT_TYPE,
+            'Cache-Control': 'no-cache'
+        },
+        'body': body()
+    }
+
 # For scheduled/cron processing
 def scheduled_batch_process():
     """
@@ -293,42 +1093,47 @@ def scheduled_batch_process():
     This would be called by Vercel cron or external scheduler
     """
     try:
-        # This would typically fetch articles from your database/API
-        # For now, return a placeholder response
         logger.info("Scheduled batch summarization started")
         
-        # Placeholder: In real implementation, fetch from your news API
-        articles = []  # fetch_latest_articles()
+        # Drain one batch from summarization_queue; a long-running
+        # queue_worker.py process is preferred over this cron path
+        from queue_worker import QueueWorker, store_from_env
+        store = store_from_env()
         
-        if not articles:
-            logger.info("No new articles to process")
+        if store is None:
+            logger.info("No summarization queue configured")
             return {
                 'success': True,
-                'message': 'No new articles to process',
+                'message': 'No summarization queue configured (set SUMMARIZE_QUEUE_DSN)',
                 'timestamp': datetime.now().isoformat()
             }
         
-        batch_processor = BatchSummarizer()
-        articles_to_process = batch_processor.filter_articles_needing_summary(articles)
+        worker = QueueWorker(store, batch_processor=get_batch_summarizer())
+        try:
+            claimed = worker.run_once()
+            worker.flush()
+        finally:
+            store.close()
         
-        if articles_to_process:
-            results = batch_processor.process_batch(articles_to_process)
-            stats = batch_processor.get_processing_stats()
-            
-            logger.info(f"Scheduled processing completed: {stats}")
-            
-            return {
-                'success': True,
-                'processed_count': len(articles_to_process),
-                'stats': stats,
-                'timestamp': datetime.now().isoformat()
-            }
-        else:
+        if not claimed:
+            logger.info("No new articles to process")
             return {
                 'success': True,
-                'message': 'No articles needed summarization',
+                'message': 'No new articles to process',
                 'timestamp': datetime.now().isoformat()
             }
+        
+        stats = worker.batch_processor.get_processing_stats()
+        logger.info(f"Scheduled processing completed: {stats}")
+        
+        return {
+            'success': True,
+            'processed_count': claimed,
+            'queue_stats': worker.stats,
+            'writeback': worker.writer.get_stats(),
+            'stats': stats,
+            'timestamp': datetime.now().isoformat()
+        }
             
     except Exception as e:
         logger.error(f"Scheduled batch processing error: {str(e)}")
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Batched Inference
+Length-bucketed batch planning and dynamic batching for summarization backends
+"""
+
+import time
+import queue
+import logging
+import threading
+import concurrent.futures
+from typing import Dict, List, Any, Optional, Tuple
+import deadlines
+
+logger = logging.getLogger(__name__)
+
+
+def plan_batches(items: List[Any], token_counts: List[int],
+                 max_batch_tokens: int, max_batch_size: int) -> List[List[Any]]:
+    """
+    Group items into batches of similar length.
+
+    Items are sorted by token count so each batch pads to a similar length,
+    then packed greedily while the padded size (batch size x longest input)
+    stays within max_batch_tokens.
+    """
+    order = sorted(range(len(items)), key=lambda i: token_counts[i])
+
+    batches = []
+    current = []
+    current_max = 0
+
+    for i in order:
+        longest = max(current_max, token_counts[i])
+        if current and (len(current) >= max_batch_size or longest * (len(current) + 1) > max_batch_tokens):
+            batches.append(current)
+            current = []
+            longest = token_counts[i]
+
+        current.append(items[i])
+        current_max = longest
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+class _Request:
+    __slots__ = ('text', 'max_length', 'min_length', 'num_beams', 'lengths', 'tokens', 'deadline', 'future')
+
+    def __init__(self, text: str, max_length: int, min_length: int, tokens: int,
+                 num_beams: Optional[int] = None, lengths: Optional[Tuple[Tuple[int, int], ...]] = None):
+        self.text = text
+        self.max_length = max_length
+        self.min_length = min_length
+        self.num_beams = num_beams
+        self.lengths = lengths
+        self.tokens = tokens
+        self.deadline = deadlines.current()
+        self.future = concurrent.futures.Future()
+
+
+class DynamicBatcher:
+    """
+    Collects single-article generate() calls from concurrent threads and
+    runs them through the backend as batched forward passes.
+
+    A batch is dispatched as soon as it reaches max_batch_size or
+    max_batch_tokens padded tokens, or once the oldest request has waited
+    max_wait seconds, whichever comes first.
+    """
+
+    def __init__(self, backend, max_batch_tokens: int = 8192,
+                 max_batch_size: int = 16, max_wait: float = 0.02):
+        self.backend = backend
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+        self.stats = {
+            'requests': 0,
+            'batches': 0,
+            'largest_batch': 0
+        }
+
+    def generate(self, text: str, max_length: int, min_length: int, timeout: Optional[float] = None,
+                 num_beams: Optional[int] = None, lengths: Optional[List[Tuple[int, int]]] = None):
+        """
+        Queue one input and block until its batch has been generated,
+        or until the caller's deadline. With lengths, returns one summary
+        per (max_length, min_length) in lengths (see generate_lengths).
+        """
+        self._ensure_worker()
+
+        left = deadlines.remaining()
+        if left is not None:
+            timeout = left if timeout is None else min(timeout, left)
+
+        request = _Request(text, max_length, min_length, self.backend.estimate_tokens(text), num_beams,
+                           tuple(lengths) if lengths else None)
+        self._queue.put(request)
+        try:
+            return request.future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            request.future.cancel()
+            if request.deadline is not None and request.deadline.expired():
+                raise deadlines.DeadlineExceeded("Deadline exceeded waiting for batched inference") from None
+            raise
+
+    def _ensure_worker(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='summarize-batcher', daemon=True)
+                self._thread.start()
+
+    def _collect(self) -> List[_Request]:
+        """
+        Wait for the first request, then gather more until a limit or the deadline
+        """
+        pending = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        longest = pending[0].tokens
+
+        while len(pending) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+            pending.append(request)
+            longest = max(longest, request.tokens)
+            if longest * len(pending) >= self.max_batch_tokens:
+                break
+
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+
+            # Generation settings must match within one forward pass
+            groups = {}
+            for request in pending:
+                key = (request.max_length, request.min_length, request.num_beams, request.lengths)
+                groups.setdefault(key, []).append(request)
+
+            for (max_length, min_length, num_beams, lengths), group in groups.items():
+                batches = plan_batches(group, [r.tokens for r in group],
+                                       self.max_batch_tokens, self.max_batch_size)
+                for batch in batches:
+                    self._dispatch(batch, max_length, min_length, num_beams, lengths)
+
+    def _dispatch(self, batch: List[_Request], max_length: int, min_length: int,
+                  num_beams: Optional[int] = None, lengths: Optional[Tuple[Tuple[int, int], ...]] = None):
+        # Callers that gave up or whose deadline passed are dropped from the batch
+        live = []
+        for request in batch:
+            if request.deadline is not None and request.deadline.expired():
+                if request.future.set_running_or_notify_cancel():
+                    request.future.set_exception(deadlines.DeadlineExceeded("Deadline exceeded in batch queue"))
+            elif request.future.set_running_or_notify_cancel():
+                live.append(request)
+        if not live:
+            return
+        batch = live
+        
+        self.stats['requests'] += len(batch)
+        self.stats['batches'] += 1
+        self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+
+        # The batch is worth finishing until its last caller's deadline
+        batch_deadline = None
+        if all(r.deadline is not None for r in batch):
+            batch_deadline = max(batch, key=lambda r: r.deadline.at).deadline
+        
+        try:
+            with deadlines.scope(batch_deadline):
+                if lengths:
+                    summaries = self.backend.generate_lengths([r.text for r in batch], list(lengths), num_beams)
+                else:
+                    summaries = self.backend.generate_batch([r.text for r in batch], max_length, min_length, num_beams)
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        for request, summary in zip(batch, summaries):
+            request.future.set_result(summary)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.copy()
+        stats['average_batch_size'] = stats['requests'] / stats['batches'] if stats['batches'] > 0 else 0
+        return stats
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Cold Start / Warm Request Benchmark
+Spawns fresh interpreters to measure handler import time and first-request
+latency, then times warm requests on the same instance against a
+zero-latency stub inference server, so what remains is per-request overhead
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs 5] [--warm-requests 50] [--output cold_start.json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _Request:
+    def __init__(self, body):
+        self.method = 'POST'
+        self.headers = {'Content-Type': 'application/json'}
+        self.body = json.dumps(body)
+
+
+def child(warm_requests: int):
+    """
+    One simulated serverless instance: import, first request, warm requests
+    """
+    start = time.perf_counter()
+    import summarize
+    import batch_summarize
+    import_seconds = time.perf_counter() - start
+
+    from stub_inference_server import StubInferenceServer
+    server = StubInferenceServer(('127.0.0.1', 0), latency=0.0, latency_jitter=0.0)
+    server.start_background()
+    os.environ['SUMMARIZE_API_URL'] = server.url
+
+    article = {
+        'title': 'Senate passes border security bill',
+        'content': ' '.join(['The Senate passed the border security bill on Tuesday after weeks of debate.'] * 8)
+    }
+    timings = {}
+
+    for name, handler in (('summarize', summarize.handler), ('batch_summarize', batch_summarize.handler)):
+        body = article if name == 'summarize' else {'articles': [dict(article, id='a1')]}
+
+        start = time.perf_counter()
+        handler(_Request(body))
+        first = time.perf_counter() - start
+
+        warm = []
+        for _ in range(warm_requests):
+            start = time.perf_counter()
+            handler(_Request(body))
+            warm.append(time.perf_counter() - start)
+
+        timings[name] = {'first_ms': first * 1000, 'warm_p50_ms': statistics.median(warm) * 1000}
+
+    print(json.dumps({'import_ms': import_seconds * 1000, 'handlers': timings}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold start and warm request overhead')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--warm-requests', type=int, default=50)
+    parser.add_argument('--output')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, ROOT)
+        child(args.warm_requests)
+        return
+
+    env = dict(os.environ, SUMMARIZE_CACHE_ENABLED='false', SUMMARIZE_DEDUP_ENABLED='false',
+               SUMMARIZE_RATE_LIMIT='0', PYTHONDONTWRITEBYTECODE='1')
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.check_output(
+            [sys.executable, os.path.abspath(__file__), '--child', '--warm-requests', str(args.warm_requests)],
+            cwd=ROOT, env=env, stderr=subprocess.DEVNULL, text=True
+        )
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    summary = {'import_ms': round(statistics.median(r['import_ms'] for r in runs), 2), 'handlers': {}}
+    print(f"import (summarize + batch_summarize): {summary['import_ms']:.1f} ms")
+
+    for name in runs[0]['handlers']:
+        first = statistics.median(r['handlers'][name]['first_ms'] for r in runs)
+        warm = statistics.median(r['handlers'][name]['warm_p50_ms'] for r in runs)
+        summary['handlers'][name] = {'first_ms': round(first, 2), 'warm_p50_ms': round(warm, 2)}
+        print(f"{name:<16} first request {first:>8.1f} ms   warm p50 {warm:>6.2f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'runs': args.runs, 'warm_requests': args.warm_requests, 'summary': summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
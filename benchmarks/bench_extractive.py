@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Extractive Summarizer Throughput
+Single-core articles/sec of ExtractiveSummarizer on the synthetic corpus,
+with and without NumPy
+
+Usage:
+    python benchmarks/bench_extractive.py [--articles 500]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import extractive_summarizer
+from corpus import generate_articles
+from text_processing import normalize_text
+
+
+def run(texts, label: str):
+    summarizer = extractive_summarizer.ExtractiveSummarizer()
+    start = time.perf_counter()
+    for text in texts:
+        summarizer.summarize(text)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {len(texts) / elapsed:>8.1f} articles/s  ({elapsed * 1000 / len(texts):.2f} ms/article)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extractive summarizer throughput')
+    parser.add_argument('--articles', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    texts = [normalize_text(article['content']).text
+             for article in generate_articles(args.articles, args.seed)]
+
+    if extractive_summarizer._load_numpy() is not None:
+        run(texts, 'numpy')
+        extractive_summarizer.USE_NUMPY = False
+    else:
+        print("numpy   not installed")
+    run(texts, 'python')
+
+
+if __name__ == "__main__":
+    main()
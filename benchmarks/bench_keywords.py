@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Keyword Scoring Throughput
+Articles/sec of the one-pass keyword matcher as the lexicon grows, against
+the previous per-keyword substring scan
+
+Usage:
+    python benchmarks/bench_keywords.py [--articles 2000] [--sizes 15,100,1000,5000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_articles
+from keyword_scoring import DEFAULT_LEXICON, KeywordLexicon
+from text_processing import normalize_text
+
+
+def build_lexicon(size: int, seed: int):
+    """
+    The default lexicon padded with synthetic terms up to size terms
+    """
+    rng = random.Random(seed)
+    config = {category: list(terms) for category, terms in DEFAULT_LEXICON.items()}
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    count = sum(len(terms) for terms in config.values())
+
+    while count < size:
+        words = [''.join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(rng.randint(1, 3))]
+        config.setdefault(f"topic-{count % 40}", []).append(' '.join(words))
+        count += 1
+    return config
+
+
+def rate(texts, fn) -> float:
+    start = time.perf_counter()
+    fn(texts)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keyword scoring throughput vs lexicon size')
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--sizes', default='15,100,1000,5000')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    texts = [normalize_text(article['content']).text for article in generate_articles(args.articles, args.seed)]
+
+    print(f"{'terms':>6} {'substring scan':>16} {'one pass':>12} {'batch':>12}   (articles/s)")
+    for size in (int(s) for s in args.sizes.split(',')):
+        config = build_lexicon(size, args.seed)
+        terms = [term for category in config.values() for term in category]
+        lexicon = KeywordLexicon.from_config(config)
+
+        def substring_scan(batch):
+            for text in batch:
+                lowered = text.lower()
+                sum(1 for term in terms if term in lowered)
+
+        def one_pass(batch):
+            for text in batch:
+                lexicon.score(text)
+
+        print(f"{size:>6} {rate(texts, substring_scan):>16.0f} {rate(texts, one_pass):>12.0f} "
+              f"{rate(texts, lexicon.score_batch):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
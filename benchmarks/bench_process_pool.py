@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Process Pool Scaling Benchmark
+Articles/sec for CPU-bound (extractive) summarization on a thread pool vs
+the process pool, at increasing worker counts
+
+Usage:
+    python benchmarks/bench_process_pool.py [--articles 2000] [--workers 1,2,4,8]
+"""
+
+import os
+import sys
+import time
+import argparse
+import concurrent.futures
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('SUMMARIZE_CACHE_ENABLED', 'false')
+
+from corpus import generate_articles
+from process_pool import ProcessPoolRunner
+from summarize import AtlanticAnvilSummarizer
+
+
+def run_threads(articles, workers: int) -> float:
+    summarizer = AtlanticAnvilSummarizer()
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(summarizer.summarize_extractive, articles))
+    return len(articles) / (time.perf_counter() - start)
+
+
+def run_processes(articles, workers: int, batch_size: int) -> float:
+    runner = ProcessPoolRunner(workers=workers, threads_per_worker=1, batch_size=batch_size)
+    try:
+        # Start the workers (imports, initializer) outside the timed region
+        list(runner.imap(articles[:workers * batch_size], mode='extractive'))
+
+        start = time.perf_counter()
+        for _ in runner.imap(articles, mode='extractive'):
+            pass
+        return len(articles) / (time.perf_counter() - start)
+    finally:
+        runner.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Thread pool vs process pool scaling')
+    parser.add_argument('--articles', type=int, default=2000)
+    parser.add_argument('--workers', default='1,2,4,8')
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    articles = list(generate_articles(args.articles, args.seed))
+    print(f"{os.cpu_count()} CPUs, {len(articles)} articles")
+
+    for workers in (int(w) for w in args.workers.split(',')):
+        threads = run_threads(articles, workers)
+        processes = run_processes(articles, workers, args.batch_size)
+        print(f"workers {workers:>2}: threads {threads:>8.1f} articles/s   processes {processes:>8.1f} articles/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Sharded Worker Scaling Benchmark
+Articles/second draining a shared queue with 1, 2, 4, ... sharded queue
+worker processes against a stub inference endpoint. A local SQLite queue
+stands in for the shared Postgres one.
+
+Usage:
+    python benchmarks/bench_sharding.py [--articles 600] [--workers 1,2,4] [--latency-ms 100]
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_articles
+from stub_inference_server import StubInferenceServer
+from queue_worker import SQLiteQueueStore
+from sharding import launch_local_workers, stop_local_workers
+
+
+def load_queue(db_path: str, count: int, seed: int):
+    store = SQLiteQueueStore(db_path)
+    articles = list(generate_articles(count, seed=seed))
+    store._conn.executemany(
+        'INSERT INTO articles (id, title, content, views_count, trending_score, published_at) VALUES (?, ?, ?, ?, ?, ?)',
+        [(a['id'], a['title'], a['content'], a['views_count'], a['trending_score'], a['published_at'])
+         for a in articles])
+    store.enqueue([a['id'] for a in articles])
+    store.close()
+
+
+def wait_for(db_path: str, query: str, done, timeout: float) -> float:
+    conn = sqlite3.connect(db_path, timeout=30)
+    start = time.perf_counter()
+    try:
+        while time.perf_counter() - start < timeout:
+            if done(conn.execute(query).fetchone()[0]):
+                return time.perf_counter() - start
+            time.sleep(0.05)
+    finally:
+        conn.close()
+    raise TimeoutError(f"Timed out waiting on: {query}")
+
+
+def run(workers: int, args, api_url: str):
+    directory = tempfile.mkdtemp(prefix='bench-sharding-')
+    db_path = os.path.join(directory, 'queue.sqlite3')
+    SQLiteQueueStore(db_path).close()
+
+    env = {
+        'SUMMARIZE_QUEUE_SQLITE_PATH': db_path,
+        'SUMMARIZE_API_URL': api_url,
+        'SUMMARIZE_RATE_LIMIT': '0',
+        'SUMMARIZE_CACHE_ENABLED': 'false',
+        'SUMMARIZE_DEDUP_ENABLED': 'false',
+        'SUMMARIZE_QUEUE_BATCH_SIZE': str(args.batch_size),
+        'SUMMARIZE_BATCH_SIZE': str(args.batch_size),
+        'SUMMARIZE_CONCURRENT_REQUESTS': str(args.concurrency),
+        'SUMMARIZE_QUEUE_POLL_SECONDS': '0.2',
+        'SUMMARIZE_SHARD_HEARTBEAT_SECONDS': '1',
+        'SUMMARIZE_SHARD_MEMBER_TTL_SECONDS': '5'
+    }
+    log = open(os.path.join(directory, 'workers.log'), 'w')
+    processes = launch_local_workers(workers, env, stdout=log, stderr=subprocess.STDOUT)
+    try:
+        # Fill the queue once every worker is on the ring, so the run measures draining, not start-up
+        wait_for(db_path, 'SELECT COUNT(*) FROM summarization_workers', lambda n: n >= workers, 120)
+        time.sleep(1.5)
+        load_queue(db_path, args.articles, seed=args.seed)
+        seconds = wait_for(db_path, "SELECT COUNT(*) FROM summarization_queue WHERE status IN ('pending', 'processing')",
+                           lambda n: n == 0, 600)
+    finally:
+        stop_local_workers(processes)
+        log.close()
+
+    conn = sqlite3.connect(db_path)
+    completed = conn.execute("SELECT COUNT(*) FROM summarization_queue WHERE status = 'completed'").fetchone()[0]
+    conn.close()
+
+    with open(os.path.join(directory, 'workers.log')) as f:
+        lines = f.read().splitlines()
+    steals = sum(int(line.split('Stole ')[1].split()[0]) for line in lines if 'Stole ' in line)
+
+    return seconds, completed, steals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Throughput scaling of sharded queue workers')
+    parser.add_argument('--articles', type=int, default=600)
+    parser.add_argument('--workers', default='1,2,4', help='Comma-separated worker counts')
+    parser.add_argument('--batch-size', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent requests per worker')
+    parser.add_argument('--latency-ms', type=float, default=100.0)
+    parser.add_argument('--jitter-ms', type=float, default=20.0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = StubInferenceServer(('127.0.0.1', 0), latency=args.latency_ms / 1000.0,
+                                 latency_jitter=args.jitter_ms / 1000.0)
+    server.start_background()
+
+    print(f"{args.articles} articles, {args.concurrency} concurrent requests per worker, "
+          f"{args.latency_ms:.0f} ms stub latency")
+    print(f"{'workers':>8} {'seconds':>9} {'articles/s':>11} {'speedup':>8} {'completed':>10} {'stolen':>7}")
+    baseline = None
+    for workers in [int(n) for n in args.workers.split(',')]:
+        seconds, completed, stolen = run(workers, args, server.url)
+        rate = completed / seconds
+        baseline = baseline or rate
+        print(f"{workers:>8} {seconds:>9.2f} {rate:>11.1f} {rate / baseline:>7.2f}x {completed:>10} {stolen:>7}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Summarization Benchmark / Load Test
+Drives summarize_article, BatchSummarizer.process_batch and both handlers
+against a local stub inference server and records latency, throughput,
+peak RSS and per-stage CPU as JSON
+
+Usage:
+    python benchmarks/bench_summarizer.py --articles 200 --latency-ms 50 --output bench.json
+    python benchmarks/bench_summarizer.py --baseline bench.json --output bench-new.json
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import resource
+import tempfile
+import argparse
+import functools
+import subprocess
+import threading
+from datetime import datetime
+from typing import Dict, List, Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_articles
+
+SCENARIOS = ['summarize_article', 'summarize_handler', 'process_batch', 'batch_handler']
+
+
+def start_stub_server(args) -> (subprocess.Popen, str):
+    """
+    Run the stub in its own process so its CPU isn't billed to the pipeline
+    """
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'stub_inference_server.py'), '--port', '0',
+         '--latency-ms', str(args.latency_ms), '--jitter-ms', str(args.jitter_ms),
+         '--error-rate', str(args.error_rate), '--throttle-rate', str(args.throttle_rate),
+         '--retry-after', str(args.retry_after)],
+        stdout=subprocess.PIPE, text=True
+    )
+    line = process.stdout.readline()
+    return process, line.strip().rsplit(' ', 1)[-1]
+
+
+def configure_environment(args, api_url: str):
+    """
+    Point the pipeline at the stub; caches and dedup are off unless asked for
+    so runs measure the same work every time
+    """
+    scratch = tempfile.mkdtemp(prefix='atlantic-anvil-bench-')
+    os.environ['SUMMARIZE_API_URL'] = api_url
+    os.environ['SUMMARIZE_RATE_LIMIT'] = str(args.rate_limit)
+    os.environ['SUMMARIZE_CACHE_ENABLED'] = 'true' if args.cache else 'false'
+    os.environ['SUMMARIZE_CACHE_PATH'] = os.path.join(scratch, 'cache.sqlite3')
+    os.environ['SUMMARIZE_DEDUP_ENABLED'] = 'true' if args.dedup else 'false'
+    os.environ['SUMMARIZE_DEDUP_PATH'] = os.path.join(scratch, 'dedup.sqlite3')
+    os.environ['SUMMARIZE_CONCURRENT_REQUESTS'] = str(args.concurrency)
+
+
+class StageTimer:
+    """
+    Wall and CPU time per pipeline stage. CPU is thread CPU time, so it is
+    attributed correctly when stages run on worker threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+
+    def wrap(self, owner, attribute: str, stage: str):
+        original = getattr(owner, attribute)
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            wall_start, cpu_start = time.perf_counter(), time.thread_time()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                wall, cpu = time.perf_counter() - wall_start, time.thread_time() - cpu_start
+                with self._lock:
+                    entry = self.stages.setdefault(stage, {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0})
+                    entry['calls'] += 1
+                    entry['wall_seconds'] += wall
+                    entry['cpu_seconds'] += cpu
+
+        setattr(owner, attribute, timed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: {k: round(v, 6) if isinstance(v, float) else v for k, v in entry.items()}
+                    for name, entry in self.stages.items()}
+
+
+def instrument(timer: StageTimer):
+    """
+    Wrap the pipeline stages at class level so handler-created instances are covered too
+    """
+    from summarize import AtlanticAnvilSummarizer
+    from summarization_backends import HuggingFaceAPIBackend, LocalModelBackend
+
+    timer.wrap(AtlanticAnvilSummarizer, '_prepare_article', 'prepare')
+    timer.wrap(AtlanticAnvilSummarizer, 'enhance_conservative_context', 'enhance')
+    timer.wrap(AtlanticAnvilSummarizer, 'post_process_summary', 'post_process')
+    timer.wrap(AtlanticAnvilSummarizer, 'fallback_summary', 'fallback')
+    timer.wrap(HuggingFaceAPIBackend, '_post', 'request')
+    timer.wrap(LocalModelBackend, 'generate_batch', 'request')
+
+
+class BenchRequest:
+    """
+    Minimal stand-in for the serverless request object
+    """
+
+    def __init__(self, body: Any):
+        self.method = 'POST'
+        self.headers = {'Content-Type': 'application/json'}
+        self.body = json.dumps(body)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def run_scenario(name: str, articles: List[Dict[str, Any]], batch_articles: int,
+                 timer: StageTimer) -> Dict[str, Any]:
+    import summarize
+    import batch_summarize
+
+    timer.reset()
+    latencies = []
+    methods = {}
+
+    if name in ('summarize_article', 'summarize_handler'):
+        units = [[article] for article in articles]
+    else:
+        units = [articles[i:i + batch_articles] for i in range(0, len(articles), batch_articles)]
+
+    summarizer = summarize.AtlanticAnvilSummarizer() if name == 'summarize_article' else None
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+    for unit in units:
+        start = time.perf_counter()
+
+        if name == 'summarize_article':
+            results = [summarizer.summarize_article(unit[0])]
+        elif name == 'summarize_handler':
+            results = [json.loads(summarize.handler(BenchRequest(unit[0]))['body']).get('result', {})]
+        elif name == 'process_batch':
+            processor = batch_summarize.BatchSummarizer()
+            processor.rate_limit_delay = 0
+            results = processor.process_batch(unit)
+        else:
+            # Bypass the 50-article serverless cap by keeping units within it
+            results = json.loads(batch_summarize.handler(BenchRequest({'articles': unit}))['body']).get('results', [])
+
+        latencies.append(time.perf_counter() - start)
+        for result in results:
+            method = result.get('method', 'error')
+            methods[method] = methods.get(method, 0) + 1
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    return {
+        'units': len(units),
+        'articles': len(articles),
+        'latency_unit': 'article' if len(units) == len(articles) else f'batch of {batch_articles}',
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'wall_seconds': round(wall, 4),
+        'cpu_seconds': round(cpu, 4),
+        'articles_per_second': round(len(articles) / wall, 3) if wall > 0 else 0,
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0, 2),
+        'methods': methods,
+        'stages': timer.snapshot()
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Regressions: p95 latency up or throughput down by more than `tolerance`
+    """
+    regressions = []
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+
+        if previous['p95_ms'] > 0 and current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current['articles_per_second'] < previous['articles_per_second'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['articles_per_second']} -> "
+                               f"{current['articles_per_second']} articles/s")
+    return regressions
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarization benchmark against a stub inference server')
+    parser.add_argument('--articles', type=int, default=200)
+    parser.add_argument('--batch-articles', type=int, default=50, help='Articles per batch scenario call (<= 50)')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--concurrency', type=int, default=5)
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--jitter-ms', type=float, default=20.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    parser.add_argument('--rate-limit', type=float, default=0, help='SUMMARIZE_RATE_LIMIT for the run (0 = off)')
+    parser.add_argument('--duplicate-rate', type=float, default=0.0)
+    parser.add_argument('--cache', action='store_true', help='Enable the summary cache')
+    parser.add_argument('--dedup', action='store_true', help='Enable near-duplicate clustering')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='bench_output.json')
+    parser.add_argument('--baseline', help='Earlier output to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.15)
+    args = parser.parse_args()
+
+    server, api_url = start_stub_server(args)
+    try:
+        configure_environment(args, api_url)
+
+        timer = StageTimer()
+        instrument(timer)
+
+        articles = list(generate_articles(args.articles, args.seed, args.duplicate_rate))
+        results = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(),
+                'git_revision': git_revision(),
+                'python': platform.python_version(),
+                'platform': platform.platform()
+            },
+            'config': vars(args),
+            'scenarios': {}
+        }
+
+        for name in args.scenarios.split(','):
+            scenario = run_scenario(name, articles, min(args.batch_articles, 50), timer)
+            results['scenarios'][name] = scenario
+            print(f"{name:<18} p50 {scenario['p50_ms']:>9.1f}ms  p95 {scenario['p95_ms']:>9.1f}ms  "
+                  f"p99 {scenario['p99_ms']:>9.1f}ms  {scenario['articles_per_second']:>8.1f} articles/s  "
+                  f"cpu {scenario['cpu_seconds']:.2f}s  rss {scenario['peak_rss_mb']}MB")
+    finally:
+        server.terminate()
+        server.wait()
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
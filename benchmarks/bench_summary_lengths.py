@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Summary Lengths Benchmark
+Cost of headline/card/full summaries against a stub endpoint whose
+latency grows with input length: the full summary alone, a second full
+inference for the card, and all sizes from one pass
+
+Usage:
+    python benchmarks/bench_summary_lengths.py [--articles 40] [--latency-ms 30] [--ms-per-kword 200]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_articles
+from stub_inference_server import StubInferenceServer
+
+CARD = {'max_length': 60, 'min_length': 20}
+
+
+def run(label: str, articles, server, lengths: bool, separate_card: bool, batched: bool):
+    os.environ['SUMMARIZE_SUMMARY_LENGTHS'] = 'true' if lengths else 'false'
+
+    # Settings are read at construction, so build a fresh summarizer per configuration
+    from summarize import AtlanticAnvilSummarizer
+    summarizer = AtlanticAnvilSummarizer()
+
+    requests_before = server.counters['requests']
+    start = time.perf_counter()
+    if batched:
+        results = summarizer.summarize_batch(articles)
+        if separate_card:
+            results += summarizer.summarize_batch(articles, generation=CARD)
+    else:
+        results = []
+        for article in articles:
+            results.append(summarizer.summarize_article(article))
+            if separate_card:
+                results.append(summarizer.summarize_article(article, generation=CARD))
+    seconds = time.perf_counter() - start
+
+    requests = server.counters['requests'] - requests_before
+    models = sum(1 for r in results if r.get('method') == 'sshleifer_model')
+    sizes = 'headline/card/full' if lengths else ('card + full' if separate_card else 'full')
+    print(f"{label:>34} {sizes:>18} {seconds * 1000 / len(articles):>10.1f} {requests:>9} {models:>7}")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Multi-length summaries from one pass')
+    parser.add_argument('--articles', type=int, default=40)
+    parser.add_argument('--latency-ms', type=float, default=30.0)
+    parser.add_argument('--ms-per-kword', type=float, default=200.0, help='Stub latency per 1000 input words')
+    args = parser.parse_args()
+
+    server = StubInferenceServer(('127.0.0.1', 0), latency=args.latency_ms / 1000.0,
+                                 latency_per_kword=args.ms_per_kword / 1000.0)
+    server.start_background()
+    os.environ.update({
+        'SUMMARIZE_API_URL': server.url,
+        'SUMMARIZE_RATE_LIMIT': '0',
+        'SUMMARIZE_CACHE_ENABLED': 'false',
+        'SUMMARIZE_CARD_MAX_LENGTH': str(CARD['max_length']),
+        'SUMMARIZE_CARD_MIN_LENGTH': str(CARD['min_length'])
+    })
+    articles = list(generate_articles(args.articles, seed=7))
+
+    print(f"{args.articles} articles, stub {args.latency_ms:.0f} ms + {args.ms_per_kword:.0f} ms per 1000 input words")
+    print(f"{'':>34} {'sizes':>18} {'ms/article':>10} {'requests':>9} {'model':>7}")
+    for batched in (False, True):
+        mode = 'batch' if batched else 'per article'
+        full = run(f"{mode}: full only", articles, server, False, False, batched)
+        naive = run(f"{mode}: second pass for card", articles, server, False, True, batched)
+        shared = run(f"{mode}: one pass", articles, server, True, False, batched)
+        print(f"{'':>34} extra size costs {(naive - full) / full:.0%} of a full pass as a second "
+              f"inference, {(shared - full) / full:.0%} from one pass")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
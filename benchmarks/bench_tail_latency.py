@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Tail Latency Benchmark
+Batch wall time (p50/p99) against a stub endpoint with stragglers, without
+a deadline, with a batch deadline, and with a deadline plus hedged requests
+
+Usage:
+    python benchmarks/bench_tail_latency.py [--batches 30] [--batch-size 10] [--straggler-rate 0.03]
+"""
+
+import os
+import sys
+import math
+import time
+import argparse
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_articles
+from stub_inference_server import StubInferenceServer
+
+CONFIGS = [
+    ('no deadline', {'SUMMARIZE_DEADLINE_SECONDS': '0', 'SUMMARIZE_HEDGE': 'false'}),
+    ('deadline', {'SUMMARIZE_HEDGE': 'false'}),
+    ('deadline + hedge', {'SUMMARIZE_HEDGE': 'true'}),
+]
+
+
+def percentile(values, p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * p / 100.0) - 1)]
+
+
+def run(label: str, overrides, args, api_url: str):
+    os.environ.update({
+        'SUMMARIZE_API_URL': api_url,
+        'SUMMARIZE_RATE_LIMIT': '0',
+        'SUMMARIZE_CACHE_ENABLED': 'false',
+        'SUMMARIZE_DEDUP_ENABLED': 'false',
+        'SUMMARIZE_WRITEBACK': 'false',
+        'SUMMARIZE_BATCH_SIZE': str(args.batch_size),
+        'SUMMARIZE_CONCURRENT_REQUESTS': str(args.batch_size),
+        'SUMMARIZE_DEADLINE_SECONDS': str(args.deadline),
+        'SUMMARIZE_HEDGE_MIN_SAMPLES': '20'
+    })
+    os.environ.update(overrides)
+
+    # Settings are read at construction, so build fresh instances per configuration
+    from summarize import AtlanticAnvilSummarizer
+    from batch_summarize import BatchSummarizer
+    batch = BatchSummarizer(AtlanticAnvilSummarizer())
+
+    # Warm-up fills the hedging latency window
+    batch.process_batch(list(generate_articles(args.batch_size * 3, seed=999)))
+
+    seconds = []
+    methods = Counter()
+    for i in range(args.batches):
+        articles = list(generate_articles(args.batch_size, seed=i))
+        start = time.perf_counter()
+        results = batch.process_batch(articles)
+        seconds.append(time.perf_counter() - start)
+        methods.update(result.get('method', 'failed') for result in results)
+
+    hedging = batch.get_processing_stats().get('hedging', {})
+    print(f"{label:>18} {percentile(seconds, 50):>8.2f} {percentile(seconds, 99):>8.2f} {max(seconds):>8.2f}"
+          f"   fallbacks={methods.get('extractive_fallback', 0)} failed={methods.get('failed', 0)}"
+          f" hedged={hedging.get('hedged', 0)} hedge_wins={hedging.get('hedge_wins', 0)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch tail latency with deadlines and hedging')
+    parser.add_argument('--batches', type=int, default=30)
+    parser.add_argument('--batch-size', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=100.0)
+    parser.add_argument('--jitter-ms', type=float, default=50.0)
+    parser.add_argument('--straggler-rate', type=float, default=0.03)
+    parser.add_argument('--straggler-ms', type=float, default=5000.0)
+    parser.add_argument('--deadline', type=float, default=1.5, help='Batch deadline in seconds')
+    args = parser.parse_args()
+
+    server = StubInferenceServer(('127.0.0.1', 0), latency=args.latency_ms / 1000.0,
+                                 latency_jitter=args.jitter_ms / 1000.0,
+                                 straggler_rate=args.straggler_rate,
+                                 straggler_latency=args.straggler_ms / 1000.0)
+    server.start_background()
+
+    print(f"{args.batches} batches of {args.batch_size}, {args.straggler_rate:.0%} stragglers "
+          f"(+{args.straggler_ms:.0f} ms), deadline {args.deadline}s")
+    print(f"{'':>18} {'p50 s':>8} {'p99 s':>8} {'max s':>8}")
+    for label, overrides in CONFIGS:
+        run(label, overrides, args, server.url)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Synthetic Article Corpus
+Deterministic news-like articles with a realistic length mix, for benchmarks
+
+Usage:
+    python benchmarks/corpus.py --count 5000 --output corpus.jsonl
+"""
+
+import json
+import random
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Iterator
+
+# (share of corpus, min words, max words)
+LENGTH_MIX = [
+    (0.25, 80, 250),      # wire briefs
+    (0.55, 400, 900),     # standard stories
+    (0.20, 1500, 4000),   # long-form / analysis
+]
+
+SOURCES = ['fox-news', 'daily-wire', 'breitbart', 'national-review', 'new-york-post', 'federalist', 'epoch-times']
+
+_SUBJECTS = ['The senator', 'The governor', 'House Republicans', 'The administration', 'Voters in Ohio',
+             'The Supreme Court', 'Border officials', 'The committee', 'Local businesses', 'The campaign',
+             'Trump', 'The GOP leadership', 'Federal prosecutors', 'State lawmakers', 'Economists']
+_VERBS = ['announced', 'criticized', 'approved', 'rejected', 'defended', 'unveiled', 'questioned',
+          'signed', 'blocked', 'praised', 'reviewed', 'challenged', 'proposed', 'delayed']
+_OBJECTS = ['a new border security bill', 'the spending package', 'tax relief for families',
+            'the energy proposal', 'Second Amendment protections', 'the election integrity measure',
+            'regulations on small businesses', 'the trade agreement', 'school choice funding',
+            'the inflation report', 'a plan to cut federal spending', 'the court ruling']
+_TAILS = ['on Tuesday', 'after weeks of debate', 'in a statement', 'during a press conference',
+          'according to officials', 'citing constitutional concerns', 'ahead of the midterm elections',
+          'amid growing pressure', 'in a rare bipartisan vote', 'late Friday night']
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_SUBJECTS), rng.choice(_VERBS), rng.choice(_OBJECTS), rng.choice(_TAILS)]
+    if rng.random() < 0.5:
+        words.append(f"with {rng.randint(2, 98)} percent support")
+    return ' '.join(words) + '.'
+
+
+def _body(rng: random.Random, target_words: int) -> str:
+    sentences = []
+    words = 0
+    while words < target_words:
+        sentence = _sentence(rng)
+        sentences.append(sentence)
+        words += len(sentence.split())
+
+    # Group into HTML paragraphs like RSS content:encoded
+    paragraphs = [' '.join(sentences[i:i + 4]) for i in range(0, len(sentences), 4)]
+    return ''.join(f'<p>{p}</p>' for p in paragraphs)
+
+
+def _target_length(rng: random.Random) -> int:
+    roll = rng.random()
+    for share, low, high in LENGTH_MIX:
+        if roll < share:
+            return rng.randint(low, high)
+        roll -= share
+    return LENGTH_MIX[-1][2]
+
+
+def generate_articles(count: int, seed: int = 0, duplicate_rate: float = 0.0) -> Iterator[Dict[str, Any]]:
+    """
+    Yield `count` articles. duplicate_rate of them are syndicated copies of
+    an earlier article with a different byline, dateline and trailer.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    originals: List[Dict[str, Any]] = []
+
+    for i in range(count):
+        published_at = (now - timedelta(minutes=rng.randint(0, 6 * 24 * 60))).isoformat()
+
+        if originals and rng.random() < duplicate_rate:
+            original = rng.choice(originals)
+            content = (f"By Staff Writer ({rng.choice(['AP', 'Reuters'])}) - "
+                       f"{original['content']} Read more: https://example.com/{i}")
+            title = original['title']
+        else:
+            content = _body(rng, _target_length(rng))
+            title = _sentence(rng).rstrip('.')
+
+        article = {
+            'id': f"bench-{seed}-{i}",
+            'title': title,
+            'content': content,
+            'source': rng.choice(SOURCES),
+            'published_at': published_at,
+            'views_count': int(rng.paretovariate(1.2) * 50),
+            'trending_score': rng.randint(0, 10)
+        }
+
+        if len(originals) < 500:
+            originals.append(article)
+
+        yield article
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic article corpus (JSONL)')
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--duplicate-rate', type=float, default=0.1)
+    parser.add_argument('--output', default='-')
+    args = parser.parse_args()
+
+    out = open(args.output, 'w') if args.output != '-' else None
+    try:
+        for article in generate_articles(args.count, args.seed, args.duplicate_rate):
+            line = json.dumps(article)
+            if out is not None:
+                out.write(line + '\n')
+            else:
+                print(line)
+    finally:
+        if out is not None:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Content Fingerprints
+Compact per-article fingerprints stored next to the summary so re-imported
+articles are only re-summarized when their body meaningfully changed
+"""
+
+import re
+import hashlib
+from functools import lru_cache
+from typing import List, Optional
+
+FINGERPRINT_VERSION = 'v1'
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def _simhash(words: List[str], shingle_size: int = 3) -> int:
+    """
+    64-bit SimHash over word shingles. The Hamming distance between two
+    SimHashes tracks how much of the text differs: typically about 3 bits
+    when 1% of words change and about 7 bits at 5%.
+    """
+    if len(words) < shingle_size:
+        shingles = [' '.join(words)] if words else []
+    else:
+        shingles = [' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+
+    if not shingles:
+        return 0
+
+    # Concatenate the hashes as bit strings; column b is every 64th character from b
+    bits = ''.join([format(int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big'),
+                           '064b') for shingle in shingles])
+    majority = len(shingles) / 2
+    return int(''.join('1' if bits[b::64].count('1') > majority else '0' for b in range(64)), 2)
+
+
+@lru_cache(maxsize=256)
+def content_fingerprint(clean_text: str) -> str:
+    """
+    Fingerprint of cleaned article text: 'v1:<digest>:<simhash>'. The digest
+    catches exact matches; the SimHash measures how much an edit changed.
+    Memoized because the change check and the summarizer fingerprint the same body.
+    """
+    digest = hashlib.blake2b(clean_text.encode('utf-8'), digest_size=8).hexdigest()
+    return f"{FINGERPRINT_VERSION}:{digest}:{_simhash(_WORD_RE.findall(clean_text.lower())):016x}"
+
+
+def fingerprint_distance(stored: Optional[str], current: str) -> Optional[int]:
+    """
+    Hamming distance between two fingerprints' SimHashes (0 for identical
+    content), or None when the stored fingerprint is missing or from another version
+    """
+    try:
+        stored_version, stored_digest, stored_hash = stored.split(':')
+        version, digest, simhash = current.split(':')
+    except (AttributeError, ValueError):
+        return None
+
+    if stored_version != version:
+        return None
+    if stored_digest == digest:
+        return 0
+
+    return bin(int(stored_hash, 16) ^ int(simhash, 16)).count('1')
+
+
+def has_changed(stored: Optional[str], current: str, max_distance: int) -> bool:
+    """
+    Whether content moved more than max_distance SimHash bits from the stored fingerprint
+    """
+    distance = fingerprint_distance(stored, current)
+    return distance is None or distance > max_distance
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Deadlines and Hedging
+End-to-end time budgets carried down to every inference attempt, and
+hedged requests for slow attempts
+"""
+
+import os
+import math
+import time
+import logging
+import threading
+import contextvars
+import concurrent.futures
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional, Callable, Any
+import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    The request's time budget ran out before the work could start or finish
+    """
+
+
+class Deadline:
+    """
+    Absolute point on the monotonic clock by which a request must be answered
+    """
+
+    __slots__ = ('at',)
+
+    def __init__(self, seconds: float):
+        self.at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f}s)"
+
+
+_CURRENT = contextvars.ContextVar('summarize_deadline', default=None)
+
+
+def current() -> Optional[Deadline]:
+    return _CURRENT.get()
+
+
+@contextmanager
+def scope(deadline: Optional[Deadline]):
+    """
+    Make deadline the current one for code running in this context.
+    A nested scope never extends an enclosing, earlier deadline.
+    """
+    outer = _CURRENT.get()
+    if deadline is None or (outer is not None and outer.at <= deadline.at):
+        deadline = outer
+
+    token = _CURRENT.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _CURRENT.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """
+    Seconds left in the current deadline, or None without one
+    """
+    deadline = _CURRENT.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def check():
+    """
+    Raise DeadlineExceeded if the current deadline has passed
+    """
+    deadline = _CURRENT.get()
+    if deadline is not None and deadline.expired():
+        metrics.count_deadline_exceeded()
+        raise DeadlineExceeded("Deadline exceeded before inference")
+
+
+def timeout_for(default: float) -> float:
+    """
+    Per-attempt timeout: default, clamped to what is left of the current deadline
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        metrics.count_deadline_exceeded()
+        raise DeadlineExceeded("Deadline exceeded before inference")
+    return min(default, left)
+
+
+def submit(executor, fn: Callable, *args) -> concurrent.futures.Future:
+    """
+    executor.submit that carries the caller's deadline into the worker thread
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+class HedgePolicy:
+    """
+    When to send a second copy of a slow request.
+
+    Latencies of successful attempts are kept in a sliding window; an
+    attempt still running after the window's `percentile` latency is
+    hedged. Hedges are capped at max_rate of all requests (plus a small
+    burst) so an endpoint that is slow across the board isn't sent double
+    its load, and nothing is hedged until min_samples latencies are known.
+    """
+
+    def __init__(self, percentile: float = 95.0, max_rate: float = 0.1,
+                 min_samples: int = 20, window: int = 500, burst: int = 2):
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self.burst = burst
+
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.stats = {
+            'requests': 0,
+            'hedged': 0,
+            'hedge_wins': 0,
+            'hedges_skipped': 0
+        }
+
+    @classmethod
+    def from_env(cls) -> Optional['HedgePolicy']:
+        """
+        Policy from SUMMARIZE_HEDGE_* settings; None unless SUMMARIZE_HEDGE is on
+        """
+        if os.getenv('SUMMARIZE_HEDGE', 'false').lower() not in ('1', 'true', 'yes'):
+            return None
+
+        return cls(
+            percentile=float(os.getenv('SUMMARIZE_HEDGE_PERCENTILE', 95)),
+            max_rate=float(os.getenv('SUMMARIZE_HEDGE_MAX_RATE', 0.1)),
+            min_samples=int(os.getenv('SUMMARIZE_HEDGE_MIN_SAMPLES', 20))
+        )
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def delay(self) -> Optional[float]:
+        """
+        How long to wait before hedging a new request, or None to not hedge it
+        """
+        with self._lock:
+            self.stats['requests'] += 1
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+
+        index = min(len(latencies) - 1, math.ceil(len(latencies) * self.percentile / 100.0) - 1)
+        delay = latencies[max(0, index)]
+
+        # Not worth it if the budget ends before the hedge could return
+        left = remaining()
+        if left is not None and left <= delay:
+            return None
+        return delay
+
+    def allow(self) -> bool:
+        """
+        Take a hedge from the rate cap; False when the cap is used up
+        """
+        with self._lock:
+            if self.stats['hedged'] >= self.stats['requests'] * self.max_rate + self.burst:
+                self.stats['hedges_skipped'] += 1
+                return False
+            self.stats['hedged'] += 1
+        metrics.count_hedge('sent')
+        return True
+
+    def record_win(self):
+        with self._lock:
+            self.stats['hedge_wins'] += 1
+        metrics.count_hedge('won')
+
+    def run(self, attempt: Callable[[], Any]) -> Any:
+        """
+        Call attempt(), and again on another thread if the first call is
+        still running after the hedge delay; the first success wins.
+        A blocking HTTP call can't be interrupted, so the losing attempt is
+        left to finish in the background within its (deadline-clamped)
+        timeout and its answer is dropped; a hedge that has not started yet
+        is cancelled.
+        """
+        delay = self.delay()
+        if delay is None:
+            return attempt()
+
+        executor = _hedge_executor()
+        first = submit(executor, attempt)
+        # wait() rather than result(timeout=...): the attempt's own DeadlineExceeded
+        # is a TimeoutError too and must propagate, not read as "still running"
+        done, _ = concurrent.futures.wait([first], timeout=delay)
+        if done:
+            return first.result()
+
+        if not self.allow():
+            done, _ = concurrent.futures.wait([first], timeout=remaining())
+            if not done:
+                raise DeadlineExceeded("Deadline exceeded waiting for request")
+            return first.result()
+
+        second = submit(executor, attempt)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, timeout=remaining(), return_when=concurrent.futures.FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    if future is second:
+                        self.record_win()
+                    return future.result()
+                error = future.exception()
+
+        for loser in pending:
+            loser.cancel()
+        raise error or DeadlineExceeded("Deadline exceeded waiting for hedged request")
+
+    async def run_async(self, attempt: Callable[[], Any]) -> Any:
+        """
+        Async run(): attempt returns a coroutine, and the loser is cancelled
+        """
+        import asyncio
+
+        delay = self.delay()
+        if delay is None:
+            return await attempt()
+
+        first = asyncio.ensure_future(attempt())
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done or not self.allow():
+            return await first
+
+        second = asyncio.ensure_future(attempt())
+        pending = {first, second}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=remaining(),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.record_win()
+                        return task.result()
+                    error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise error or DeadlineExceeded("Deadline exceeded waiting for hedged request")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self.stats.copy()
+            latencies = sorted(self._latencies)
+
+        if len(latencies) >= self.min_samples:
+            index = min(len(latencies) - 1, math.ceil(len(latencies) * self.percentile / 100.0) - 1)
+            stats['hedge_delay_seconds'] = round(latencies[max(0, index)], 4)
+        return stats
+
+
+# Hedged attempts run on a small shared pool rather than a thread per request
+_HEDGE_EXECUTOR = None
+_HEDGE_EXECUTOR_LOCK = threading.Lock()
+
+
+def _hedge_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _HEDGE_EXECUTOR
+    with _HEDGE_EXECUTOR_LOCK:
+        if _HEDGE_EXECUTOR is None:
+            _HEDGE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=int(os.getenv('SUMMARIZE_HEDGE_THREADS', 32)),
+                thread_name_prefix='summarize-hedge')
+        return _HEDGE_EXECUTOR
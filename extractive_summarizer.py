@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Extractive Summarizer
+TF-IDF + TextRank sentence ranking with MMR redundancy removal; vectorized
+with NumPy when it is installed, sparse pure-Python otherwise
+"""
+
+import re
+import math
+from collections import Counter
+from typing import List, Optional
+
+from text_processing import segment_sentences
+
+# NumPy is optional (the sparse path gives identical rankings) and is
+# imported on first use to keep it off the serverless cold-start path
+USE_NUMPY = True
+_numpy = None
+_numpy_checked = False
+
+
+def _load_numpy():
+    global _numpy, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = None
+        _numpy_checked = True
+    return _numpy if USE_NUMPY else None
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9'\-]*")
+
+STOPWORDS = frozenset("""
+a about after again against all also an and any are as at be because been before being between both but by
+can could did do does during each few for from further had has have having he her here hers him his how i if
+in into is it its itself just me more most my no nor not now of off on once only or other our out over own
+said same she should so some such than that the their them then there these they this those through to too
+under until up very was we were what when where which while who whom why will with would you your
+""".split())
+
+
+class ExtractiveSummarizer:
+    """
+    Ranks sentences by TextRank over TF-IDF cosine similarity, with a
+    personalization vector biased towards the lead (news puts the key facts
+    first), then picks sentences by maximal marginal relevance so the
+    summary doesn't repeat itself. Selected sentences keep article order.
+    """
+
+    def __init__(self, max_sentences: int = 3, max_words: int = 110, min_sentence_chars: int = 20,
+                 max_candidates: int = 50, damping: float = 0.85, mmr_lambda: float = 0.7,
+                 iterations: int = 30, tolerance: float = 1e-4):
+        self.max_sentences = max_sentences
+        self.max_words = max_words
+        self.min_sentence_chars = min_sentence_chars
+        self.max_candidates = max_candidates
+        self.damping = damping
+        self.mmr_lambda = mmr_lambda
+        self.iterations = iterations
+        self.tolerance = tolerance
+
+    def summarize(self, text: str, max_sentences: Optional[int] = None,
+                  max_words: Optional[int] = None) -> str:
+        """
+        Extractive summary of already-cleaned text ('' if it has no usable sentences)
+        """
+        max_sentences = max_sentences or self.max_sentences
+        max_words = max_words or self.max_words
+
+        # Long-form ranking cost is quadratic; the lead carries the story anyway
+        sentences = [s for s in segment_sentences(text) if len(s) > self.min_sentence_chars]
+        sentences = sentences[:self.max_candidates]
+        if len(sentences) <= 1:
+            return sentences[0] if sentences else ''
+
+        tokens = [[t for t in _TOKEN_RE.findall(s.lower()) if t not in STOPWORDS] for s in sentences]
+
+        np = _load_numpy()
+        if np is not None:
+            scores, similarity = self._rank_dense(tokens, np)
+        else:
+            scores, similarity = self._rank_sparse(tokens)
+
+        selected = self._select(sentences, scores, similarity, max_sentences, max_words)
+        return ' '.join(sentences[i] for i in sorted(selected))
+
+    def _lead_bias(self, n: int) -> List[float]:
+        weights = [1.0 / math.sqrt(i + 1) for i in range(n)]
+        total = sum(weights)
+        return [w / total for w in weights]
+
+    def _rank_dense(self, tokens: List[List[str]], np):
+        vocabulary = {}
+        rows, cols, values = [], [], []
+        for row, sentence_tokens in enumerate(tokens):
+            for term, count in Counter(sentence_tokens).items():
+                rows.append(row)
+                cols.append(vocabulary.setdefault(term, len(vocabulary)))
+                values.append(count)
+
+        n = len(tokens)
+        matrix = np.zeros((n, max(1, len(vocabulary))))
+        matrix[rows, cols] = values
+
+        # Sentences are the documents for IDF within a single article
+        document_frequency = np.count_nonzero(matrix, axis=0)
+        matrix *= np.log((1 + n) / (1 + document_frequency)) + 1.0
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1.0, norms)
+
+        similarity = matrix @ matrix.T
+        np.fill_diagonal(similarity, 0.0)
+
+        # Row-normalized transition matrix; isolated sentences jump to the lead prior
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        bias = np.array(self._lead_bias(n))
+        transition = np.where(out_weight > 0, similarity / np.where(out_weight == 0, 1.0, out_weight), bias)
+
+        scores = np.full(n, 1.0 / n)
+        for _ in range(self.iterations):
+            updated = (1 - self.damping) * bias + self.damping * (transition.T @ scores)
+            converged = np.abs(updated - scores).sum() < self.tolerance
+            scores = updated
+            if converged:
+                break
+
+        return scores.tolist(), similarity.tolist()
+
+    def _rank_sparse(self, tokens: List[List[str]]):
+        n = len(tokens)
+        document_frequency = Counter(term for sentence_tokens in tokens for term in set(sentence_tokens))
+
+        vectors = []
+        for sentence_tokens in tokens:
+            vector = {term: count * (math.log((1 + n) / (1 + document_frequency[term])) + 1.0)
+                      for term, count in Counter(sentence_tokens).items()}
+            norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+            vectors.append({term: v / norm for term, v in vector.items()})
+
+        similarity = [[0.0] * n for _ in range(n)]
+        for i in range(n):
+            vi = vectors[i]
+            for j in range(i + 1, n):
+                vj = vectors[j]
+                if len(vj) < len(vi):
+                    value = sum(weight * vi[term] for term, weight in vj.items() if term in vi)
+                else:
+                    value = sum(weight * vj[term] for term, weight in vi.items() if term in vj)
+                similarity[i][j] = similarity[j][i] = value
+
+        bias = self._lead_bias(n)
+        neighbours = [[(j, weight) for j, weight in enumerate(row) if weight] for row in similarity]
+        out_weight = [sum(weight for _, weight in edges) for edges in neighbours]
+
+        scores = [1.0 / n] * n
+        for _ in range(self.iterations):
+            incoming = [0.0] * n
+            dangling = 0.0
+            for i, edges in enumerate(neighbours):
+                if out_weight[i] > 0:
+                    share = scores[i] / out_weight[i]
+                    for j, weight in edges:
+                        incoming[j] += weight * share
+                else:
+                    dangling += scores[i]
+
+            updated = [(1 - self.damping) * bias[j] + self.damping * (incoming[j] + dangling * bias[j])
+                       for j in range(n)]
+            converged = sum(abs(a - b) for a, b in zip(updated, scores)) < self.tolerance
+            scores = updated
+            if converged:
+                break
+
+        return scores, similarity
+
+    def _select(self, sentences: List[str], scores: List[float], similarity: List[List[float]],
+                max_sentences: int, max_words: int) -> List[int]:
+        """
+        Maximal marginal relevance within the sentence and word budget
+        """
+        top = max(scores) or 1.0
+        relevance = [score / top for score in scores]
+
+        selected = []
+        words = 0
+        candidates = set(range(len(sentences)))
+
+        while candidates and len(selected) < max_sentences:
+            best = max(candidates, key=lambda i: self.mmr_lambda * relevance[i] - (1 - self.mmr_lambda) *
+                       max((similarity[i][j] for j in selected), default=0.0))
+            candidates.discard(best)
+
+            length = len(sentences[best].split())
+            if selected and words + length > max_words:
+                continue
+
+            selected.append(best)
+            words += length
+
+        return selected
+
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Keyword Scoring
+One-pass multi-pattern keyword matching with weighted per-category scores,
+used for the conservative-context check and topic tagging
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Category used by enhance_conservative_context
+CONTEXT_CATEGORY = 'conservative'
+
+# Default lexicon: the summarizer's context keywords plus the importer's
+# category slugs (news-rss-importer/rss-scraper.js CATEGORY_KEYWORDS)
+DEFAULT_LEXICON = {
+    CONTEXT_CATEGORY: [
+        'conservative', 'republican', 'trump', 'gop', 'patriot', 'america first',
+        'constitution', 'freedom', 'liberty', 'traditional values', 'border security',
+        'second amendment', 'pro-life', 'fiscal responsibility', 'small government'
+    ],
+    'trump': ['trump', 'donald', 'maga', 'president trump', '45th', '47th'],
+    'republican-party': ['gop', 'republican', 'congress', 'senate', 'house', 'mccarthy', 'mcconnell'],
+    'europe': ['europe', 'eu', 'brexit', 'france', 'germany', 'uk', 'britain', 'italy'],
+    'elon-musk': ['elon', 'musk', 'tesla', 'spacex', 'twitter', 'x.com', 'x platform'],
+    'steve-bannon': ['bannon', 'war room', 'populist', 'bannons'],
+    'breaking': ['breaking', 'urgent', 'alert', 'just in', 'developing', 'update']
+}
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """
+    Prefix-factored alternation of the terms. Each step of the regex engine
+    only tries branches that share the text's next character, so matching
+    cost depends on term length, not on how many terms there are.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = None
+
+    def build(node) -> str:
+        ends_here = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if ends_here:
+            body = ('(?:' + body + ')' if len(branches) == 1 and len(body) > 1 else body) + '?'
+        return body
+
+    return build(trie)
+
+
+class KeywordMatch:
+    """
+    Keyword hits for one text, with weighted scores per category
+    """
+
+    __slots__ = ('hits', 'scores', 'distinct')
+
+    def __init__(self, hits: Dict[str, int], scores: Dict[str, float], distinct: Dict[str, int]):
+        self.hits = hits
+        self.scores = scores
+        self.distinct = distinct
+
+    def topics(self, min_score: float = 1.0, exclude: Iterable[str] = (CONTEXT_CATEGORY,)) -> List[str]:
+        """
+        Categories scoring at least min_score, best first
+        """
+        ranked = sorted(self.scores.items(), key=lambda item: (-item[1], item[0]))
+        return [category for category, score in ranked if score >= min_score and category not in exclude]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'hits': self.hits, 'scores': self.scores, 'distinct': self.distinct}
+
+
+class KeywordLexicon:
+    """
+    Compiled, immutable form of a {category: {term: weight}} lexicon.
+    A term may belong to several categories. Terms match case-insensitively
+    on word boundaries, with an optional plural "s".
+    """
+
+    def __init__(self, categories: Dict[str, Dict[str, float]]):
+        self.categories = categories
+        own_weights = {}  # term -> {category: weight}
+        for category, terms in categories.items():
+            for term, weight in terms.items():
+                own_weights.setdefault(term, {})[category] = weight
+
+        # Matches don't overlap, so "president trump" must also count for the
+        # categories of "trump": each term inherits the weights of terms inside it.
+        # The lexicon terms it stands for are kept too, so a category's distinct
+        # count is the number of its terms found, nested or not.
+        self.term_weights = {}  # term -> [(category, weight)]
+        self.term_sources = {}  # term -> [(category, {lexicon terms})]
+        for term, weights in own_weights.items():
+            merged = dict(weights)
+            sources = {category: {term} for category in weights}
+            words = term.split()
+            for size in range(len(words) - 1, 0, -1):
+                for start in range(len(words) - size + 1):
+                    nested = ' '.join(words[start:start + size])
+                    for category, weight in own_weights.get(nested, {}).items():
+                        merged.setdefault(category, weight)
+                        sources.setdefault(category, set()).add(nested)
+            self.term_weights[term] = list(merged.items())
+            self.term_sources[term] = [(category, frozenset(found)) for category, found in sources.items()]
+
+        pattern = _trie_pattern(self.term_weights) if self.term_weights else r'(?!x)x'
+        self.regex = re.compile(r'(?<!\w)(' + pattern + r')s?(?!\w)')
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'KeywordLexicon':
+        """
+        Build from {category: [term, ...]} or {category: {term: weight}}
+        """
+        categories = {}
+        for category, terms in config.items():
+            if isinstance(terms, dict):
+                weights = {term: float(weight) for term, weight in terms.items()}
+            else:
+                weights = {term: 1.0 for term in terms}
+            categories[category] = {term.lower().strip(): weight for term, weight in weights.items() if term.strip()}
+        return cls(categories)
+
+    def _score_hits(self, hits: Counter) -> KeywordMatch:
+        scores = {}
+        found = {}
+        for term, count in hits.items():
+            for category, weight in self.term_weights[term]:
+                scores[category] = scores.get(category, 0.0) + weight * count
+            for category, sources in self.term_sources[term]:
+                found.setdefault(category, set()).update(sources)
+        # "president trump" and a separate "trump" are one conservative keyword, not two
+        distinct = {category: len(terms) for category, terms in found.items()}
+        return KeywordMatch(dict(hits), scores, distinct)
+
+    def score(self, text: str) -> KeywordMatch:
+        return self._score_hits(Counter(self.regex.findall(text.lower())))
+
+    def score_batch(self, texts: List[str]) -> List[KeywordMatch]:
+        """
+        Score many texts with the same compiled pattern and weight table
+        """
+        findall = self.regex.findall
+        score_hits = self._score_hits
+        return [score_hits(Counter(findall(text.lower()))) for text in texts]
+
+
+class KeywordScorer:
+    """
+    Scores text against a lexicon that can be reloaded while running.
+
+    With SUMMARIZE_KEYWORDS_PATH set, the lexicon is read from that JSON
+    file and re-read when its mtime changes (checked at most every
+    reload_interval seconds). A new compiled lexicon is swapped in whole,
+    so concurrent scorers never see a half-built one.
+    """
+
+    def __init__(self, path: Optional[str] = None, reload_interval: float = 30.0,
+                 default: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.default = default or DEFAULT_LEXICON
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked_at = 0.0
+        self.lexicon = KeywordLexicon.from_config(self.default)
+        self.reloads = 0
+
+        if self.path:
+            self._reload()
+
+    @classmethod
+    def from_env(cls, default: Optional[Dict[str, Any]] = None) -> 'KeywordScorer':
+        return cls(
+            path=os.getenv('SUMMARIZE_KEYWORDS_PATH') or None,
+            reload_interval=float(os.getenv('SUMMARIZE_KEYWORDS_RELOAD_SECONDS', 30)),
+            default=default
+        )
+
+    def _reload(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime == self._mtime:
+                return
+            with open(self.path) as f:
+                lexicon = KeywordLexicon.from_config(json.load(f))
+        except (OSError, ValueError, AttributeError) as e:
+            # Keep serving the current lexicon
+            logger.error(f"Could not load keyword lexicon from {self.path}: {str(e)}")
+            return
+
+        self.lexicon = lexicon
+        self._mtime = mtime
+        self.reloads += 1
+        logger.info(f"Loaded {len(lexicon.term_weights)} keywords in {len(lexicon.categories)} "
+                    f"categories from {self.path}")
+
+    def current(self) -> KeywordLexicon:
+        """
+        The lexicon to score with, reloading it first if the file changed
+        """
+        if self.path:
+            now = time.monotonic()
+            if now - self._checked_at >= self.reload_interval:
+                with self._lock:
+                    if now - self._checked_at >= self.reload_interval:
+                        self._checked_at = now
+                        self._reload()
+        return self.lexicon
+
+    def score(self, text: str) -> KeywordMatch:
+        return self.current().score(text)
+
+    def score_batch(self, texts: List[str]) -> List[KeywordMatch]:
+        return self.current().score_batch(texts)
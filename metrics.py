@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Summarizer Metrics
+Stage timers, histograms and counters for the summarization hot path,
+exported in the Prometheus text format. Disabled by default; when off,
+every call returns after a single flag check.
+"""
+
+import os
+import sys
+import time
+import atexit
+import bisect
+import logging
+import threading
+from collections import Counter as _StackCounter
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv('SUMMARIZE_METRICS', 'false').lower() in ('1', 'true', 'yes')
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; covers sub-millisecond text stages up to slow inference calls
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Bytes; request and response bodies
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class _Metric:
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._lock = threading.Lock()
+
+    def _labels(self, values: Tuple[str, ...]) -> str:
+        if not values:
+            return ''
+        pairs = ','.join(f'{name}="{value}"' for name, value in zip(self.label_names, values))
+        return '{' + pairs + '}'
+
+
+class CounterMetric(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, label_names)
+        self._values = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._labels(labels)} {value:g}" for labels, value in items]
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {','.join(labels) or 'total': value for labels, value in self._values.items()}
+
+
+class HistogramMetric(_Metric):
+    """
+    Fixed-bucket histogram; each label set keeps per-bucket counts, a sum and a count
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, ([*counts], total, count)) for labels, (counts, total, count) in self._series.items())
+
+        lines = []
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                label_text = self._labels(labels)
+                label_text = (label_text[:-1] + ',' if label_text else '{') + f'le="{le}"}}'
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {total:g}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {count}")
+        return lines
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                ','.join(labels) or 'total': {'count': count, 'sum': round(total, 6)}
+                for labels, (_, total, count) in self._series.items()
+            }
+
+
+STAGE_SECONDS = HistogramMetric(
+    'summarize_stage_seconds', 'Time spent in each summarization stage', ('stage',))
+HTTP_SECONDS = HistogramMetric(
+    'summarize_http_request_seconds', 'Inference HTTP request latency', ('status',))
+HTTP_REQUEST_BYTES = HistogramMetric(
+    'summarize_http_request_bytes', 'Inference HTTP request payload size', buckets=SIZE_BUCKETS)
+HTTP_RESPONSE_BYTES = HistogramMetric(
+    'summarize_http_response_bytes', 'Inference HTTP response size', buckets=SIZE_BUCKETS)
+RESULTS = CounterMetric(
+    'summarize_results_total', 'Summaries produced, by method and whether they came from cache', ('method', 'cached'))
+RETRIES = CounterMetric(
+    'summarize_retries_total', 'Article summarization retries')
+BACKOFF_SECONDS = CounterMetric(
+    'summarize_backoff_seconds_total', 'Time spent backing off, by reason', ('reason',))
+THROTTLED = CounterMetric(
+    'summarize_throttled_total', 'Throttling responses from the inference endpoint')
+CIRCUIT_REJECTED = CounterMetric(
+    'summarize_circuit_rejected_total', 'Requests skipped because the circuit breaker was open')
+HEDGES = CounterMetric(
+    'summarize_hedged_requests_total', 'Hedged inference requests, by outcome', ('outcome',))
+DEADLINE_EXCEEDED = CounterMetric(
+    'summarize_deadline_exceeded_total', 'Inference attempts not made because the deadline had passed')
+COALESCED = CounterMetric(
+    'summarize_coalesced_requests_total', 'Summarization requests that shared an identical in-flight request')
+SHARD_REBALANCES = CounterMetric(
+    'summarize_shard_rebalances_total', 'Hash ring rebuilds after queue workers joined or left')
+SHARD_STOLEN = CounterMetric(
+    'summarize_shard_stolen_total', "Queue rows claimed from another worker's shard")
+
+REGISTRY = [STAGE_SECONDS, HTTP_SECONDS, HTTP_REQUEST_BYTES, HTTP_RESPONSE_BYTES,
+            RESULTS, RETRIES, BACKOFF_SECONDS, THROTTLED, CIRCUIT_REJECTED, HEDGES, DEADLINE_EXCEEDED,
+            COALESCED, SHARD_REBALANCES, SHARD_STOLEN]
+
+
+class _StageTimer:
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        STAGE_SECONDS.observe(time.perf_counter() - self.start, self.stage)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def stage(name: str):
+    """
+    Context manager timing one stage (clean, enhance, request, post_process, fallback, ...)
+    """
+    if not ENABLED:
+        return _NULL_TIMER
+    return _StageTimer(name)
+
+
+def observe_http(seconds: float, status: Any, request_bytes: Optional[int] = None,
+                 response_bytes: Optional[int] = None):
+    if not ENABLED:
+        return
+    HTTP_SECONDS.observe(seconds, str(status))
+    if request_bytes is not None:
+        HTTP_REQUEST_BYTES.observe(request_bytes)
+    if response_bytes is not None:
+        HTTP_RESPONSE_BYTES.observe(response_bytes)
+
+
+def count_result(result: Dict[str, Any]):
+    """
+    Count a finished summary by method; failures count as method 'failed'
+    """
+    if not ENABLED:
+        return
+    method = result.get('method', 'unknown') if result.get('success') else 'failed'
+    RESULTS.inc(method, 'true' if result.get('cached') else 'false')
+
+
+def count_retry(backoff_seconds: float = 0.0):
+    if not ENABLED:
+        return
+    RETRIES.inc()
+    if backoff_seconds:
+        BACKOFF_SECONDS.inc('retry', amount=backoff_seconds)
+
+
+def count_backoff(reason: str, seconds: float):
+    if not ENABLED or seconds <= 0:
+        return
+    BACKOFF_SECONDS.inc(reason, amount=seconds)
+
+
+def count_throttle():
+    if ENABLED:
+        THROTTLED.inc()
+
+
+def count_circuit_rejection():
+    if ENABLED:
+        CIRCUIT_REJECTED.inc()
+
+
+def count_hedge(outcome: str):
+    if ENABLED:
+        HEDGES.inc(outcome)
+
+
+def count_deadline_exceeded():
+    if ENABLED:
+        DEADLINE_EXCEEDED.inc()
+
+
+def count_coalesced():
+    if ENABLED:
+        COALESCED.inc()
+
+
+def count_rebalance():
+    if ENABLED:
+        SHARD_REBALANCES.inc()
+
+
+def count_stolen(count: int):
+    if ENABLED:
+        SHARD_STOLEN.inc(amount=count)
+
+
+def render_prometheus() -> str:
+    """
+    All metrics in the Prometheus text exposition format
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.collect())
+    return '\n'.join(lines) + '\n'
+
+
+def snapshot() -> Dict[str, Any]:
+    """
+    Compact JSON-friendly view, attached to batch processing stats
+    """
+    return {metric.name: metric.snapshot() for metric in REGISTRY}
+
+
+class SamplingProfiler:
+    """
+    Low-overhead wall-clock profiler: a daemon thread samples every other
+    thread's stack interval seconds apart and counts collapsed stacks
+    ("frame;frame;frame count" lines, the flamegraph.pl input format)
+    """
+
+    def __init__(self, interval: float = 0.01, max_depth: int = 48):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = _StackCounter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='summarize-profiler', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def collapsed(self) -> str:
+        return '\n'.join(f"{stack} {count}" for stack, count in self.samples.most_common()) + '\n'
+
+    def write(self, path: str):
+        with open(path, 'w') as f:
+            f.write(self.collapsed())
+        logger.info(f"Wrote {sum(self.samples.values())} profile samples to {path}")
+
+
+_PROFILER = None
+
+
+def start_profiler_from_env() -> Optional[SamplingProfiler]:
+    """
+    Start the sampling profiler when SUMMARIZE_PROFILE_HZ is set; the
+    collapsed stacks go to SUMMARIZE_PROFILE_OUTPUT when the process exits
+    """
+    global _PROFILER
+    hz = float(os.getenv('SUMMARIZE_PROFILE_HZ', 0))
+    if hz <= 0 or _PROFILER is not None:
+        return _PROFILER
+
+    _PROFILER = SamplingProfiler(interval=1.0 / hz)
+    _PROFILER.start()
+
+    output = os.getenv('SUMMARIZE_PROFILE_OUTPUT', f'summarize-profile-{os.getpid()}.folded')
+    atexit.register(lambda: (_PROFILER.stop(), _PROFILER.write(output)))
+    logger.info(f"Sampling profiler running at {hz:g} Hz")
+    return _PROFILER
+
+
+def handler(request):
+    """
+    Serverless metrics endpoint: GET returns the Prometheus text format
+    """
+    if request.method != 'GET':
+        return {
+            'statusCode': 405,
+            'headers': {'Access-Control-Allow-Origin': '*'},
+            'body': 'Method not allowed\n'
+        }
+
+    return {
+        'statusCode': 200,
+        'headers': {'Content-Type': PROMETHEUS_CONTENT_TYPE},
+        'body': render_prometheus()
+    }
+
+
+def start_http_server(port: int, host: str = '0.0.0.0'):
+    """
+    Serve /metrics from a daemon thread, for long-running workers
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = render_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='summarize-metrics', daemon=True).start()
+    logger.info(f"Metrics exporter listening on {host}:{server.server_address[1]}")
+    return server
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Near-Duplicate Article Index
+MinHash LSH over word shingles so syndicated copies share one summary
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import random
+import sqlite3
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.path.join(tempfile.gettempdir(), 'atlantic_anvil_near_duplicates.sqlite3')
+
+# Mersenne prime used for the universal hash family
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+# NumPy is optional (the pure-Python path gives identical signatures) and
+# is imported on first use to keep it off the serverless cold-start path
+USE_NUMPY = True
+_numpy = None
+_numpy_checked = False
+
+
+def _load_numpy():
+    global _numpy, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = None
+        _numpy_checked = True
+    return _numpy if USE_NUMPY else None
+
+
+def _mod_prime(np, x):
+    """
+    x mod 2^61 - 1 for uint64 x below 2^63
+    """
+    x = (x & np.uint64(_PRIME)) + (x >> np.uint64(61))
+    return np.where(x >= np.uint64(_PRIME), x - np.uint64(_PRIME), x)
+
+
+def _minhash_numpy(np, perms, hashes: List[int]) -> List[int]:
+    """
+    min over hashes of (a * h + b) mod 2^61 - 1 for every (a, b), in uint64.
+    a * h needs up to 93 bits, so a is split at bit 32: a_lo * h fits in
+    64 bits, and a_hi * h * 2^32 is folded with 2^61 = 1 (mod p).
+    """
+    a_lo, a_hi, b = perms
+    h = np.asarray(hashes, dtype=np.uint64)[None, :]
+
+    low = a_lo * h
+    low = (low & np.uint64(_PRIME)) + (low >> np.uint64(61))
+    high = a_hi * h
+    high = (high >> np.uint64(29)) + ((high & np.uint64((1 << 29) - 1)) << np.uint64(32))
+
+    values = _mod_prime(np, _mod_prime(np, low + high) + b)
+    return (values.min(axis=1) & np.uint64(_MAX_HASH)).tolist()
+
+
+class NearDuplicateIndex:
+    """
+    Incremental near-duplicate index.
+
+    Each article is reduced to a MinHash signature of its word shingles and
+    bucketed by LSH bands. Articles whose estimated Jaccard similarity with
+    an existing cluster's representative passes the threshold join that
+    cluster. Clusters (and the summary produced for them) are kept in SQLite
+    so a story seen in an earlier batch still counts. A stored summary is
+    tagged with the generation settings that produced it and only served
+    back for the same settings.
+    """
+
+    def __init__(self, db_path: Optional[str] = DEFAULT_INDEX_PATH,
+                 num_perm: int = 64,
+                 bands: int = 16,
+                 shingle_size: int = 3,
+                 threshold: float = 0.8,
+                 ttl_seconds: int = 7 * 24 * 3600):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+
+        # Fixed seed so signatures stay comparable across processes
+        rng = random.Random(0x41414e)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._perm_arrays = None
+
+        self._lock = threading.Lock()
+        self.stats = {
+            'lookups': 0,
+            'matched': 0,
+            'new_clusters': 0
+        }
+
+        try:
+            self._conn = sqlite3.connect(db_path or ':memory:', check_same_thread=False, timeout=10)
+        except sqlite3.Error as e:
+            logger.warning(f"Near-duplicate index falling back to memory ({db_path}): {str(e)}")
+            self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS dedup_clusters ('
+            'cluster_id TEXT PRIMARY KEY, representative_id TEXT, signature TEXT NOT NULL, '
+            'summary TEXT, summary_settings TEXT, member_count INTEGER NOT NULL DEFAULT 1, '
+            'created_at REAL NOT NULL, updated_at REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS dedup_buckets ('
+            'band INTEGER NOT NULL, bucket TEXT NOT NULL, cluster_id TEXT NOT NULL, '
+            'PRIMARY KEY (band, bucket, cluster_id))'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS dedup_members ('
+            'cluster_id TEXT NOT NULL, article_id TEXT NOT NULL, '
+            'PRIMARY KEY (cluster_id, article_id))'
+        )
+
+        # Indexes created by earlier versions; their untagged summaries never match
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(dedup_clusters)')}
+        if 'summary_settings' not in columns:
+            self._conn.execute('ALTER TABLE dedup_clusters ADD COLUMN summary_settings TEXT')
+
+        # A warm instance lives across many requests, so expired clusters are also pruned as it goes
+        self._prune_interval = min(ttl_seconds, 3600)
+        self._pruned_at = 0.0
+        self._prune(time.time())
+
+    @classmethod
+    def from_env(cls) -> Optional['NearDuplicateIndex']:
+        """
+        Build an index from environment settings, or None if dedup is disabled
+        """
+        if os.getenv('SUMMARIZE_DEDUP_ENABLED', 'true').lower() in ('0', 'false', 'no'):
+            return None
+
+        return cls(
+            db_path=os.getenv('SUMMARIZE_DEDUP_PATH', DEFAULT_INDEX_PATH) or None,
+            threshold=float(os.getenv('SUMMARIZE_DEDUP_THRESHOLD', 0.8)),
+            ttl_seconds=int(os.getenv('SUMMARIZE_DEDUP_TTL_SECONDS', 7 * 24 * 3600))
+        )
+
+    def signature(self, text: str) -> List[int]:
+        """
+        MinHash signature of the text's word shingles
+        """
+        words = _WORD_RE.findall(text.lower())
+        k = self.shingle_size
+
+        if len(words) < k:
+            shingles = {' '.join(words)}
+        else:
+            shingles = {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+        hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little')
+            for s in shingles
+        ]
+
+        np = _load_numpy()
+        if np is not None:
+            if self._perm_arrays is None:
+                self._perm_arrays = (
+                    np.array([a & 0xFFFFFFFF for a, _ in self._perms], dtype=np.uint64)[:, None],
+                    np.array([a >> 32 for a, _ in self._perms], dtype=np.uint64)[:, None],
+                    np.array([b for _, b in self._perms], dtype=np.uint64)[:, None]
+                )
+            return _minhash_numpy(np, self._perm_arrays, hashes)
+
+        return [
+            min((a * h + b) % _PRIME for h in hashes) & _MAX_HASH
+            for a, b in self._perms
+        ]
+
+    def similarity(self, sig_a: List[int], sig_b: List[int]) -> float:
+        """
+        Estimated Jaccard similarity of two signatures
+        """
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / self.num_perm
+
+    def _band_keys(self, sig: List[int]) -> List[str]:
+        r = self.rows_per_band
+        return [
+            hashlib.blake2b(','.join(map(str, sig[i * r:(i + 1) * r])).encode('ascii'),
+                            digest_size=8).hexdigest()
+            for i in range(self.bands)
+        ]
+
+    def assign(self, article_id: Optional[str], text: str) -> str:
+        """
+        Place an article into its cluster, creating a new cluster if no
+        indexed article is similar enough. Returns the cluster id.
+        """
+        sig = self.signature(text)
+        band_keys = self._band_keys(sig)
+        now = time.time()
+
+        with self._lock:
+            self.stats['lookups'] += 1
+            if now - self._pruned_at >= self._prune_interval:
+                self._prune(now)
+
+            candidates = set()
+            for band, bucket in enumerate(band_keys):
+                rows = self._conn.execute(
+                    'SELECT cluster_id FROM dedup_buckets WHERE band = ? AND bucket = ?',
+                    (band, bucket)
+                ).fetchall()
+                candidates.update(row[0] for row in rows)
+
+            best_id, best_score = None, 0.0
+            for cluster_id in candidates:
+                row = self._conn.execute(
+                    'SELECT signature FROM dedup_clusters WHERE cluster_id = ?', (cluster_id,)
+                ).fetchone()
+                if row is None:
+                    continue
+                score = self.similarity(sig, json.loads(row[0]))
+                if score > best_score:
+                    best_id, best_score = cluster_id, score
+
+            if best_id is not None and best_score >= self.threshold:
+                # An article seen again (a re-import or edit) is still one member
+                added = article_id is None or self._conn.execute(
+                    'INSERT OR IGNORE INTO dedup_members (cluster_id, article_id) VALUES (?, ?)',
+                    (best_id, str(article_id))
+                ).rowcount > 0
+                self._conn.execute(
+                    'UPDATE dedup_clusters SET member_count = member_count + ?, updated_at = ? '
+                    'WHERE cluster_id = ?', (1 if added else 0, now, best_id)
+                )
+                self._conn.commit()
+                self.stats['matched'] += 1
+                return best_id
+
+            cluster_id = uuid.uuid4().hex
+            self._conn.execute(
+                'INSERT INTO dedup_clusters (cluster_id, representative_id, signature, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (cluster_id, str(article_id) if article_id is not None else None, json.dumps(sig), now, now)
+            )
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO dedup_buckets (band, bucket, cluster_id) VALUES (?, ?, ?)',
+                [(band, bucket, cluster_id) for band, bucket in enumerate(band_keys)]
+            )
+            if article_id is not None:
+                self._conn.execute(
+                    'INSERT OR IGNORE INTO dedup_members (cluster_id, article_id) VALUES (?, ?)',
+                    (cluster_id, str(article_id))
+                )
+            self._conn.commit()
+            self.stats['new_clusters'] += 1
+            return cluster_id
+
+    def get_summary(self, cluster_id: str, settings: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Summary previously produced for this cluster with the same generation
+        settings (model, lengths, beams), if any
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT summary, summary_settings FROM dedup_clusters WHERE cluster_id = ?', (cluster_id,)
+            ).fetchone()
+
+        if row is None or row[0] is None or row[1] != settings:
+            return None
+        return json.loads(row[0])
+
+    def set_summary(self, cluster_id: str, result: Dict[str, Any], settings: Optional[str] = None):
+        """
+        Record the representative's summary, and the settings it was made
+        with, for the rest of the cluster
+        """
+        with self._lock:
+            self._conn.execute(
+                'UPDATE dedup_clusters SET summary = ?, summary_settings = ?, updated_at = ? WHERE cluster_id = ?',
+                (json.dumps(result), settings, time.time(), cluster_id)
+            )
+            self._conn.commit()
+
+    def _prune(self, now: float):
+        """
+        Forget clusters that have not been touched within the TTL
+        """
+        self._pruned_at = now
+        cutoff = now - self.ttl_seconds
+        for table in ('dedup_buckets', 'dedup_members'):
+            self._conn.execute(
+                f'DELETE FROM {table} WHERE cluster_id IN '
+                '(SELECT cluster_id FROM dedup_clusters WHERE updated_at < ?)', (cutoff,)
+            )
+        self._conn.execute('DELETE FROM dedup_clusters WHERE updated_at < ?', (cutoff,))
+        self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return lookup counters and cluster statistics
+        """
+        with self._lock:
+            stats = self.stats.copy()
+            clusters, members, largest, multi, summarized = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(member_count), 0), COALESCE(MAX(member_count), 0), '
+                'COALESCE(SUM(member_count > 1), 0), COUNT(summary) FROM dedup_clusters'
+            ).fetchone()
+
+        stats['clusters'] = clusters
+        stats['indexed_articles'] = members
+        stats['largest_cluster'] = largest
+        stats['multi_member_clusters'] = multi
+        stats['summarized_clusters'] = summarized
+        return stats
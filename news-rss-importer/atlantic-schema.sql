@@ -69,6 +69,9 @@ CREATE TABLE public.articles (
     content TEXT,
     excerpt TEXT,
     summary TEXT, -- AI-generated summary
+    summary_card TEXT, -- shorter summary for story cards (summary_lengths.py)
+    summary_headline TEXT, -- one-sentence headline blurb
+    content_fingerprint TEXT, -- fingerprint of the content the summary was made from
     original_url TEXT NOT NULL,
     image_url TEXT,
     thumbnail_url TEXT,
@@ -204,11 +207,23 @@ CREATE TABLE public.summarization_queue (
     attempts INTEGER DEFAULT 0,
     max_attempts INTEGER DEFAULT 3,
     error_message TEXT,
+    claimed_by TEXT, -- worker holding the lease (queue_worker.py)
+    lease_expires_at TIMESTAMPTZ,
     processed_at TIMESTAMPTZ,
     created_at TIMESTAMPTZ DEFAULT NOW(),
+    -- position of article_id on the worker hash ring (sharding.ring_position)
+    ring_position BIGINT GENERATED ALWAYS AS (('x' || substr(md5(article_id::text), 1, 8))::bit(32)::bigint) STORED,
     UNIQUE(article_id)
 );
 
+-- Summarization workers sharing the queue by consistent hashing (sharding.py)
+CREATE TABLE public.summarization_workers (
+    worker_id TEXT PRIMARY KEY,
+    backlog INTEGER DEFAULT 0, -- claimable rows in the worker's ring ranges
+    heartbeat_at TIMESTAMPTZ DEFAULT NOW(),
+    started_at TIMESTAMPTZ DEFAULT NOW()
+);
+
 -- RSS feed cache
 CREATE TABLE public.rss_cache (
     id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
@@ -245,6 +260,9 @@ CREATE INDEX idx_analytics_events_type ON analytics_events(event_type);
 CREATE INDEX idx_analytics_events_created_at ON analytics_events(created_at);
 CREATE INDEX idx_analytics_events_article_id ON analytics_events(article_id);
 
+CREATE INDEX idx_summarization_queue_status ON summarization_queue(status, created_at);
+CREATE INDEX idx_summarization_queue_ring ON summarization_queue(ring_position) WHERE status IN ('pending', 'processing');
+
 -- Row Level Security Policies
 ALTER TABLE profiles ENABLE ROW LEVEL SECURITY;
 ALTER TABLE articles ENABLE ROW LEVEL SECURITY;
@@ -409,11 +427,23 @@ CREATE TABLE public.summarization_queue (
     attempts INTEGER DEFAULT 0,
     max_attempts INTEGER DEFAULT 3,
     error_message TEXT,
+    claimed_by TEXT, -- worker holding the lease (queue_worker.py)
+    lease_expires_at TIMESTAMPTZ,
     processed_at TIMESTAMPTZ,
     created_at TIMESTAMPTZ DEFAULT NOW(),
+    -- position of article_id on the worker hash ring (sharding.ring_position)
+    ring_position BIGINT GENERATED ALWAYS AS (('x' || substr(md5(article_id::text), 1, 8))::bit(32)::bigint) STORED,
     UNIQUE(article_id)
 );
 
+-- Summarization workers sharing the queue by consistent hashing (sharding.py)
+CREATE TABLE public.summarization_workers (
+    worker_id TEXT PRIMARY KEY,
+    backlog INTEGER DEFAULT 0, -- claimable rows in the worker's ring ranges
+    heartbeat_at TIMESTAMPTZ DEFAULT NOW(),
+    started_at TIMESTAMPTZ DEFAULT NOW()
+);
+
 -- RSS feed cache
 CREATE TABLE public.rss_cache (
     id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
@@ -451,6 +481,9 @@ CREATE INDEX idx_analytics_events_type ON analytics_events(event_type);
 CREATE INDEX idx_analytics_events_created_at ON analytics_events(created_at);
 CREATE INDEX idx_analytics_events_article_id ON analytics_events(article_id);
 
+CREATE INDEX idx_summarization_queue_status ON summarization_queue(status, created_at);
+CREATE INDEX idx_summarization_queue_ring ON summarization_queue(ring_position) WHERE status IN ('pending', 'processing');
+
 -- Row Level Security Policies
 ALTER TABLE profiles ENABLE ROW LEVEL SECURITY;
 ALTER TABLE articles ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Priority Scheduler
+Orders summarization work so fresh, trending stories go first, with aging
+so old work can't starve and deadlines for stories that must not wait
+"""
+
+import os
+import math
+import time
+import heapq
+import logging
+import weakref
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """
+    Epoch seconds from an ISO-8601 string or datetime (naive values are UTC)
+    """
+    if value is None:
+        return None
+
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _number(value: Any) -> float:
+    try:
+        return max(0.0, float(value or 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class PriorityScheduler:
+    """
+    Heap of pending articles keyed by priority score plus linear aging.
+
+    Every entry gains aging_per_hour points for each hour it waits. Because
+    all entries age at the same rate, the effective order is fixed at push
+    time (priority - rate x enqueue time), so a plain heap gives exact
+    aging with O(log n) push and pop. Entries with a deadline sit in a second
+    heap; once a deadline is within deadline_slack seconds, that entry is
+    served before anything else.
+    """
+
+    def __init__(self, source_weights: Optional[Dict[str, float]] = None,
+                 half_life_hours: float = 6.0,
+                 aging_per_hour: float = 2.0,
+                 default_deadline: Optional[float] = None,
+                 deadline_slack: float = 5.0):
+        self.source_weights = source_weights or {}
+        self.half_life_hours = half_life_hours
+        self.aging_per_second = aging_per_hour / 3600.0
+        self.default_deadline = default_deadline
+        self.deadline_slack = deadline_slack
+
+        self._heap = []
+        self._deadlines = []
+        self._sequence = 0
+        self._depth = 0
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=1024)
+        self._children = weakref.WeakSet()
+
+        self.stats = {
+            'enqueued': 0,
+            'dequeued': 0,
+            'deadline_promotions': 0,
+            'deadline_misses': 0,
+            'max_depth': 0,
+            'total_wait_seconds': 0.0
+        }
+
+    @classmethod
+    def from_env(cls) -> Optional['PriorityScheduler']:
+        """
+        Build from SUMMARIZE_PRIORITY_* settings; None when scheduling is disabled.
+        SUMMARIZE_SOURCE_WEIGHTS is a comma list like "fox-news=1.2,breitbart=0.9".
+        """
+        if os.getenv('SUMMARIZE_PRIORITY_ENABLED', 'true').lower() not in ('1', 'true', 'yes'):
+            return None
+
+        weights = {}
+        for pair in os.getenv('SUMMARIZE_SOURCE_WEIGHTS', '').split(','):
+            name, _, weight = pair.partition('=')
+            if name.strip() and weight.strip():
+                try:
+                    weights[name.strip()] = float(weight)
+                except ValueError:
+                    logger.warning(f"Ignoring invalid source weight: {pair}")
+
+        deadline = float(os.getenv('SUMMARIZE_PRIORITY_DEADLINE_SECONDS', 0))
+        return cls(
+            source_weights=weights,
+            half_life_hours=float(os.getenv('SUMMARIZE_PRIORITY_HALF_LIFE_HOURS', 6.0)),
+            aging_per_hour=float(os.getenv('SUMMARIZE_PRIORITY_AGING_PER_HOUR', 2.0)),
+            default_deadline=deadline or None
+        )
+
+    def spawn(self) -> 'PriorityScheduler':
+        """
+        Empty scheduler with these settings for a single batch or stream, so
+        concurrent callers never pop each other's entries. Its counters add
+        to this scheduler's stats, and its entries to this one's depth for
+        as long as it is alive.
+        """
+        child = PriorityScheduler(
+            source_weights=self.source_weights,
+            half_life_hours=self.half_life_hours,
+            aging_per_hour=self.aging_per_second * 3600.0,
+            default_deadline=self.default_deadline,
+            deadline_slack=self.deadline_slack
+        )
+        child.stats = self.stats
+        child._waits = self._waits
+        child._lock = self._lock
+        with self._lock:
+            self._children.add(child)
+        return child
+
+    def score(self, article: Dict[str, Any], now: Optional[float] = None) -> float:
+        """
+        Base priority: publish recency (exponential half-life) dominates,
+        then views and trending score, all scaled by the source weight
+        """
+        now = now if now is not None else time.time()
+
+        published = parse_timestamp(article.get('published_at'))
+        if published is None:
+            recency = 0.25
+        else:
+            recency = 0.5 ** (max(0.0, now - published) / 3600.0 / self.half_life_hours)
+
+        engagement = min(1.0, math.log1p(_number(article.get('views_count'))) / math.log1p(10000))
+        trending = min(10.0, _number(article.get('trending_score'))) / 10.0
+        weight = self.source_weights.get(article.get('source') or article.get('source_name'), 1.0)
+
+        return weight * (0.6 * recency + 0.2 * engagement + 0.2 * trending)
+
+    def push(self, article: Dict[str, Any], payload: Any = None, deadline: Optional[float] = None):
+        """
+        Queue an article (or payload, scored by its article).
+        deadline is seconds from now; defaults to default_deadline.
+        """
+        priority = self.score(article)
+        deadline = deadline if deadline is not None else self.default_deadline
+        now = time.monotonic()
+
+        with self._lock:
+            self._sequence += 1
+            entry = [payload if payload is not None else article, now,
+                     now + deadline if deadline else None, False]
+            heapq.heappush(self._heap, (-(priority - self.aging_per_second * now), self._sequence, entry))
+            if entry[2] is not None:
+                heapq.heappush(self._deadlines, (entry[2], self._sequence, entry))
+
+            self._depth += 1
+            self.stats['enqueued'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], self._depth)
+
+    def push_many(self, articles: List[Dict[str, Any]]):
+        for article in articles:
+            self.push(article)
+
+    def pop(self) -> Any:
+        """
+        Highest effective priority item, or None when empty
+        """
+        with self._lock:
+            now = time.monotonic()
+            entry = None
+
+            while self._deadlines and self._deadlines[0][2][3]:
+                heapq.heappop(self._deadlines)
+            if self._deadlines and self._deadlines[0][0] - now <= self.deadline_slack:
+                entry = heapq.heappop(self._deadlines)[2]
+                self.stats['deadline_promotions'] += 1
+
+            while entry is None and self._heap:
+                candidate = heapq.heappop(self._heap)[2]
+                if not candidate[3]:
+                    entry = candidate
+
+            if entry is None:
+                return None
+
+            entry[3] = True
+            wait = now - entry[1]
+            self._depth -= 1
+            self._waits.append(wait)
+            self.stats['dequeued'] += 1
+            self.stats['total_wait_seconds'] += wait
+            if entry[2] is not None and now > entry[2]:
+                self.stats['deadline_misses'] += 1
+
+            return entry[0]
+
+    def pop_batch(self, limit: int) -> List[Any]:
+        batch = []
+        while len(batch) < limit:
+            item = self.pop()
+            if item is None:
+                break
+            batch.append(item)
+        return batch
+
+    def __len__(self) -> int:
+        return self._depth
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self.stats.copy()
+            stats['depth'] = self._depth + sum(child._depth for child in self._children)
+            waits = sorted(self._waits)
+
+        stats['total_wait_seconds'] = round(stats['total_wait_seconds'], 3)
+        if waits:
+            stats['wait_p50_ms'] = round(waits[len(waits) // 2] * 1000, 1)
+            stats['wait_p95_ms'] = round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1)
+            stats['wait_max_ms'] = round(waits[-1] * 1000, 1)
+        return stats
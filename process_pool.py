@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Process Pool Execution
+Runs CPU-bound summarization (local model, extractive scoring, text
+cleaning) in worker processes so it isn't serialized by the GIL
+"""
+
+import os
+import logging
+import multiprocessing
+import concurrent.futures
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Set once per worker process by _init_worker
+_WORKER_SUMMARIZER = None
+
+
+def _init_worker(num_threads: int, pin_counter, pin_cpus: bool):
+    """
+    Runs once in each worker: cap native thread pools, optionally pin the
+    worker to its own cores, and load the summarizer and model up front
+    """
+    global _WORKER_SUMMARIZER
+
+    # Must be set before torch/numpy are imported in this process
+    for variable in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'SUMMARIZE_LOCAL_THREADS'):
+        os.environ[variable] = str(num_threads)
+
+    if pin_cpus and hasattr(os, 'sched_setaffinity'):
+        with pin_counter.get_lock():
+            index = pin_counter.value
+            pin_counter.value += 1
+
+        cpus = sorted(os.sched_getaffinity(0))
+        start = (index * num_threads) % len(cpus)
+        os.sched_setaffinity(0, set(cpus[start:start + num_threads]) or {cpus[0]})
+
+    from summarize import get_summarizer
+    from summarization_backends import BackendError
+
+    _WORKER_SUMMARIZER = get_summarizer()
+    try:
+        _WORKER_SUMMARIZER.backend.warm_up()
+    except BackendError as e:
+        # Requests will fall back to extractive summaries
+        logger.error(f"Worker {os.getpid()} could not load the model: {str(e)}")
+
+
+def _run_batch(mode: str, ids: List[Any], titles: List[str], contents: List[str],
+               generation: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+    """
+    Summarize one batch inside a worker. Articles arrive as three parallel
+    lists rather than a dict per article, which keeps the pickled payload small.
+    """
+    summarizer = _WORKER_SUMMARIZER
+    articles = [{'id': article_id, 'title': title, 'content': content}
+                for article_id, title, content in zip(ids, titles, contents)]
+
+    if mode == 'extractive':
+        return [summarizer.summarize_extractive(article) for article in articles]
+    if summarizer.batched_inference:
+        return summarizer.summarize_batch(articles, generation)
+    return [summarizer.summarize_article(article, generation) for article in articles]
+
+
+def _pack(batch: List[Dict[str, Any]]) -> Tuple[List[Any], List[str], List[str]]:
+    return (
+        [article.get('id') for article in batch],
+        [article.get('title', '') for article in batch],
+        [article.get('content', '') or article.get('description', '') or article.get('summary', '') or ''
+         for article in batch]
+    )
+
+
+class ProcessPoolRunner:
+    """
+    Fixed pool of summarization worker processes.
+
+    Each worker loads the summarizer (and local model) once in its
+    initializer and runs with threads_per_worker native threads, so
+    workers x threads matches the core count instead of oversubscribing it.
+    Work is sent in batches and results are yielded as batches finish, with
+    at most two batches per worker in flight.
+    """
+
+    def __init__(self, workers: Optional[int] = None, threads_per_worker: Optional[int] = None,
+                 batch_size: int = 16, pin_cpus: bool = False, start_method: str = 'spawn'):
+        cpus = os.cpu_count() or 1
+        self.workers = workers or cpus
+        self.threads_per_worker = threads_per_worker or max(1, cpus // self.workers)
+        self.batch_size = batch_size
+
+        # spawn by default: forking a parent that already started torch threads can deadlock
+        context = multiprocessing.get_context(start_method)
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker, context.Value('i', 0), pin_cpus)
+        )
+
+        self.stats = {
+            'batches': 0,
+            'articles': 0,
+            'failed_batches': 0
+        }
+
+    @classmethod
+    def from_env(cls) -> 'ProcessPoolRunner':
+        workers = int(os.getenv('SUMMARIZE_PROCESS_WORKERS', 0))
+        threads = int(os.getenv('SUMMARIZE_PROCESS_THREADS', 0))
+        return cls(
+            workers=workers or None,
+            threads_per_worker=threads or None,
+            batch_size=int(os.getenv('SUMMARIZE_PROCESS_BATCH_SIZE', 16)),
+            pin_cpus=os.getenv('SUMMARIZE_PROCESS_PIN_CPUS', 'false').lower() in ('1', 'true', 'yes'),
+            start_method=os.getenv('SUMMARIZE_PROCESS_START_METHOD', 'spawn')
+        )
+
+    def imap(self, articles: Iterable[Dict[str, Any]], mode: str = 'summarize',
+             generation: Optional[Dict[str, int]] = None) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Yield (article, result) pairs as their batches finish.
+        mode 'summarize' uses the configured backend, 'extractive' skips inference;
+        generation overrides the summary length and beams as in summarize_article.
+        """
+        pending = {}
+        max_in_flight = self.workers * 2
+        batch = []
+
+        for article in articles:
+            batch.append(article)
+            if len(batch) < self.batch_size:
+                continue
+
+            pending[self._executor.submit(_run_batch, mode, *_pack(batch), generation)] = batch
+            batch = []
+            if len(pending) >= max_in_flight:
+                yield from self._drain(pending)
+
+        if batch:
+            pending[self._executor.submit(_run_batch, mode, *_pack(batch), generation)] = batch
+
+        while pending:
+            yield from self._drain(pending)
+
+    def _drain(self, pending: Dict[Any, List[Dict[str, Any]]]) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        done, _ = concurrent.futures.wait(list(pending), return_when=concurrent.futures.FIRST_COMPLETED)
+
+        for future in done:
+            batch = pending.pop(future)
+            try:
+                results = future.result()
+            except Exception as e:
+                # A worker died (e.g. OOM while loading the model); report the batch as failed
+                logger.error(f"Process pool batch of {len(batch)} failed: {str(e)}")
+                self.stats['failed_batches'] += 1
+                results = [{'success': False, 'error': str(e), 'original_title': article.get('title', '')}
+                           for article in batch]
+
+            self.stats['batches'] += 1
+            self.stats['articles'] += len(batch)
+            yield from zip(batch, results)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.copy()
+        stats['workers'] = self.workers
+        stats['threads_per_worker'] = self.threads_per_worker
+        return stats
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
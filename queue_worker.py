@@ -0,0 +1,755 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Summarization Queue Worker
+Long-running worker that drains summarization_queue through BatchSummarizer
+
+Usage:
+    SUMMARIZE_QUEUE_DSN=postgresql://... python queue_worker.py
+    SUMMARIZE_QUEUE_SQLITE_PATH=/tmp/queue.sqlite3 python queue_worker.py --once
+    SUMMARIZE_METRICS=true SUMMARIZE_METRICS_PORT=9108 python queue_worker.py
+"""
+
+import os
+import time
+import uuid
+import signal
+import socket
+import sqlite3
+import logging
+import argparse
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+
+from priority_scheduler import PriorityScheduler, parse_timestamp
+from summary_writeback import SummaryWriter, result_to_row
+from sharding import ShardCoordinator, ring_position
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class QueueStore:
+    """
+    Storage for summarization_queue claims and write-back.
+
+    claim_batch() atomically leases up to `limit` runnable rows (pending, or
+    processing with an expired lease) and bumps their attempt counters;
+    concurrent workers never receive the same row while its lease is live.
+    With `ranges` (see sharding.HashRing.ranges) only rows whose article's
+    ring position falls in them are claimed; `from_tail` reverses the
+    claim order, for workers stealing from another worker's ranges.
+
+    Sharded workers also register in summarization_workers: heartbeat()
+    records a worker's backlog, and live_workers() lists the workers
+    that heartbeated within the TTL.
+    """
+
+    def claim_batch(self, worker_id: str, limit: int, lease_seconds: int,
+                    ranges: Optional[List[Tuple[int, int]]] = None,
+                    from_tail: bool = False) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def count_claimable(self, ranges: Optional[List[Tuple[int, int]]] = None) -> int:
+        """
+        Rows claim_batch() could return for these ranges right now
+        """
+        raise NotImplementedError
+
+    def heartbeat(self, worker_id: str, backlog: int):
+        raise NotImplementedError
+
+    def live_workers(self, ttl_seconds: float) -> Dict[str, int]:
+        """
+        {worker_id: backlog} of workers that heartbeated within ttl_seconds
+        """
+        raise NotImplementedError
+
+    def leave(self, worker_id: str):
+        raise NotImplementedError
+
+    def write_results(self, updates: List[Dict[str, Any]]):
+        """
+        Apply a batch of {queue_id, article_id, status, summary, summary_card,
+        summary_headline, content_fingerprint, error_message} updates
+        """
+        raise NotImplementedError
+
+    def upsert_results(self, rows: List[Dict[str, Any]]):
+        """
+        Idempotent bulk writeback of {article_id, summary, summary_card,
+        summary_headline, content_fingerprint, status, error_message,
+        processed_at, claimed_by} rows (see summary_writeback.SummaryWriter).
+        All summary sizes are written together, and articles only change
+        when one of them or the fingerprint differs. Queue rows are inserted for articles
+        summarized outside the queue; existing ones are updated only when
+        processed_at is newer and the lease is still held by claimed_by.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def _fail_missing(self, claims: Dict[Any, Dict[str, Any]], articles: List[Any]):
+        """
+        Close out claims whose article row no longer exists
+        """
+        found = {article['id'] for article in articles}
+        missing = [claim for article_id, claim in claims.items() if article_id not in found]
+        if missing:
+            self.write_results([
+                {'queue_id': claim['id'], 'article_id': claim['article_id'], 'summary': None,
+                 'status': 'failed', 'error_message': 'Article not found'}
+                for claim in missing
+            ])
+
+
+class SQLiteQueueStore(QueueStore):
+    """
+    Local stand-in for the Supabase tables (articles + summarization_queue)
+    """
+
+    def __init__(self, db_path: str):
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        # Rows inserted by other writers have no stored ring position
+        self._conn.create_function('ring_position', 1, ring_position, deterministic=True)
+        self.create_schema()
+
+        # Claim order follows the same priority score the in-process scheduler uses
+        self.scheduler = PriorityScheduler.from_env()
+        if self.scheduler is not None:
+            self._conn.create_function('summary_priority', 4, self._claim_priority)
+
+    def _claim_priority(self, published_at, views_count, trending_score, created_at) -> float:
+        now = time.time()
+        waited = now - (parse_timestamp(created_at) or now)
+        score = self.scheduler.score({'published_at': published_at, 'views_count': views_count,
+                                      'trending_score': trending_score}, now)
+        return score + self.scheduler.aging_per_second * waited
+
+    def create_schema(self):
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS articles (
+                id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                content TEXT,
+                excerpt TEXT,
+                summary TEXT,
+                summary_card TEXT,
+                summary_headline TEXT,
+                content_fingerprint TEXT,
+                views_count INTEGER DEFAULT 0,
+                trending_score INTEGER,
+                published_at TEXT,
+                updated_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS summarization_queue (
+                id TEXT PRIMARY KEY,
+                article_id TEXT UNIQUE REFERENCES articles(id) ON DELETE CASCADE,
+                status TEXT DEFAULT 'pending',
+                model_name TEXT DEFAULT 'sshleifer/distilbart-cnn-12-6',
+                attempts INTEGER DEFAULT 0,
+                max_attempts INTEGER DEFAULT 3,
+                error_message TEXT,
+                claimed_by TEXT,
+                lease_expires_at REAL,
+                processed_at TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                ring_position INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_summarization_queue_status
+                ON summarization_queue(status, created_at);
+            CREATE TABLE IF NOT EXISTS summarization_workers (
+                worker_id TEXT PRIMARY KEY,
+                backlog INTEGER DEFAULT 0,
+                heartbeat_at REAL,
+                started_at REAL
+            );
+        ''')
+
+        # Databases created by earlier versions of this store
+        columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(articles)')}
+        for column, column_type in (('content_fingerprint', 'TEXT'), ('views_count', 'INTEGER DEFAULT 0'),
+                                    ('trending_score', 'INTEGER'), ('summary_card', 'TEXT'),
+                                    ('summary_headline', 'TEXT')):
+            if column not in columns:
+                self._conn.execute(f'ALTER TABLE articles ADD COLUMN {column} {column_type}')
+
+        columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(summarization_queue)')}
+        if 'ring_position' not in columns:
+            self._conn.execute('ALTER TABLE summarization_queue ADD COLUMN ring_position INTEGER')
+            self._conn.execute('UPDATE summarization_queue SET ring_position = ring_position(article_id)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_summarization_queue_ring ON summarization_queue(ring_position)')
+
+    def enqueue(self, article_ids: List[str]):
+        """
+        Queue articles for summarization (mirrors addToSummarizationQueue)
+        """
+        self._conn.executemany(
+            'INSERT OR IGNORE INTO summarization_queue (id, article_id, ring_position) VALUES (?, ?, ?)',
+            [(uuid.uuid4().hex, article_id, ring_position(article_id)) for article_id in article_ids]
+        )
+
+    @staticmethod
+    def _ranges_filter(ranges: Optional[List[Tuple[int, int]]]) -> Tuple[str, List[int]]:
+        if ranges is None:
+            return '', []
+        if not ranges:
+            return 'AND 0', []
+        values = ','.join('(?, ?)' for _ in ranges)
+        return (f'AND EXISTS (SELECT 1 FROM (VALUES {values}) r '
+                f'WHERE COALESCE(q.ring_position, ring_position(q.article_id)) >= r.column1 '
+                f'AND COALESCE(q.ring_position, ring_position(q.article_id)) < r.column2)',
+                [bound for interval in ranges for bound in interval])
+
+    def claim_batch(self, worker_id: str, limit: int, lease_seconds: int,
+                    ranges: Optional[List[Tuple[int, int]]] = None,
+                    from_tail: bool = False) -> List[Dict[str, Any]]:
+        now = time.time()
+        order = 'q.created_at DESC' if from_tail else 'q.created_at'
+        if self.scheduler is not None:
+            order = (f"summary_priority(a.published_at, a.views_count, a.trending_score, q.created_at) "
+                     f"{'ASC' if from_tail else 'DESC'}")
+        shard_filter, shard_params = self._ranges_filter(ranges)
+
+        # BEGIN IMMEDIATE takes the write lock up front, which gives the
+        # same exclusion SKIP LOCKED gives on Postgres
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = self._conn.execute(f'''
+                UPDATE summarization_queue
+                SET status = 'processing', claimed_by = ?, lease_expires_at = ?, attempts = attempts + 1
+                WHERE id IN (
+                    SELECT q.id FROM summarization_queue q
+                    LEFT JOIN articles a ON a.id = q.article_id
+                    WHERE (q.status = 'pending' OR (q.status = 'processing' AND q.lease_expires_at < ?))
+                      AND q.attempts < q.max_attempts
+                      {shard_filter}
+                    ORDER BY {order}
+                    LIMIT ?
+                )
+                RETURNING id, article_id, attempts, max_attempts
+            ''', (worker_id, now + lease_seconds, now, *shard_params, limit)).fetchall()
+            self._conn.execute('COMMIT')
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+
+        if not rows:
+            return []
+
+        claims = {row['article_id']: dict(row) for row in rows}
+        placeholders = ','.join('?' * len(claims))
+        articles = self._conn.execute(
+            f'SELECT id, title, content, excerpt, summary, content_fingerprint, views_count, trending_score, published_at FROM articles WHERE id IN ({placeholders})',
+            list(claims)
+        ).fetchall()
+
+        self._fail_missing(claims, articles)
+        return [_claimed_item(claims[article['id']], dict(article)) for article in articles]
+
+    def count_claimable(self, ranges: Optional[List[Tuple[int, int]]] = None) -> int:
+        shard_filter, shard_params = self._ranges_filter(ranges)
+        return self._conn.execute(f'''
+            SELECT COUNT(*) FROM summarization_queue q
+            WHERE (q.status = 'pending' OR (q.status = 'processing' AND q.lease_expires_at < ?))
+              AND q.attempts < q.max_attempts
+              {shard_filter}
+        ''', (time.time(), *shard_params)).fetchone()[0]
+
+    def heartbeat(self, worker_id: str, backlog: int):
+        now = time.time()
+        self._conn.execute('''
+            INSERT INTO summarization_workers (worker_id, backlog, heartbeat_at, started_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(worker_id) DO UPDATE SET backlog = excluded.backlog, heartbeat_at = excluded.heartbeat_at
+        ''', (worker_id, backlog, now, now))
+
+    def live_workers(self, ttl_seconds: float) -> Dict[str, int]:
+        rows = self._conn.execute('SELECT worker_id, backlog FROM summarization_workers WHERE heartbeat_at > ?',
+                                  (time.time() - ttl_seconds,)).fetchall()
+        return {row['worker_id']: row['backlog'] for row in rows}
+
+    def leave(self, worker_id: str):
+        self._conn.execute('DELETE FROM summarization_workers WHERE worker_id = ?', (worker_id,))
+
+    def write_results(self, updates: List[Dict[str, Any]]):
+        if not updates:
+            return
+
+        processed_at = datetime.now().isoformat()
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._conn.executemany(
+                'UPDATE articles SET summary = ?, summary_card = ?, summary_headline = ?, content_fingerprint = ?, '
+                'updated_at = ? WHERE id = ?',
+                [(u['summary'], u.get('summary_card'), u.get('summary_headline'), u.get('content_fingerprint'),
+                  processed_at, u['article_id'])
+                 for u in updates if u.get('summary')]
+            )
+            self._conn.executemany(
+                'UPDATE summarization_queue SET status = ?, error_message = ?, processed_at = ?, '
+                'claimed_by = NULL, lease_expires_at = NULL WHERE id = ?',
+                [(u['status'], u.get('error_message'), processed_at, u['queue_id']) for u in updates]
+            )
+            self._conn.execute('COMMIT')
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    def upsert_results(self, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._conn.executemany(
+                'UPDATE articles SET summary = ?, summary_card = ?, summary_headline = ?, content_fingerprint = ?, '
+                'updated_at = ? WHERE id = ? AND (summary IS NOT ? OR summary_card IS NOT ? '
+                'OR summary_headline IS NOT ? OR content_fingerprint IS NOT ?)',
+                [(r['summary'], r.get('summary_card'), r.get('summary_headline'), r.get('content_fingerprint'),
+                  r['processed_at'], r['article_id'],
+                  r['summary'], r.get('summary_card'), r.get('summary_headline'), r.get('content_fingerprint'))
+                 for r in rows if r.get('summary')]
+            )
+            self._conn.executemany('''
+                INSERT INTO summarization_queue (id, article_id, status, attempts, error_message, processed_at,
+                                                 claimed_by, ring_position)
+                SELECT ?, ?, ?, 1, ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM articles WHERE id = ?)
+                ON CONFLICT(article_id) DO UPDATE SET
+                    status = excluded.status,
+                    error_message = excluded.error_message,
+                    processed_at = excluded.processed_at,
+                    attempts = CASE WHEN summarization_queue.claimed_by IS NULL
+                                    THEN summarization_queue.attempts + 1 ELSE summarization_queue.attempts END,
+                    claimed_by = NULL,
+                    lease_expires_at = NULL
+                WHERE summarization_queue.claimed_by IS excluded.claimed_by
+                  AND (summarization_queue.processed_at IS NULL OR summarization_queue.processed_at < excluded.processed_at)
+            ''', [(uuid.uuid4().hex, r['article_id'], r['status'], r.get('error_message'), r['processed_at'],
+                   r.get('claimed_by'), ring_position(r['article_id']), r['article_id']) for r in rows])
+            self._conn.execute('COMMIT')
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    def close(self):
+        self._conn.close()
+
+
+class PostgresQueueStore(QueueStore):
+    """
+    Supabase/Postgres store; claims rows with FOR UPDATE SKIP LOCKED
+    """
+
+    def __init__(self, dsn: str):
+        try:
+            import psycopg2
+            import psycopg2.extras
+        except ImportError as e:
+            raise RuntimeError(f"Postgres queue store requires psycopg2: {str(e)}")
+
+        self._extras = psycopg2.extras
+        self._conn = psycopg2.connect(dsn)
+        self.scheduler = PriorityScheduler.from_env()
+
+    def _claim_order(self, from_tail: bool = False):
+        """
+        ORDER BY clause and parameters; the expression mirrors
+        PriorityScheduler.score plus aging on time spent in the queue
+        """
+        if self.scheduler is None:
+            return ('q.created_at DESC' if from_tail else 'q.created_at'), ()
+
+        return '''(
+            COALESCE(0.6 * power(0.5, GREATEST(0, EXTRACT(EPOCH FROM NOW() - a.published_at)) / 3600.0 / %s), 0.15)
+            + 0.2 * LEAST(1.0, ln(1 + GREATEST(0, COALESCE(a.views_count, 0))) / ln(10001))
+            + 0.02 * LEAST(10, GREATEST(0, COALESCE(a.trending_score, 0)))
+            + %s * EXTRACT(EPOCH FROM NOW() - q.created_at)
+        ) ''' + ('ASC' if from_tail else 'DESC'), (self.scheduler.half_life_hours, self.scheduler.aging_per_second)
+
+    @staticmethod
+    def _ranges_filter(ranges: Optional[List[Tuple[int, int]]]) -> Tuple[str, tuple]:
+        """
+        Restrict q to ring ranges through the generated ring_position column
+        """
+        if ranges is None:
+            return '', ()
+        return ('''AND EXISTS (SELECT 1 FROM unnest(%s::bigint[], %s::bigint[]) AS r(lo, hi)
+                               WHERE q.ring_position >= r.lo AND q.ring_position < r.hi)''',
+                ([start for start, _ in ranges], [end for _, end in ranges]))
+
+    def claim_batch(self, worker_id: str, limit: int, lease_seconds: int,
+                    ranges: Optional[List[Tuple[int, int]]] = None,
+                    from_tail: bool = False) -> List[Dict[str, Any]]:
+        order, order_params = self._claim_order(from_tail)
+        shard_filter, shard_params = self._ranges_filter(ranges)
+
+        with self._conn, self._conn.cursor(cursor_factory=self._extras.RealDictCursor) as cur:
+            cur.execute(f'''
+                WITH claimable AS (
+                    SELECT q.id FROM summarization_queue q
+                    LEFT JOIN articles a ON a.id = q.article_id
+                    WHERE (q.status = 'pending' OR (q.status = 'processing' AND q.lease_expires_at < NOW()))
+                      AND q.attempts < q.max_attempts
+                      {shard_filter}
+                    ORDER BY {order}
+                    LIMIT %s
+                    FOR UPDATE OF q SKIP LOCKED
+                )
+                UPDATE summarization_queue q
+                SET status = 'processing', claimed_by = %s,
+                    lease_expires_at = NOW() + make_interval(secs => %s), attempts = q.attempts + 1
+                FROM claimable
+                WHERE q.id = claimable.id
+                RETURNING q.id, q.article_id, q.attempts, q.max_attempts
+            ''', (*shard_params, *order_params, limit, worker_id, lease_seconds))
+            claims = {row['article_id']: dict(row) for row in cur.fetchall()}
+
+            if not claims:
+                return []
+
+            cur.execute(
+                'SELECT id, title, content, excerpt, summary, content_fingerprint, views_count, trending_score, published_at FROM articles WHERE id = ANY(%s::uuid[])',
+                ([str(article_id) for article_id in claims],)
+            )
+            articles = cur.fetchall()
+
+        self._fail_missing(claims, articles)
+        return [_claimed_item(claims[article['id']], dict(article)) for article in articles]
+
+    def count_claimable(self, ranges: Optional[List[Tuple[int, int]]] = None) -> int:
+        shard_filter, shard_params = self._ranges_filter(ranges)
+        with self._conn, self._conn.cursor() as cur:
+            cur.execute(f'''
+                SELECT COUNT(*) FROM summarization_queue q
+                WHERE (q.status = 'pending' OR (q.status = 'processing' AND q.lease_expires_at < NOW()))
+                  AND q.attempts < q.max_attempts
+                  {shard_filter}
+            ''', shard_params)
+            return cur.fetchone()[0]
+
+    def heartbeat(self, worker_id: str, backlog: int):
+        with self._conn, self._conn.cursor() as cur:
+            cur.execute('''
+                INSERT INTO summarization_workers (worker_id, backlog) VALUES (%s, %s)
+                ON CONFLICT (worker_id) DO UPDATE SET backlog = EXCLUDED.backlog, heartbeat_at = NOW()
+            ''', (worker_id, backlog))
+
+    def live_workers(self, ttl_seconds: float) -> Dict[str, int]:
+        with self._conn, self._conn.cursor() as cur:
+            cur.execute('SELECT worker_id, backlog FROM summarization_workers '
+                        'WHERE heartbeat_at > NOW() - make_interval(secs => %s)', (ttl_seconds,))
+            return dict(cur.fetchall())
+
+    def leave(self, worker_id: str):
+        with self._conn, self._conn.cursor() as cur:
+            cur.execute('DELETE FROM summarization_workers WHERE worker_id = %s', (worker_id,))
+
+    def write_results(self, updates: List[Dict[str, Any]]):
+        if not updates:
+            return
+
+        summaries = [(str(u['article_id']), u['summary'], u.get('summary_card'), u.get('summary_headline'),
+                      u.get('content_fingerprint'))
+                     for u in updates if u.get('summary')]
+
+        with self._conn, self._conn.cursor() as cur:
+            if summaries:
+                self._extras.execute_values(cur, '''
+                    UPDATE articles a SET summary = v.summary, summary_card = v.summary_card,
+                        summary_headline = v.summary_headline, content_fingerprint = v.content_fingerprint,
+                        updated_at = NOW()
+                    FROM (VALUES %s) AS v(id, summary, summary_card, summary_headline, content_fingerprint)
+                    WHERE a.id = v.id::uuid
+                ''', summaries)
+
+            self._extras.execute_values(cur, '''
+                UPDATE summarization_queue q
+                SET status = v.status, error_message = v.error_message, processed_at = NOW(),
+                    claimed_by = NULL, lease_expires_at = NULL
+                FROM (VALUES %s) AS v(id, status, error_message)
+                WHERE q.id = v.id::uuid
+            ''', [(str(u['queue_id']), u['status'], u.get('error_message')) for u in updates])
+
+    def upsert_results(self, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+
+        summaries = [(str(r['article_id']), r['summary'], r.get('summary_card'), r.get('summary_headline'),
+                      r.get('content_fingerprint'))
+                     for r in rows if r.get('summary')]
+
+        # One multi-row statement per table; page_size keeps execute_values from splitting it
+        with self._conn, self._conn.cursor() as cur:
+            if summaries:
+                self._extras.execute_values(cur, '''
+                    UPDATE articles a SET summary = v.summary, summary_card = v.summary_card,
+                        summary_headline = v.summary_headline, content_fingerprint = v.content_fingerprint,
+                        updated_at = NOW()
+                    FROM (VALUES %s) AS v(id, summary, summary_card, summary_headline, content_fingerprint)
+                    WHERE a.id = v.id::uuid
+                      AND (a.summary IS DISTINCT FROM v.summary OR a.summary_card IS DISTINCT FROM v.summary_card
+                           OR a.summary_headline IS DISTINCT FROM v.summary_headline
+                           OR a.content_fingerprint IS DISTINCT FROM v.content_fingerprint)
+                ''', summaries, page_size=len(summaries))
+
+            self._extras.execute_values(cur, '''
+                INSERT INTO summarization_queue AS q (article_id, status, attempts, error_message, processed_at, claimed_by)
+                SELECT v.article_id::uuid, v.status, 1, v.error_message, v.processed_at::timestamptz, v.claimed_by
+                FROM (VALUES %s) AS v(article_id, status, error_message, processed_at, claimed_by)
+                JOIN articles a ON a.id = v.article_id::uuid
+                ON CONFLICT (article_id) DO UPDATE SET
+                    status = EXCLUDED.status,
+                    error_message = EXCLUDED.error_message,
+                    processed_at = EXCLUDED.processed_at,
+                    attempts = CASE WHEN q.claimed_by IS NULL THEN q.attempts + 1 ELSE q.attempts END,
+                    claimed_by = NULL,
+                    lease_expires_at = NULL
+                WHERE q.claimed_by IS NOT DISTINCT FROM EXCLUDED.claimed_by
+                  AND (q.processed_at IS NULL OR q.processed_at < EXCLUDED.processed_at)
+            ''', [(str(r['article_id']), r['status'], r.get('error_message'), r['processed_at'], r.get('claimed_by'))
+                  for r in rows], page_size=len(rows))
+
+    def close(self):
+        self._conn.close()
+
+
+def _claimed_item(claim: Dict[str, Any], article: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Shape a claimed row as a BatchSummarizer article plus its queue bookkeeping
+    """
+    article['description'] = article.pop('excerpt', None)
+    if article.get('published_at') is not None and not isinstance(article['published_at'], str):
+        article['published_at'] = article['published_at'].isoformat()
+
+    article['_queue'] = claim
+    return article
+
+
+def store_from_env() -> Optional[QueueStore]:
+    """
+    Queue store from SUMMARIZE_QUEUE_DSN (Postgres) or SUMMARIZE_QUEUE_SQLITE_PATH
+    """
+    dsn = os.getenv('SUMMARIZE_QUEUE_DSN')
+    if dsn:
+        return PostgresQueueStore(dsn)
+
+    sqlite_path = os.getenv('SUMMARIZE_QUEUE_SQLITE_PATH')
+    if sqlite_path:
+        return SQLiteQueueStore(sqlite_path)
+
+    return None
+
+
+class QueueWorker:
+    """
+    Claims queue rows in bulk under a lease, summarizes them through one
+    warm BatchSummarizer, and writes summaries and statuses back through
+    a SummaryWriter in batched upserts. Only one batch is summarized at a
+    time, which is the backpressure: nothing is claimed until the previous
+    batch is handed to the writer, which flushes by size or age and
+    whenever the queue runs dry.
+
+    With SUMMARIZE_SHARDING on, several workers split the queue by
+    consistent hashing on article_id (see sharding.ShardCoordinator), so
+    re-queued articles keep landing on the worker whose content cache and
+    dedup index already hold them; a worker whose own ranges are empty
+    steals from the most backlogged one.
+    """
+
+    def __init__(self, store: QueueStore, batch_processor=None,
+                 batch_size: Optional[int] = None,
+                 lease_seconds: Optional[int] = None,
+                 poll_interval: Optional[float] = None,
+                 writer: Optional[SummaryWriter] = None):
+        if batch_processor is None:
+            from batch_summarize import BatchSummarizer
+            batch_processor = BatchSummarizer()
+
+        self.store = store
+        self.batch_processor = batch_processor
+        # Results are written behind, in multi-row upserts across batches
+        self.writer = writer or SummaryWriter.from_env(store)
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.batch_size = batch_size or int(os.getenv('SUMMARIZE_QUEUE_BATCH_SIZE', 50))
+        self.lease_seconds = lease_seconds or int(os.getenv('SUMMARIZE_QUEUE_LEASE_SECONDS', 300))
+        self.poll_interval = poll_interval or float(os.getenv('SUMMARIZE_QUEUE_POLL_SECONDS', 5))
+        self.max_idle_interval = self.poll_interval * 12
+        self._stopping = False
+
+        self.shards = ShardCoordinator.from_env(store, self.worker_id, self.batch_size)
+        if self.shards is not None:
+            # An idle worker still has to heartbeat to keep its ranges
+            self.max_idle_interval = min(self.max_idle_interval, self.shards.heartbeat_interval)
+
+        self.stats = {
+            'batches': 0,
+            'claimed': 0,
+            'stolen': 0,
+            'completed': 0,
+            'requeued': 0,
+            'failed': 0,
+            'unchanged': 0
+        }
+
+    def run_once(self) -> int:
+        """
+        Claim, summarize and write back one batch; returns the number of rows claimed
+        """
+        items = self._claim()
+        if not items:
+            return 0
+
+        # Re-queued articles whose body hasn't meaningfully changed keep their summary
+        unchanged = [item for item in items if item.get('content_fingerprint') and item.get('summary')
+                     and self.batch_processor.is_unchanged(item)]
+        unchanged_ids = {item['id'] for item in unchanged}
+        pending = [item for item in items if item['id'] not in unchanged_ids]
+
+        results = self.batch_processor.process_batch(pending) if pending else []
+        updates = self._build_updates(pending, results)
+        processed_at = datetime.now().isoformat()
+        updates.extend({'queue_id': item['_queue']['id'], 'article_id': item['id'], 'summary': None,
+                        'status': 'completed', 'error_message': None, 'claimed_by': self.worker_id,
+                        'processed_at': processed_at} for item in unchanged)
+        self.writer.add_many(updates)
+        self.stats['unchanged'] += len(unchanged)
+
+        self.stats['batches'] += 1
+        self.stats['claimed'] += len(items)
+        logger.info(f"Queue batch done: {len(items)} claimed, totals {self.stats}")
+        return len(items)
+
+    def _claim(self) -> List[Dict[str, Any]]:
+        """
+        Claim from this worker's own ranges, or steal when they are empty
+        """
+        if self.shards is None:
+            return self.store.claim_batch(self.worker_id, self.batch_size, self.lease_seconds)
+
+        self.shards.refresh()
+        items = self.store.claim_batch(self.worker_id, self.batch_size, self.lease_seconds,
+                                       ranges=self.shards.ranges)
+        if items:
+            return items
+
+        target = self.shards.steal_target()
+        if target is None:
+            return []
+
+        victim, ranges = target
+        items = self.store.claim_batch(self.worker_id, self.batch_size, self.lease_seconds,
+                                       ranges=ranges, from_tail=True)
+        self.shards.record_steal(victim, len(items))
+        self.stats['stolen'] += len(items)
+        if items:
+            logger.info(f"Stole {len(items)} rows from {victim}")
+        return items
+
+    def _build_updates(self, items: List[Dict[str, Any]], results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results_by_id = {r.get('article_id'): r for r in results}
+        updates = []
+
+        for item in items:
+            claim = item['_queue']
+            result = results_by_id.get(item['id'], {'success': False, 'error': 'No result returned'})
+            retries_left = claim['attempts'] < claim['max_attempts']
+
+            update = result_to_row(result, self.worker_id, retries_left)
+            update['queue_id'] = claim['id']
+            update['article_id'] = item['id']
+            updates.append(update)
+
+            if update['status'] == 'completed':
+                self.stats['completed'] += 1
+            elif update['status'] == 'pending':
+                self.stats['requeued'] += 1
+            else:
+                self.stats['failed'] += 1
+
+        return updates
+
+    def run_forever(self):
+        """
+        Drain the queue until stopped, backing off while it is empty
+        """
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+        logger.info(f"Queue worker {self.worker_id} started (batch size {self.batch_size})")
+        if self.shards is not None:
+            self.shards.refresh(force=True)
+
+        idle_interval = self.poll_interval
+        while not self._stopping:
+            try:
+                claimed = self.run_once()
+            except Exception as e:
+                logger.error(f"Queue worker error: {str(e)}")
+                claimed = 0
+
+            if claimed:
+                idle_interval = self.poll_interval
+                continue
+
+            # Nothing to claim: don't leave results sitting in the buffer
+            self.flush()
+            time.sleep(idle_interval)
+            idle_interval = min(self.max_idle_interval, idle_interval * 2)
+
+        self.flush()
+        if self.shards is not None:
+            self.shards.leave()
+            logger.info(f"Shard stats: {self.shards.get_stats()}")
+        self.store.close()
+        if hasattr(self.batch_processor, 'close'):
+            self.batch_processor.close()
+        logger.info(f"Queue worker {self.worker_id} stopped: {self.stats}")
+
+    def flush(self):
+        """
+        Write buffered results now; on failure they stay buffered and their
+        leases expire, so the rows are claimed again
+        """
+        try:
+            self.writer.flush()
+        except Exception as e:
+            logger.error(f"Queue worker writeback failed: {str(e)}")
+
+    def stop(self):
+        self._stopping = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Drain summarization_queue')
+    parser.add_argument('--once', action='store_true', help='Process a single batch and exit')
+    args = parser.parse_args()
+
+    store = store_from_env()
+    if store is None:
+        parser.error('Set SUMMARIZE_QUEUE_DSN or SUMMARIZE_QUEUE_SQLITE_PATH')
+
+    # Prometheus scrape target and optional sampling profiler for the long-running worker
+    import metrics
+    metrics_port = int(os.getenv('SUMMARIZE_METRICS_PORT', 0))
+    if metrics_port:
+        metrics.start_http_server(metrics_port)
+    metrics.start_profiler_from_env()
+
+    worker = QueueWorker(store)
+    if args.once:
+        worker.run_once()
+        worker.flush()
+        store.close()
+    else:
+        try:
+            worker.run_forever()
+        except KeyboardInterrupt:
+            worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Rate Limiting
+Adaptive (AIMD) token-bucket limiter and circuit breaker shared by all workers
+"""
+
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, Any, Tuple
+import metrics
+import deadlines
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header (delta-seconds or HTTP date)
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    from email.utils import parsedate_to_datetime
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose refill rate adapts with AIMD: every success adds a
+    little rate back, every 429/503 halves it, and a Retry-After header
+    pauses all callers until it expires.
+    """
+
+    def __init__(self, rate: float = 5.0, min_rate: float = 0.2, max_rate: float = 20.0,
+                 burst: Optional[float] = None, additive_increase: float = 0.5,
+                 decrease_factor: float = 0.5):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.additive_increase = additive_increase
+        self.decrease_factor = decrease_factor
+
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'acquired': 0,
+            'throttled': 0,
+            'deadline_refusals': 0,
+            'total_wait_seconds': 0.0
+        }
+
+    def _reserve(self) -> float:
+        """
+        Take a token and return how long the caller must wait before using it.
+        Raises DeadlineExceeded, without taking the token, if the wait would
+        outlast the current deadline.
+        """
+        left = deadlines.remaining()
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            wait = max(wait, self._blocked_until - now)
+
+            if left is not None and wait >= left:
+                self._tokens += 1
+                self.stats['deadline_refusals'] += 1
+                metrics.count_deadline_exceeded()
+                raise deadlines.DeadlineExceeded(f"Deadline exceeded waiting {wait:.2f}s for the rate limiter")
+
+            self.stats['acquired'] += 1
+            self.stats['total_wait_seconds'] += wait
+            return wait
+
+    def acquire(self):
+        """
+        Block the calling thread until a request may be sent
+        """
+        wait = self._reserve()
+        if wait > 0:
+            metrics.count_backoff('rate_limit', wait)
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """
+        Wait without blocking the event loop
+        """
+        import asyncio
+        wait = self._reserve()
+        if wait > 0:
+            metrics.count_backoff('rate_limit', wait)
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        """
+        Additive increase, scaled so the rate grows by about one step per second of traffic
+        """
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.additive_increase / max(self.rate, 1.0))
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """
+        Multiplicative decrease; honour Retry-After for every caller
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self.stats['throttled'] += 1
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+        logger.warning(f"Inference endpoint throttled; rate reduced to {self.rate:.2f} req/s"
+                       + (f", pausing {retry_after:.1f}s" if retry_after else ""))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self.stats.copy()
+            stats['current_rate'] = round(self.rate, 3)
+        return stats
+
+
+class CircuitBreaker:
+    """
+    Stops sending traffic to an endpoint after repeated failures.
+
+    closed -> open after failure_threshold consecutive failures;
+    open -> half_open after recovery_timeout, letting one probe through;
+    half_open -> closed on success, or back to open on failure.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_token = 0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'opened': 0,
+            'rejected': 0
+        }
+
+    def allow_request(self) -> bool:
+        return self.admit()[0]
+
+    def admit(self) -> Tuple[bool, Optional[int]]:
+        """
+        (allowed, probe_token). probe_token is set only for the request let
+        through as the half-open probe; only that request may release it.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True, None
+
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._probe_token += 1
+                return True, self._probe_token
+
+            self.stats['rejected'] += 1
+            return False, None
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Circuit breaker closed; remote inference recovered")
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self, token: int):
+        """
+        Hand back a half-open probe that ended without a verdict (e.g. cut off
+        by a deadline), so the next request can probe instead. A stale token,
+        from a probe that already got its verdict, changes nothing.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN and self._probe_in_flight and token == self._probe_token:
+                self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.stats['opened'] += 1
+                    logger.warning(f"Circuit breaker opened after {self._failures} failures; "
+                                   f"routing to fallback for {self.recovery_timeout:.0f}s")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self.stats.copy()
+            stats['state'] = self.state
+            stats['consecutive_failures'] = self._failures
+        return stats
+
+
+# One limiter/breaker pair per endpoint, shared by every thread and task in the process
+_SHARED_CONTROLS = {}
+_SHARED_CONTROLS_LOCK = threading.Lock()
+
+
+def shared_rate_controls(endpoint: str) -> Tuple[Optional[AdaptiveRateLimiter], Optional[CircuitBreaker]]:
+    """
+    Process-wide limiter and breaker for an endpoint, configured from the environment.
+    SUMMARIZE_RATE_LIMIT=0 disables the limiter, SUMMARIZE_BREAKER_FAILURES=0 the breaker.
+    """
+    with _SHARED_CONTROLS_LOCK:
+        if endpoint not in _SHARED_CONTROLS:
+            rate = float(os.getenv('SUMMARIZE_RATE_LIMIT', 5.0))
+            failures = int(os.getenv('SUMMARIZE_BREAKER_FAILURES', 5))
+
+            limiter = None
+            if rate > 0:
+                limiter = AdaptiveRateLimiter(
+                    rate=rate,
+                    min_rate=float(os.getenv('SUMMARIZE_RATE_LIMIT_MIN', 0.2)),
+                    max_rate=float(os.getenv('SUMMARIZE_RATE_LIMIT_MAX', max(rate, 20.0)))
+                )
+
+            breaker = None
+            if failures > 0:
+                breaker = CircuitBreaker(
+                    failure_threshold=failures,
+                    recovery_timeout=float(os.getenv('SUMMARIZE_BREAKER_RECOVERY_SECONDS', 30))
+                )
+
+            _SHARED_CONTROLS[endpoint] = (limiter, breaker)
+
+        return _SHARED_CONTROLS[endpoint]
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Sharded Summarization Workers
+Consistent hashing of articles onto queue workers, membership and
+rebalancing through the queue store, and work stealing for hot shards
+
+Usage:
+    SUMMARIZE_QUEUE_SQLITE_PATH=/tmp/queue.sqlite3 python sharding.py --workers 4
+    SUMMARIZE_QUEUE_DSN=postgresql://... SUMMARIZE_SHARDING=true python queue_worker.py
+"""
+
+import os
+import sys
+import time
+import bisect
+import signal
+import hashlib
+import logging
+import argparse
+import subprocess
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+import metrics
+
+logger = logging.getLogger(__name__)
+
+RING_SIZE = 2 ** 32
+
+# Half-open [start, end) intervals of ring positions
+Ranges = List[Tuple[int, int]]
+
+
+def ring_position(key: Any) -> int:
+    """
+    Position of a key on the ring: the first 32 bits of its MD5. The
+    Postgres schema computes the same value for summarization_queue rows
+    with ('x' || substr(md5(article_id::text), 1, 8))::bit(32)::bigint.
+    """
+    return int(hashlib.md5(str(key).encode('utf-8')).hexdigest()[:8], 16)
+
+
+class HashRing:
+    """
+    Consistent hash ring with virtual nodes.
+
+    Every node is placed at `vnodes` pseudo-random points and owns the
+    arc ending at each of them, so a node joining or leaving only moves
+    about 1/N of the keys, and those come from (or go to) every other
+    node evenly rather than from one neighbour.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 64):
+        self.vnodes = vnodes
+        self._nodes = set()
+        self._points = []  # sorted (position, node)
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        return sorted(self._nodes)
+
+    def add(self, node: str):
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for i in range(self.vnodes):
+            bisect.insort(self._points, (ring_position(f"{node}#{i}"), node))
+
+    def remove(self, node: str):
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        self._points = [point for point in self._points if point[1] != node]
+
+    def owner(self, key: Any) -> Optional[str]:
+        """
+        Node owning key: the first point at or after its position, wrapping around
+        """
+        if not self._points:
+            return None
+        index = bisect.bisect_left(self._points, (ring_position(key), ''))
+        return self._points[index % len(self._points)][1]
+
+    def ranges(self, node: str) -> Ranges:
+        """
+        Ring positions owned by node, merged into as few intervals as possible
+        """
+        owned = []
+        for i, (position, owner) in enumerate(self._points):
+            if owner != node:
+                continue
+            # The arc after the previous point, up to and including this one
+            start, end = self._points[i - 1][0] + 1, position + 1
+            if i == 0:
+                # The first point's arc wraps around the top of the ring
+                if start < RING_SIZE:
+                    owned.append((start, RING_SIZE))
+                start = 0
+            if start < end:
+                owned.append((start, end))
+
+        merged = []
+        for start, end in sorted(owned):
+            if merged and merged[-1][1] >= start:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+
+class ShardCoordinator:
+    """
+    One queue worker's view of the worker group.
+
+    There is no coordinator process: workers heartbeat into the queue
+    store (summarization_workers), along with the backlog in their own
+    ranges, and each builds the same hash ring from the live members.
+    A worker that stops heartbeating drops out after member_ttl, and a
+    new one is on everyone's ring within a heartbeat interval; its ranges
+    move with it. Views can disagree for up to a heartbeat while that
+    happens, which is safe because rows are still claimed under a lease:
+    two workers owning a range briefly just share it, and a range owned
+    by nobody is picked up by stealing or the next refresh.
+
+    Work stealing: a worker with nothing left in its own ranges claims
+    from the ranges of the most backlogged member, taking rows from the
+    tail of the claim order so it doesn't fight the owner for the rows
+    the owner is about to take.
+    """
+
+    def __init__(self, store, worker_id: str, vnodes: int = 64,
+                 heartbeat_interval: float = 5.0, member_ttl: float = 20.0,
+                 steal_threshold: int = 100):
+        self.store = store
+        self.worker_id = worker_id
+        self.vnodes = vnodes
+        self.heartbeat_interval = heartbeat_interval
+        self.member_ttl = max(member_ttl, heartbeat_interval * 2)
+        self.steal_threshold = steal_threshold
+
+        self.ring = HashRing([worker_id], vnodes)
+        self.backlogs = {}  # worker_id -> backlog reported in its last heartbeat
+        self._ranges = None
+        self._last_heartbeat = 0.0
+        self.stats = {
+            'heartbeats': 0,
+            'rebalances': 0,
+            'steals': 0,
+            'stolen': 0
+        }
+
+    @classmethod
+    def from_env(cls, store, worker_id: str, batch_size: int = 50) -> Optional['ShardCoordinator']:
+        """
+        Coordinator from SUMMARIZE_SHARD_* settings; None unless SUMMARIZE_SHARDING is on
+        """
+        if os.getenv('SUMMARIZE_SHARDING', 'false').lower() not in ('1', 'true', 'yes'):
+            return None
+
+        return cls(
+            store, worker_id,
+            vnodes=int(os.getenv('SUMMARIZE_SHARD_VNODES', 64)),
+            heartbeat_interval=float(os.getenv('SUMMARIZE_SHARD_HEARTBEAT_SECONDS', 5)),
+            member_ttl=float(os.getenv('SUMMARIZE_SHARD_MEMBER_TTL_SECONDS', 20)),
+            steal_threshold=int(os.getenv('SUMMARIZE_SHARD_STEAL_THRESHOLD', batch_size * 2))
+        )
+
+    @property
+    def ranges(self) -> Optional[Ranges]:
+        """
+        This worker's ranges, or None (the whole queue) while it is alone
+        """
+        return self._ranges
+
+    def refresh(self, force: bool = False):
+        """
+        Heartbeat and rebuild the ring if membership changed; a no-op until
+        the heartbeat interval has passed
+        """
+        now = time.monotonic()
+        if not force and now - self._last_heartbeat < self.heartbeat_interval:
+            return
+        self._last_heartbeat = now
+
+        backlog = self.store.count_claimable(self._ranges)
+        self.store.heartbeat(self.worker_id, backlog)
+        members = self.store.live_workers(self.member_ttl)
+        members[self.worker_id] = backlog
+        self.backlogs = members
+        self.stats['heartbeats'] += 1
+
+        current = set(self.ring.nodes)
+        if set(members) != current:
+            joined = sorted(set(members) - current)
+            left = sorted(current - set(members))
+            self.ring = HashRing(members, self.vnodes)
+            self.stats['rebalances'] += 1
+            metrics.count_rebalance()
+            logger.info(f"Shard ring rebalanced: {len(members)} workers"
+                        f"{f', joined {joined}' if joined else ''}{f', left {left}' if left else ''}")
+
+        self._ranges = self.ring.ranges(self.worker_id) if len(self.ring) > 1 else None
+
+    def steal_target(self) -> Optional[Tuple[str, Ranges]]:
+        """
+        (victim, its ranges) for the most backlogged other worker, if any
+        has at least steal_threshold claimable rows
+        """
+        candidates = [(backlog, worker_id) for worker_id, backlog in self.backlogs.items()
+                      if worker_id != self.worker_id and worker_id in self.ring.nodes]
+        if not candidates:
+            return None
+
+        backlog, victim = max(candidates)
+        if backlog < self.steal_threshold:
+            return None
+        return victim, self.ring.ranges(victim)
+
+    def record_steal(self, victim: str, count: int):
+        """
+        Count a steal and take it off the victim's last known backlog, so
+        idle workers don't all pile onto it before its next heartbeat
+        """
+        if not count:
+            return
+        self.backlogs[victim] = max(0, self.backlogs.get(victim, 0) - count)
+        self.stats['steals'] += 1
+        self.stats['stolen'] += count
+        metrics.count_stolen(count)
+
+    def owns(self, article_id: Any) -> bool:
+        return self.ring.owner(article_id) == self.worker_id
+
+    def leave(self):
+        """
+        Deregister, so the others take over this worker's ranges on their
+        next heartbeat instead of after member_ttl
+        """
+        try:
+            self.store.leave(self.worker_id)
+        except Exception as e:
+            logger.warning(f"Could not deregister worker {self.worker_id}: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.copy()
+        stats['workers'] = len(self.ring)
+        stats['backlog'] = self.backlogs.get(self.worker_id, 0)
+        if self._ranges is not None:
+            stats['ring_share'] = round(sum(end - start for start, end in self._ranges) / RING_SIZE, 4)
+        return stats
+
+
+def launch_local_workers(count: int, env: Optional[Dict[str, str]] = None,
+                         worker_args: Iterable[str] = (), **popen_kwargs) -> List[subprocess.Popen]:
+    """
+    Start `count` sharded queue workers as local processes sharing one
+    queue store (SQLite stands in for the shared Postgres queue); extra
+    keyword arguments go to subprocess.Popen
+    """
+    worker_env = dict(os.environ, **(env or {}))
+    worker_env['SUMMARIZE_SHARDING'] = 'true'
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'queue_worker.py')
+
+    return [subprocess.Popen([sys.executable, script, *worker_args], env=worker_env, **popen_kwargs)
+            for _ in range(count)]
+
+
+def stop_local_workers(processes: List[subprocess.Popen], timeout: float = 30.0):
+    """
+    SIGTERM the workers (they flush, deregister and exit) and wait for them
+    """
+    for process in processes:
+        if process.poll() is None:
+            process.send_signal(signal.SIGTERM)
+
+    deadline = time.monotonic() + timeout
+    for process in processes:
+        try:
+            process.wait(timeout=max(0.1, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run sharded queue workers as local processes')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('SUMMARIZE_SHARD_WORKERS', 2)))
+    args = parser.parse_args()
+
+    if not os.getenv('SUMMARIZE_QUEUE_DSN') and not os.getenv('SUMMARIZE_QUEUE_SQLITE_PATH'):
+        parser.error('Set SUMMARIZE_QUEUE_DSN or SUMMARIZE_QUEUE_SQLITE_PATH')
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    processes = launch_local_workers(args.workers)
+    logger.info(f"Started {len(processes)} sharded workers: {[p.pid for p in processes]}")
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_local_workers(processes))
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        stop_local_workers(processes)
+
+
+if __name__ == "__main__":
+    main()
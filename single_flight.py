@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Single-Flight Coalescing
+Concurrent requests for the same summarization input share one in-flight
+inference call across threads and asyncio tasks
+"""
+
+import os
+import logging
+import threading
+import concurrent.futures
+from typing import Dict, Any, Callable, Optional, Tuple
+import metrics
+import deadlines
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Per-key coalescing of in-flight calls.
+
+    The first caller for a key becomes its leader and runs the call; callers
+    arriving while it runs wait on the leader's future and get the same
+    outcome, a result or the same exception, so a failure is answered
+    with every caller's usual fallback rather than retried by each of
+    them. The key is forgotten as soon as the leader finishes: this
+    coalesces concurrent work only, and completed results are the
+    cache's job.
+
+    Futures are concurrent.futures.Future, so followers can wait from any
+    thread or, through asyncio.wrap_future, from any event loop.
+    """
+
+    def __init__(self):
+        self._flights = {}  # key -> Future
+        self._lock = threading.Lock()
+        self.stats = {
+            'leaders': 0,
+            'coalesced': 0
+        }
+
+    @classmethod
+    def from_env(cls) -> Optional['SingleFlight']:
+        if os.getenv('SUMMARIZE_SINGLE_FLIGHT', 'true').lower() not in ('1', 'true', 'yes'):
+            return None
+        return cls()
+
+    def claim(self, key: str) -> Tuple[concurrent.futures.Future, bool]:
+        """
+        (future, is_leader). A leader must call resolve() exactly once for
+        its key, whatever happens, or its followers wait until their deadline.
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            if future is not None:
+                self.stats['coalesced'] += 1
+                leader = False
+            else:
+                future = concurrent.futures.Future()
+                self._flights[key] = future
+                self.stats['leaders'] += 1
+                leader = True
+
+        if not leader:
+            metrics.count_coalesced()
+        return future, leader
+
+    def resolve(self, key: str, future: concurrent.futures.Future,
+                result: Any = None, error: Optional[BaseException] = None):
+        """
+        Publish the leader's outcome to its followers and retire the key
+        """
+        with self._lock:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+
+        # Nothing left to publish if the future was already cancelled
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    @staticmethod
+    def wait(future: concurrent.futures.Future) -> Any:
+        """
+        Follower side: the leader's result, or its exception raised here.
+        Waiting is bounded by the current deadline.
+        """
+        try:
+            return future.result(timeout=deadlines.remaining())
+        except concurrent.futures.TimeoutError:
+            raise deadlines.DeadlineExceeded("Deadline exceeded waiting for a coalesced request") from None
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        fn() for the leader; everyone else concurrently asking for key shares its outcome
+        """
+        future, leader = self.claim(key)
+        if not leader:
+            return self.wait(future)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self.resolve(key, future, error=e)
+            raise
+        self.resolve(key, future, result)
+        return result
+
+    async def do_async(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Async do(): fn returns a coroutine. Followers can be threads or tasks
+        on any event loop; a cancelled leader passes the cancellation on.
+        """
+        import asyncio
+
+        future, leader = self.claim(key)
+        if not leader:
+            left = deadlines.remaining()
+            try:
+                # Shielded: a follower timing out or being cancelled must not cancel the shared future
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout=left)
+            except asyncio.TimeoutError:
+                raise deadlines.DeadlineExceeded("Deadline exceeded waiting for a coalesced request") from None
+
+        try:
+            result = await fn()
+        except BaseException as e:
+            self.resolve(key, future, error=e)
+            raise
+        self.resolve(key, future, result)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self.stats.copy()
+            stats['in_flight'] = len(self._flights)
+        return stats
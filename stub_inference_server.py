@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Stub Inference Server
+Local stand-in for the Hugging Face Inference API, for benchmarks and offline runs
+
+Usage:
+    python stub_inference_server.py --port 8765 --latency-ms 200 --error-rate 0.02 --throttle-rate 0.05
+    SUMMARIZE_API_URL=http://127.0.0.1:8765/ python batch_summarize.py
+"""
+
+import json
+import time
+import random
+import argparse
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+
+def stub_summary(text: str, max_words: int = 40) -> str:
+    """
+    Deterministic "summary": the leading words of the input
+    """
+    return ' '.join(text.split()[:max_words])
+
+
+class StubInferenceHandler(BaseHTTPRequestHandler):
+    """
+    Answers inference requests in the Inference API response format
+    """
+
+    # HTTP/1.1 so clients can keep connections alive; without TCP_NODELAY
+    # the split header/body writes stall on delayed ACKs
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        inputs = payload.get('inputs', '')
+
+        roll = server.rng.random()
+        server.count('requests')
+
+        if roll < server.throttle_rate:
+            server.count('throttled')
+            self._send(429, {'error': 'Rate limit reached'}, {'Retry-After': str(server.retry_after)})
+            return
+
+        latency = server.latency + server.rng.uniform(0, server.latency_jitter)
+        if server.rng.random() < server.straggler_rate:
+            # Heavy tail: GC pauses, cold replicas, noisy neighbours
+            server.count('stragglers')
+            latency += server.straggler_latency
+        # Reading the input costs time per word (0 keeps latency flat)
+        texts = inputs if isinstance(inputs, list) else [inputs]
+        latency += server.latency_per_kword * sum(len(str(text).split()) for text in texts) / 1000.0
+        # Beam search cost grows with the beam width; 4 is the summarizer default
+        parameters = payload.get('parameters', {})
+        latency *= parameters.get('num_beams', 4) / 4.0
+        if isinstance(inputs, list):
+            latency *= max(1, len(inputs)) ** 0.5  # batched inputs amortize, but not for free
+        time.sleep(latency)
+
+        if roll < server.throttle_rate + server.error_rate:
+            server.count('errors')
+            self._send(503, {'error': 'Model is currently loading', 'estimated_time': 20.0})
+            return
+
+        # Shorter max_length, shorter summary (about 40 words at the summarizer's default 150)
+        max_words = max(1, parameters['max_length'] // 4) if 'max_length' in parameters else 40
+        if isinstance(inputs, list):
+            body = [{'summary_text': stub_summary(text, max_words)} for text in inputs]
+        else:
+            body = [{'summary_text': stub_summary(inputs, max_words)}]
+
+        self._send(200, body)
+
+    def _send(self, status: int, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up: its deadline passed or a hedged copy won
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        # Per-request access logs would dominate benchmark output
+        pass
+
+
+class StubInferenceServer(ThreadingHTTPServer):
+    """
+    latency + uniform(0, latency_jitter) seconds per request, plus
+    latency_per_kword for every 1000 input words and straggler_latency
+    for straggler_rate of requests; error_rate of
+    requests answer 503 and throttle_rate answer 429 with Retry-After
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.0, latency_jitter: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: float = 1.0, straggler_rate: float = 0.0,
+                 straggler_latency: float = 0.0, latency_per_kword: float = 0.0, seed: int = 0):
+        super().__init__(address, StubInferenceHandler)
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.straggler_rate = straggler_rate
+        self.straggler_latency = straggler_latency
+        self.latency_per_kword = latency_per_kword
+        self.rng = random.Random(seed)
+
+        self.counters = {'requests': 0, 'errors': 0, 'throttled': 0, 'stragglers': 0}
+        self._counter_lock = threading.Lock()
+
+    def count(self, name: str):
+        with self._counter_lock:
+            self.counters[name] += 1
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start_background(self) -> threading.Thread:
+        """
+        Serve from a daemon thread (for in-process benchmarks)
+        """
+        thread = threading.Thread(target=self.serve_forever, name='stub-inference', daemon=True)
+        thread.start()
+        return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stub Hugging Face inference server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=200.0, help='Simulated inference latency')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Extra uniform random latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of 503 responses')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of 429 responses')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds on 429')
+    parser.add_argument('--straggler-rate', type=float, default=0.0, help='Fraction of very slow responses')
+    parser.add_argument('--straggler-ms', type=float, default=0.0, help='Extra latency of a straggler')
+    parser.add_argument('--ms-per-kword', type=float, default=0.0, help='Extra latency per 1000 input words')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = StubInferenceServer(
+        (args.host, args.port),
+        latency=args.latency_ms / 1000.0,
+        latency_jitter=args.jitter_ms / 1000.0,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        straggler_rate=args.straggler_rate,
+        straggler_latency=args.straggler_ms / 1000.0,
+        latency_per_kword=args.ms_per_kword / 1000.0,
+        seed=args.seed
+    )
+    # Flushed so a parent process can read the bound port
+    print(f"Stub inference server listening on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Summarization Backends
+Pluggable inference engines behind AtlanticAnvilSummarizer
+"""
+
+import os
+import logging
+import time
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+import metrics
+import deadlines
+from deadlines import HedgePolicy
+from rate_limiting import parse_retry_after, shared_rate_controls
+
+logger = logging.getLogger(__name__)
+
+
+class BackendError(Exception):
+    """
+    Inference failed in a way the caller should answer with a fallback
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class SummarizationBackend:
+    """
+    Base class for summarization engines.
+    Subclasses turn prepared article text into raw summary text.
+    """
+
+    name = 'base'
+
+    # Remote backends share an adaptive limiter and circuit breaker per endpoint
+    rate_limiter = None
+    circuit_breaker = None
+    
+    # Optional second attempt for requests slower than the observed tail (see deadlines)
+    hedging = None
+
+    # Beam width unless a caller asks for less (see summary_tiering)
+    num_beams = 4
+
+    def __init__(self, model_name: str, max_input_tokens: int = 1024):
+        self.model_name = model_name
+        self.max_input_tokens = max_input_tokens
+
+    def estimate_tokens(self, text: str, word_count: Optional[int] = None) -> int:
+        """
+        Cheap input length estimate (BPE averages ~1.3 tokens per word),
+        capped at the model's truncation limit
+        """
+        if word_count is None:
+            word_count = len(text.split())
+        return min(self.max_input_tokens, int(word_count * 1.3) + 2)
+
+    def generate(self, text: str, max_length: int, min_length: int, num_beams: Optional[int] = None) -> str:
+        raise NotImplementedError
+
+    def warm_up(self):
+        """
+        Load whatever the first request would otherwise pay for
+        """
+        pass
+
+    def generate_batch(self, texts: List[str], max_length: int, min_length: int,
+                       num_beams: Optional[int] = None) -> List[str]:
+        """
+        Summarize several inputs; backends that can batch natively override this
+        """
+        return [self.generate(text, max_length, min_length, num_beams) for text in texts]
+
+    def generate_lengths(self, texts: List[str], lengths: List[Tuple[int, int]],
+                         num_beams: Optional[int] = None) -> List[List[str]]:
+        """
+        Summaries of each text at several (max_length, min_length) settings,
+        as one list per text in the order of lengths.
+
+        Only the first (longest) length reads the article; each other length
+        condenses those summaries in one batched call whose inputs are only
+        summary-sized. Backends that can reuse encoder state override this.
+        """
+        first = self.generate_batch(texts, lengths[0][0], lengths[0][1], num_beams)
+        outputs = [[summary] for summary in first]
+        for max_length, min_length in lengths[1:]:
+            for output, summary in zip(outputs, self.generate_batch(first, max_length, min_length, num_beams)):
+                output.append(summary)
+        return outputs
+
+    async def generate_async(self, session, text: str, max_length: int, min_length: int,
+                             num_beams: Optional[int] = None) -> str:
+        """
+        Async generate; blocking backends run on the default executor
+        """
+        import asyncio
+        import contextvars
+        loop = asyncio.get_running_loop()
+        # Executor threads don't inherit context; carry the deadline over
+        return await loop.run_in_executor(None, contextvars.copy_context().run,
+                                          self.generate, text, max_length, min_length, num_beams)
+
+    async def generate_lengths_async(self, session, text: str, lengths: List[Tuple[int, int]],
+                                     num_beams: Optional[int] = None) -> List[str]:
+        """
+        Async generate_lengths for one text
+        """
+        first = await self.generate_async(session, text, lengths[0][0], lengths[0][1], num_beams)
+        outputs = [first]
+        for max_length, min_length in lengths[1:]:
+            outputs.append(await self.generate_async(session, first, max_length, min_length, num_beams))
+        return outputs
+
+
+class HuggingFaceAPIBackend(SummarizationBackend):
+    """
+    Remote inference through the Hugging Face Inference API
+    """
+
+    name = 'huggingface_api'
+
+    def __init__(self, model_name: str, hf_token: Optional[str] = None,
+                 api_url: Optional[str] = None, timeout: int = 30):
+        super().__init__(model_name)
+        self.api_url = api_url or f"https://api-inference.huggingface.co/models/{model_name}"
+        self.hf_token = hf_token
+        self.timeout = timeout
+        self.rate_limiter, self.circuit_breaker = shared_rate_controls(self.api_url)
+        self.hedging = HedgePolicy.from_env()
+
+    def build_payload(self, inputs: Any, max_length: int, min_length: int,
+                      num_beams: Optional[int] = None) -> Dict[str, Any]:
+        return {
+            'inputs': inputs,
+            'parameters': {
+                'max_length': max_length,
+                'min_length': min_length,
+                'do_sample': False,
+                'num_beams': num_beams or self.num_beams,
+                'temperature': 0.7,
+                'top_p': 0.9
+            }
+        }
+
+    def headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.hf_token:
+            headers['Authorization'] = f'Bearer {self.hf_token}'
+        return headers
+
+    def generate(self, text: str, max_length: int, min_length: int, num_beams: Optional[int] = None) -> str:
+        result = self._post(self.build_payload(text, max_length, min_length, num_beams))
+        if len(result) > 0:
+            return result[0].get('summary_text', '')
+
+        raise ValueError("Unexpected API response format")
+
+    def generate_batch(self, texts: List[str], max_length: int, min_length: int,
+                       num_beams: Optional[int] = None) -> List[str]:
+        """
+        One request for the whole batch; the inference pipeline accepts a list of inputs
+        """
+        if len(texts) == 1:
+            return [self.generate(texts[0], max_length, min_length, num_beams)]
+
+        result = self._post(self.build_payload(texts, max_length, min_length, num_beams))
+        if len(result) != len(texts):
+            raise ValueError(f"Unexpected API response format: {len(result)} results for {len(texts)} inputs")
+
+        # Depending on pipeline version each item is a dict or a one-element list
+        return [
+            (item[0] if isinstance(item, list) else item).get('summary_text', '')
+            for item in result
+        ]
+
+    async def generate_async(self, session, text: str, max_length: int, min_length: int,
+                             num_beams: Optional[int] = None) -> str:
+        """
+        Non-blocking request over a shared aiohttp session (see create_async_session)
+        """
+        payload = self.build_payload(text, max_length, min_length, num_beams)
+        if self.hedging is not None:
+            return await self.hedging.run_async(lambda: self._attempt_async(session, payload))
+        return await self._attempt_async(session, payload)
+
+    async def _attempt_async(self, session, payload: Dict[str, Any]) -> str:
+        deadlines.check()
+        probe = self._check_circuit()
+        try:
+            return await self._send_async(session, payload)
+        finally:
+            self._release_probe(probe)
+
+    async def _send_async(self, session, payload: Dict[str, Any]) -> str:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+
+        # The session timeout applies unless the deadline leaves less
+        options = {}
+        if deadlines.current() is not None:
+            import aiohttp
+            options['timeout'] = aiohttp.ClientTimeout(total=deadlines.timeout_for(self.timeout))
+
+        start = time.perf_counter()
+        try:
+            async with session.post(
+                self.api_url,
+                headers=self.headers(),
+                json=payload,
+                **options
+            ) as response:
+                metrics.observe_http(time.perf_counter() - start, response.status)
+                if response.status != 200:
+                    self._raise_for_status(response.status, await response.text(),
+                                           response.headers.get('Retry-After'))
+                result = await response.json(content_type=None)
+        except BackendError:
+            raise
+        except Exception as e:
+            metrics.observe_http(time.perf_counter() - start, 'error')
+            self._raise_if_deadline_passed(e)
+            self._record_failure()
+            raise
+
+        self._record_success(time.perf_counter() - start)
+        if isinstance(result, list) and len(result) > 0:
+            return result[0].get('summary_text', '')
+
+        raise ValueError("Unexpected API response format")
+
+    def _post(self, payload: Dict[str, Any]) -> List[Any]:
+        """
+        Rate-limited, breaker-guarded request, hedged if enabled; returns the decoded result list
+        """
+        if self.hedging is not None:
+            return self.hedging.run(lambda: self._attempt(payload))
+        return self._attempt(payload)
+
+    def _attempt(self, payload: Dict[str, Any]) -> List[Any]:
+        """
+        One HTTP attempt, with its timeout clamped to the current deadline
+        """
+        # Checked first, so a request already out of time never claims the half-open probe
+        deadlines.check()
+        probe = self._check_circuit()
+        try:
+            return self._send(payload)
+        finally:
+            self._release_probe(probe)
+
+    def _send(self, payload: Dict[str, Any]) -> List[Any]:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        timeout = deadlines.timeout_for(self.timeout)
+
+        session = http_session()
+        start = time.perf_counter()
+        try:
+            response = session.post(
+                self.api_url,
+                headers=self.headers(),
+                json=payload,
+                timeout=timeout
+            )
+        except Exception as e:
+            metrics.observe_http(time.perf_counter() - start, 'error')
+            self._raise_if_deadline_passed(e)
+            self._record_failure()
+            raise
+
+        if metrics.ENABLED:
+            metrics.observe_http(time.perf_counter() - start, response.status_code,
+                                 len(response.request.body or b''), len(response.content))
+
+        if response.status_code != 200:
+            self._raise_for_status(response.status_code, response.text, response.headers.get('Retry-After'))
+
+        self._record_success(time.perf_counter() - start)
+        result = response.json()
+        if not isinstance(result, list):
+            raise ValueError("Unexpected API response format")
+
+        return result
+
+    def _raise_if_deadline_passed(self, error: Exception):
+        """
+        A timeout cut short by the deadline says nothing about the endpoint's health
+        """
+        deadline = deadlines.current()
+        if deadline is not None and deadline.expired():
+            metrics.count_deadline_exceeded()
+            raise deadlines.DeadlineExceeded(f"Deadline exceeded during inference: {str(error)}") from error
+
+    def _check_circuit(self) -> Optional[int]:
+        """
+        Raise if the breaker rejects the request; returns its probe token if it is the half-open probe
+        """
+        if self.circuit_breaker is None:
+            return None
+        allowed, probe = self.circuit_breaker.admit()
+        if not allowed:
+            metrics.count_circuit_rejection()
+            raise BackendError("HuggingFace API circuit open; skipping remote inference")
+        return probe
+
+    def _record_success(self, latency: Optional[float] = None):
+        if latency is not None and self.hedging is not None:
+            self.hedging.observe(latency)
+        if self.rate_limiter is not None:
+            self.rate_limiter.on_success()
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_success()
+
+    def _record_failure(self):
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_failure()
+
+    def _release_probe(self, probe: Optional[int]):
+        # Only the probe itself hands it back; a no-op once it recorded a success or failure
+        if probe is not None and self.circuit_breaker is not None:
+            self.circuit_breaker.release_probe(probe)
+
+    def _raise_for_status(self, status_code: int, text: str, retry_after_header: Optional[str]):
+        """
+        Feed throttling back into the shared limiter and server errors into the breaker
+        """
+        retry_after = parse_retry_after(retry_after_header)
+
+        if status_code in (429, 503):
+            metrics.count_throttle()
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_throttle(retry_after)
+
+        # Throttling and client errors mean the endpoint is up; only 5xx count as down
+        if status_code >= 500:
+            self._record_failure()
+        elif self.circuit_breaker is not None:
+            self.circuit_breaker.record_success()
+
+        raise BackendError(
+            f"HuggingFace API error: {status_code} - {text}",
+            status_code=status_code,
+            retry_after=retry_after
+        )
+
+
+# One pooled requests.Session per process, shared by every HTTP backend
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+
+def http_session():
+    """
+    Process-wide requests.Session with a keep-alive pool, so warm instances
+    reuse TCP/TLS connections instead of opening one per request.
+    requests is imported on first use to keep it off the cold-start path.
+    """
+    global _HTTP_SESSION
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=int(os.getenv('SUMMARIZE_HTTP_POOL_SIZE', 16)))
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _HTTP_SESSION = session
+
+        return _HTTP_SESSION
+
+
+# Loaded models are shared by every LocalModelBackend in the process
+_LOCAL_MODELS = {}
+_LOCAL_MODELS_LOCK = threading.Lock()
+
+
+class LocalModelBackend(SummarizationBackend):
+    """
+    In-process CPU inference with transformers + torch.
+
+    The model is loaded once per process (optionally with dynamic int8
+    quantization of its Linear layers) and reused by every instance.
+    Pointing SUMMARIZE_LOCAL_MODEL_PATH at a downloaded model directory
+    makes it work fully offline.
+    """
+
+    name = 'local'
+
+    def __init__(self, model_name: str, model_path: Optional[str] = None,
+                 quantize: bool = True, num_threads: Optional[int] = None,
+                 max_input_tokens: int = 1024):
+        super().__init__(model_name, max_input_tokens=max_input_tokens)
+        self.model_path = model_path or model_name
+        self.quantize = quantize
+        self.num_threads = num_threads
+
+    def _load(self):
+        key = (self.model_path, self.quantize)
+
+        with _LOCAL_MODELS_LOCK:
+            if key in _LOCAL_MODELS:
+                return _LOCAL_MODELS[key]
+
+            # Heavy imports are deferred so the HTTP backend never pays for them
+            try:
+                import torch
+                from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+            except ImportError as e:
+                raise BackendError(f"Local backend requires torch and transformers: {str(e)}")
+
+            if self.num_threads:
+                torch.set_num_threads(self.num_threads)
+
+            local_only = os.path.isdir(self.model_path)
+            logger.info(f"Loading local summarization model from {self.model_path}")
+
+            tokenizer = AutoTokenizer.from_pretrained(self.model_path, local_files_only=local_only)
+            model = AutoModelForSeq2SeqLM.from_pretrained(self.model_path, local_files_only=local_only)
+            model.eval()
+
+            if self.quantize:
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+            _LOCAL_MODELS[key] = (torch, tokenizer, model)
+            return _LOCAL_MODELS[key]
+
+    def warm_up(self):
+        self._load()
+
+    def generate(self, text: str, max_length: int, min_length: int, num_beams: Optional[int] = None) -> str:
+        return self.generate_batch([text], max_length, min_length, num_beams)[0]
+
+    def generate_batch(self, texts: List[str], max_length: int, min_length: int,
+                       num_beams: Optional[int] = None) -> List[str]:
+        """
+        One padded forward pass over the whole batch
+        """
+        # A forward pass can't be interrupted, so only check the deadline before starting
+        deadlines.check()
+        torch, tokenizer, model = self._load()
+
+        inputs = tokenizer(texts, padding=True, truncation=True,
+                           max_length=self.max_input_tokens, return_tensors='pt')
+        with torch.inference_mode():
+            output_ids = model.generate(
+                **inputs,
+                max_length=max_length,
+                min_length=min_length,
+                num_beams=num_beams or self.num_beams,
+                do_sample=False,
+                early_stopping=True
+            )
+
+        return tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+
+    def generate_lengths(self, texts: List[str], lengths: List[Tuple[int, int]],
+                         num_beams: Optional[int] = None) -> List[List[str]]:
+        """
+        Encode the batch once and decode it at every length from the same
+        encoder states; only the (much cheaper per token) decoder runs again
+        """
+        deadlines.check()
+        torch, tokenizer, model = self._load()
+        from transformers.modeling_outputs import BaseModelOutput
+
+        inputs = tokenizer(texts, padding=True, truncation=True,
+                           max_length=self.max_input_tokens, return_tensors='pt')
+        outputs = [[] for _ in texts]
+        with torch.inference_mode():
+            hidden_states = model.get_encoder()(**inputs).last_hidden_state
+            for max_length, min_length in lengths:
+                # generate() expands encoder outputs for beam search, so each call gets its own wrapper
+                output_ids = model.generate(
+                    encoder_outputs=BaseModelOutput(last_hidden_state=hidden_states),
+                    attention_mask=inputs['attention_mask'],
+                    max_length=max_length,
+                    min_length=min_length,
+                    num_beams=num_beams or self.num_beams,
+                    do_sample=False,
+                    early_stopping=True
+                )
+                for output, summary in zip(outputs, tokenizer.batch_decode(output_ids, skip_special_tokens=True)):
+                    output.append(summary)
+
+        return outputs
+
+    async def generate_lengths_async(self, session, text: str, lengths: List[Tuple[int, int]],
+                                     num_beams: Optional[int] = None) -> List[str]:
+        import asyncio
+        import contextvars
+        loop = asyncio.get_running_loop()
+        outputs = await loop.run_in_executor(None, contextvars.copy_context().run,
+                                             self.generate_lengths, [text], lengths, num_beams)
+        return outputs[0]
+
+
+def create_async_session(max_connections: int, timeout: int = 30):
+    """
+    Shared keep-alive connection pool for async inference requests.
+    aiohttp is only needed when the async pipeline is used.
+    """
+    try:
+        import aiohttp
+    except ImportError as e:
+        raise RuntimeError(f"Async summarization requires aiohttp: {str(e)}")
+
+    connector = aiohttp.TCPConnector(limit=max_connections, keepalive_timeout=60)
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout))
+
+
+def get_backend(model_name: str, hf_token: Optional[str] = None) -> SummarizationBackend:
+    """
+    Select the summarization backend from SUMMARIZE_BACKEND
+    ('huggingface_api' by default, or 'local')
+    """
+    backend_name = os.getenv('SUMMARIZE_BACKEND', HuggingFaceAPIBackend.name).lower()
+
+    if backend_name == LocalModelBackend.name:
+        num_threads = os.getenv('SUMMARIZE_LOCAL_THREADS')
+        return LocalModelBackend(
+            model_name,
+            model_path=os.getenv('SUMMARIZE_LOCAL_MODEL_PATH') or None,
+            quantize=os.getenv('SUMMARIZE_LOCAL_QUANTIZE', 'true').lower() not in ('0', 'false', 'no'),
+            num_threads=int(num_threads) if num_threads else None
+        )
+
+    if backend_name != HuggingFaceAPIBackend.name:
+        logger.warning(f"Unknown SUMMARIZE_BACKEND '{backend_name}', using {HuggingFaceAPIBackend.name}")
+
+    # SUMMARIZE_API_URL points the HTTP backend at a self-hosted or stub endpoint
+    return HuggingFaceAPIBackend(model_name, hf_token=hf_token, api_url=os.getenv('SUMMARIZE_API_URL') or None)
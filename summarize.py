@@ -7,12 +7,23 @@ Uses sshleifer/distilbart-cnn-12-6 for conservative news summarization
 import os
 import json
 import logging
+import threading
 import traceback
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
-import requests
 from urllib.parse import urlparse
-import re
+import contextvars
+import metrics
+from summary_cache import SummaryCache
+from summarization_backends import BackendError, get_backend
+from deadlines import DeadlineExceeded
+from single_flight import SingleFlight
+from batched_inference import DynamicBatcher, plan_batches
+from extractive_summarizer import ExtractiveSummarizer
+from summary_lengths import SummaryLengths
+from content_fingerprint import content_fingerprint
+from keyword_scoring import CONTEXT_CATEGORY, KeywordMatch, KeywordScorer
+from text_processing import CONTEXT_PREFIX, chunk_text, normalize_text, strip_context_prefix
 
 # Configure logging
 logging.basicConfig(
@@ -34,145 +45,504 @@ class AtlanticAnvilSummarizer:
         self.max_length = int(os.getenv('VITE_SUMMARY_MAX_LENGTH', 150))
         self.min_length = int(os.getenv('VITE_SUMMARY_MIN_LENGTH', 50))
         
-        # Conservative news context keywords for better summarization
-        self.conservative_keywords = [
-            'conservative', 'republican', 'trump', 'gop', 'patriot', 'america first',
-            'constitution', 'freedom', 'liberty', 'traditional values', 'border security',
-            'second amendment', 'pro-life', 'fiscal responsibility', 'small government'
-        ]
+        # Conservative context keywords and topic lexicon, matched in one pass
+        # (SUMMARIZE_KEYWORDS_PATH points at a hot-reloadable JSON lexicon)
+        self.keyword_scorer = KeywordScorer.from_env()
         
-    def clean_text(self, text: str) -> str:
-        """Clean and prepare text for summarization"""
-        if not text or not isinstance(text, str):
-            return ""
-            
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        # Content-addressed cache so syndicated copies skip inference
+        self.cache = SummaryCache.from_env()
         
-        # Remove extra whitespace
-        text = ' '.join(text.split())
+        # Concurrent calls for the same cleaned body share one inference call
+        self.single_flight = SingleFlight.from_env()
         
-        # Remove common news artifacts
-        text = re.sub(r'\(Reuters\)|\(AP\)|\(AFP\)', '', text)
-        text = re.sub(r'Read more:.*$', '', text, flags=re.MULTILINE)
-        text = re.sub(r'Source:.*$', '', text, flags=re.MULTILINE)
+        # Inference engine (remote HF API or local model), chosen by SUMMARIZE_BACKEND
+        self.backend = get_backend(self.model_name, self.hf_token)
         
-        # Ensure minimum length for meaningful summarization
-        if len(text.split()) < 50:
-            return text  # Too short to summarize effectively
-            
-        return text.strip()
+        # Batched inference: concurrent single calls are coalesced into forward passes
+        self.batched_inference = os.getenv('SUMMARIZE_BATCHED_INFERENCE', 'false').lower() in ('1', 'true', 'yes')
+        self.max_batch_tokens = int(os.getenv('SUMMARIZE_MAX_BATCH_TOKENS', 8192))
+        self.max_batch_size = int(os.getenv('SUMMARIZE_MAX_BATCH_SIZE', 16))
+        self.batcher = None
+        if self.batched_inference:
+            self.batcher = DynamicBatcher(
+                self.backend,
+                max_batch_tokens=self.max_batch_tokens,
+                max_batch_size=self.max_batch_size,
+                max_wait=int(os.getenv('SUMMARIZE_MAX_BATCH_WAIT_MS', 20)) / 1000.0
+            )
+        
+        # Hierarchical (map-reduce) summarization for articles past the model's input window
+        self.hierarchical = os.getenv('SUMMARIZE_HIERARCHICAL', 'true').lower() in ('1', 'true', 'yes')
+        self.chunk_tokens = int(os.getenv('SUMMARIZE_CHUNK_TOKENS', self.backend.max_input_tokens - 124))
+        self.chunk_words = max(1, int(self.chunk_tokens / 1.3))
+        self.chunk_max_length = int(os.getenv('SUMMARIZE_CHUNK_MAX_LENGTH', 120))
+        self.chunk_min_length = int(os.getenv('SUMMARIZE_CHUNK_MIN_LENGTH', 30))
+        self.max_reduce_depth = int(os.getenv('SUMMARIZE_MAX_REDUCE_DEPTH', 3))
+        
+        # Extractive engine for fallbacks and the no-inference tier; word budget tracks max_length tokens
+        self.extractive = ExtractiveSummarizer(
+            max_sentences=int(os.getenv('SUMMARIZE_EXTRACTIVE_SENTENCES', 3)),
+            max_words=max(20, int(self.max_length / 1.3))
+        )
+        
+        # Card and headline sizes next to the full summary, from the same inference pass
+        self.lengths = SummaryLengths.from_env(self.extractive)
+        
+    def clean_text(self, text: str) -> str:
+        """Clean and prepare text for summarization"""
+        # Single pass with precompiled patterns; see text_processing.normalize_text
+        return normalize_text(text).text
     
-    def enhance_conservative_context(self, text: str) -> str:
+    def enhance_conservative_context(self, text: str, match: Optional[KeywordMatch] = None) -> str:
         """
         Add conservative context to improve summarization relevance
         """
         # Check if text already contains conservative keywords
-        text_lower = text.lower()
-        conservative_score = sum(1 for keyword in self.conservative_keywords 
-                               if keyword in text_lower)
+        if match is None:
+            match = self.keyword_scorer.score(text)
+        conservative_score = match.distinct.get(CONTEXT_CATEGORY, 0)
         
         # If low conservative context, add subtle framing
         if conservative_score < 2:
             # Add context prefix for better summarization
-            context_prefix = "From a conservative perspective, this news story reports: "
-            text = context_prefix + text
+            text = CONTEXT_PREFIX + text
             
         return text
     
-    def summarize_article(self, article_data: Dict[str, Any]) -> Dict[str, Any]:
+    def summarize_article(self, article_data: Dict[str, Any],
+                          generation: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
         """
-        Summarize a single article using sshleifer model
+        Summarize a single article using sshleifer model.
+        generation overrides max_length / min_length / num_beams (a cheaper tier).
         """
         try:
-            # Extract text content
-            title = article_data.get('title', '')
-            content = article_data.get('content', '') or article_data.get('description', '') or article_data.get('summary', '')
+            result, job = self._prepare_article(article_data, generation)
+            if job is None:
+                return result
             
-            if not content:
-                logger.warning(f"No content found for article: {title}")
-                return {
-                    'success': False,
-                    'error': 'No content to summarize',
-                    'original_title': title
-                }
+            max_length, min_length, num_beams = self._generation_params(generation)
             
-            # Clean and prepare text
-            clean_content = self.clean_text(content)
-            if len(clean_content.split()) < 30:
-                # Too short, return original
-                return {
-                    'success': True,
-                    'summary': clean_content,
-                    'original_title': title,
-                    'method': 'original_too_short'
-                }
+            def infer():
+                if job['chunks'] is not None:
+                    return self.summarize_chunks(job['chunks'], generation, job['lengths'])
+                if self.batcher is not None:
+                    return self.batcher.generate(job['enhanced_content'], max_length, min_length,
+                                                 num_beams=num_beams, lengths=job['lengths'])
+                if job['lengths'] is not None:
+                    return self.backend.generate_lengths([job['enhanced_content']], job['lengths'], num_beams)[0]
+                return self.backend.generate(job['enhanced_content'], max_length, min_length, num_beams)
             
-            # Enhance with conservative context
-            enhanced_content = self.enhance_conservative_context(clean_content)
+            # Run inference on the configured backend
+            try:
+                with metrics.stage('request'):
+                    summary = self._coalesced(job, infer)
+            except (BackendError, DeadlineExceeded) as e:
+                logger.error(str(e))
+                # Fallback to extractive summary
+                return self.fallback_summary(job['clean_content'], job['title'])
             
-            # Prepare request to Hugging Face API
-            headers = {}
-            if self.hf_token:
-                headers['Authorization'] = f'Bearer {self.hf_token}'
+            return self._finish_article(job, summary)
+                
+        except Exception as e:
+            return self._summarization_error(article_data, e)
+    
+    async def summarize_article_async(self, article_data: Dict[str, Any], session=None,
+                                      generation: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """
+        Async variant of summarize_article for the asyncio batch pipeline
+        """
+        try:
+            result, job = self._prepare_article(article_data, generation)
+            if job is None:
+                return result
             
-            payload = {
-                'inputs': enhanced_content,
-                'parameters': {
-                    'max_length': self.max_length,
-                    'min_length': self.min_length,
-                    'do_sample': False,
-                    'num_beams': 4,
-                    'temperature': 0.7,
-                    'top_p': 0.9
-                }
-            }
+            max_length, min_length, num_beams = self._generation_params(generation)
             
-            # Make request to Hugging Face
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
+            async def infer():
+                if job['chunks'] is not None:
+                    import asyncio
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(None, contextvars.copy_context().run,
+                                                      self.summarize_chunks, job['chunks'], generation,
+                                                      job['lengths'])
+                if job['lengths'] is not None:
+                    return await self.backend.generate_lengths_async(
+                        session, job['enhanced_content'], job['lengths'], num_beams
+                    )
+                return await self.backend.generate_async(
+                    session, job['enhanced_content'], max_length, min_length, num_beams
+                )
             
-            if response.status_code == 200:
-                result = response.json()
-                
-                if isinstance(result, list) and len(result) > 0:
-                    summary = result[0].get('summary_text', '')
-                    
-                    # Post-process summary
-                    summary = self.post_process_summary(summary, title)
-                    
-                    return {
-                        'success': True,
-                        'summary': summary,
-                        'original_title': title,
-                        'method': 'sshleifer_model',
-                        'model': self.model_name
-                    }
-                else:
-                    raise ValueError("Unexpected API response format")
-                    
-            else:
-                logger.error(f"HuggingFace API error: {response.status_code} - {response.text}")
+            try:
+                with metrics.stage('request'):
+                    if self.single_flight is None:
+                        summary = await infer()
+                    else:
+                        summary = await self.single_flight.do_async(job['flight_key'], infer)
+            except (BackendError, DeadlineExceeded) as e:
+                logger.error(str(e))
                 # Fallback to extractive summary
-                return self.fallback_summary(clean_content, title)
-                
+                return self.fallback_summary(job['clean_content'], job['title'])
+            
+            return self._finish_article(job, summary)
+            
         except Exception as e:
-            logger.error(f"Summarization error for '{title}': {str(e)}")
-            logger.error(traceback.format_exc())
+            return self._summarization_error(article_data, e)
+    
+    def summarize_extractive(self, article_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Summarize without inference, for serving under heavy load.
+        Cached model summaries are still returned; everything else gets an
+        extractive summary with method 'extractive'.
+        """
+        try:
+            result, job = self._prepare_article(article_data)
+            if job is None:
+                return result
+            
+            return self.fallback_summary(job['clean_content'], job['title'], method='extractive')
+            
+        except Exception as e:
+            return self._summarization_error(article_data, e)
+    
+    def summarize_batch(self, articles: List[Dict[str, Any]],
+                        generation: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """
+        Summarize several articles with batched inference.
+        Inputs are bucketed by length and sent as padded batches within the
+        token budget; results come back in input order.
+        """
+        results = [None] * len(articles)
+        jobs = []
+        max_length, min_length, num_beams = self._generation_params(generation)
+        lengths = self._model_lengths(generation)
+        
+        for index, article_data in enumerate(articles):
+            try:
+                result, job = self._prepare_article(article_data, generation)
+            except Exception as e:
+                results[index] = self._summarization_error(article_data, e)
+                continue
+            
+            if job is None:
+                results[index] = result
+            else:
+                job['index'] = index
+                jobs.append(job)
+        
+        # Identical bodies, in this batch or in flight elsewhere, are generated once
+        leaders = jobs
+        followers = []
+        if self.single_flight is not None:
+            leaders = []
+            for job in jobs:
+                job['flight'], leader = self.single_flight.claim(job['flight_key'])
+                (leaders if leader else followers).append(job)
+        
+        # Long articles batch their own chunks
+        long_jobs = [job for job in leaders if job['chunks'] is not None]
+        leaders = [job for job in leaders if job['chunks'] is None]
+        token_counts = [self.backend.estimate_tokens(job['enhanced_content'], job['word_count']) for job in leaders]
+        
+        try:
+            for job in long_jobs:
+                try:
+                    summary = self.summarize_chunks(job['chunks'], generation, lengths)
+                except (BackendError, DeadlineExceeded) as e:
+                    logger.error(str(e))
+                    self._resolve_flights([job], error=e)
+                    results[job['index']] = self.fallback_summary(job['clean_content'], job['title'])
+                    continue
+                except Exception as e:
+                    self._resolve_flights([job], error=e)
+                    results[job['index']] = self._summarization_error(job['article'], e)
+                    continue
+                self._resolve_flights([job], [summary])
+                results[job['index']] = self._finish_article(job, summary)
             
-            # Fallback to extractive summary
-            return self.fallback_summary(content, title)
+            for batch in plan_batches(leaders, token_counts, self.max_batch_tokens, self.max_batch_size):
+                try:
+                    with metrics.stage('request'):
+                        texts = [job['enhanced_content'] for job in batch]
+                        if lengths is not None:
+                            summaries = self.backend.generate_lengths(texts, lengths, num_beams)
+                        else:
+                            summaries = self.backend.generate_batch(texts, max_length, min_length, num_beams)
+                except (BackendError, DeadlineExceeded) as e:
+                    logger.error(str(e))
+                    self._resolve_flights(batch, error=e)
+                    for job in batch:
+                        results[job['index']] = self.fallback_summary(job['clean_content'], job['title'])
+                    continue
+                except Exception as e:
+                    self._resolve_flights(batch, error=e)
+                    for job in batch:
+                        results[job['index']] = self._summarization_error(job['article'], e)
+                    continue
+                
+                self._resolve_flights(batch, summaries)
+                for job, summary in zip(batch, summaries):
+                    results[job['index']] = self._finish_article(job, summary)
+        finally:
+            # Never leave another caller waiting on a leader that didn't get to run
+            self._resolve_flights([job for job in long_jobs + leaders if 'flight' in job and not job['flight'].done()],
+                                  error=BackendError("Coalesced batch request was abandoned"))
+        
+        for job in followers:
+            try:
+                results[job['index']] = self._finish_article(job, SingleFlight.wait(job['flight']))
+            except (BackendError, DeadlineExceeded) as e:
+                logger.error(str(e))
+                results[job['index']] = self.fallback_summary(job['clean_content'], job['title'])
+            except Exception as e:
+                results[job['index']] = self._summarization_error(job['article'], e)
+        
+        return results
+    
+    def _coalesced(self, job: Dict[str, Any], infer):
+        """
+        infer(), shared with concurrent callers summarizing the same body
+        """
+        if self.single_flight is None:
+            return infer()
+        return self.single_flight.do(job['flight_key'], infer)
+    
+    def _resolve_flights(self, batch: List[Dict[str, Any]], summaries: Optional[List[str]] = None,
+                         error: Optional[Exception] = None):
+        if self.single_flight is None:
+            return
+        for i, job in enumerate(batch):
+            self.single_flight.resolve(job['flight_key'], job['flight'],
+                                       summaries[i] if summaries is not None else None, error)
+    
+    def _generation_params(self, generation: Optional[Dict[str, int]] = None):
+        """
+        (max_length, min_length, num_beams); num_beams None means the backend default
+        """
+        generation = generation or {}
+        return (generation.get('max_length', self.max_length),
+                generation.get('min_length', self.min_length),
+                generation.get('num_beams'))
+    
+    def _model_lengths(self, generation: Optional[Dict[str, int]] = None) -> Optional[List[Tuple[int, int]]]:
+        """
+        (max_length, min_length) of every size the model generates in one
+        pass, full first; None when only the full summary is generated.
+        Reduced settings (summary_tiering) get extractive cards instead.
+        """
+        if self.lengths is None or generation:
+            return None
+        return self.lengths.model_lengths(self.max_length, self.min_length)
+    
+    def generation_key(self, generation: Optional[Dict[str, int]] = None) -> str:
+        """
+        Model and generation settings a summary depends on, as one string
+        """
+        max_length, min_length, num_beams = self._generation_params(generation)
+        lengths = self._model_lengths(generation)
+        return f"{self.model_name}:{max_length}:{min_length}:{num_beams or 'default'}:{lengths or 'full'}"
+    
+    def _prepare_article(self, article_data: Dict[str, Any], generation: Optional[Dict[str, int]] = None):
+        """
+        Clean and enhance an article ahead of inference.
+        Returns (result, None) when no inference is needed, otherwise
+        (None, job) with the intermediate state for _finish_article.
+        A full-quality cached summary is served for any generation setting,
+        but output from a reduced setting is never cached.
+        """
+        # Extract text content
+        title = article_data.get('title', '')
+        content = article_data.get('content', '') or article_data.get('description', '') or article_data.get('summary', '')
+        
+        if not content:
+            logger.warning(f"No content found for article: {title}")
+            result = {
+                'success': False,
+                'error': 'No content to summarize',
+                'original_title': title
+            }
+            metrics.count_result(result)
+            return result, None
+        
+        # Clean and prepare text
+        with metrics.stage('clean'):
+            normalized = normalize_text(content)
+            clean_content = normalized.text
+            
+            # Stored with the summary so unchanged re-imports are skipped
+            fingerprint = content_fingerprint(clean_content)
+        
+        if normalized.word_count < 30:
+            # Too short, return original
+            result = {
+                'success': True,
+                'summary': clean_content,
+                'original_title': title,
+                'method': 'original_too_short',
+                'content_fingerprint': fingerprint
+            }
+            if self.lengths is not None:
+                result['summaries'] = self.lengths.build(clean_content)
+            metrics.count_result(result)
+            return result, None
+        
+        # Serve identical cleaned content from cache
+        cache_key = None
+        if self.cache is not None:
+            cache_key = SummaryCache.make_key(clean_content, self.model_name,
+                                              self.max_length, self.min_length)
+            cached = self.cache.get(cache_key)
+            # Entries from before card/headline sizes were enabled are regenerated with them
+            if cached is not None and (self.lengths is None or 'summaries' in cached):
+                cached['original_title'] = title
+                cached['cached'] = True
+                cached['content_fingerprint'] = fingerprint
+                metrics.count_result(cached)
+                return cached, None
+        
+        # Enhance with conservative context
+        with metrics.stage('enhance'):
+            keywords = self.keyword_scorer.score(clean_content)
+            enhanced_content = self.enhance_conservative_context(clean_content, keywords)
+        
+        # Text past the input window would be truncated; summarize it in chunks instead
+        chunks = None
+        if self.hierarchical and normalized.word_count > self.chunk_words:
+            chunks = chunk_text(clean_content, self.chunk_words)
+        
+        # Concurrent requests for the same input at the same settings share one call
+        flight_key = None
+        if self.single_flight is not None:
+            max_length, min_length, _ = self._generation_params(generation)
+            flight_key = SummaryCache.make_key(clean_content, self.generation_key(generation),
+                                               max_length, min_length)
+        
+        return None, {
+            'article': article_data,
+            'title': title,
+            'clean_content': clean_content,
+            'enhanced_content': enhanced_content,
+            'word_count': normalized.word_count,
+            'cache_key': cache_key,
+            'flight_key': flight_key,
+            'chunks': chunks,
+            'fingerprint': fingerprint,
+            'topics': keywords.topics(),
+            'lengths': self._model_lengths(generation),
+            'cacheable': not generation
+        }
+    
+    def summarize_chunks(self, chunks: List[str], generation: Optional[Dict[str, int]] = None,
+                         lengths: Optional[List[Tuple[int, int]]] = None):
+        """
+        Map-reduce summary of a long article.
+        Chunks are summarized in length-bucketed batches, then the joined chunk
+        summaries are re-chunked and reduced until they fit the input window,
+        and the final pass produces a summary at the normal length, or one
+        summary per entry of lengths.
+        """
+        depth = 0
+        while True:
+            combined = ' '.join(self._summarize_chunk_batch(chunks))
+            depth += 1
+            
+            if len(combined.split()) <= self.chunk_words or depth >= self.max_reduce_depth:
+                break
+            chunks = chunk_text(combined, self.chunk_words)
+        
+        max_length, min_length, num_beams = self._generation_params(generation)
+        if lengths is not None:
+            return self.backend.generate_lengths([self.enhance_conservative_context(combined)],
+                                                 lengths, num_beams)[0]
+        return self.backend.generate(self.enhance_conservative_context(combined),
+                                     max_length, min_length, num_beams)
+    
+    def _summarize_chunk_batch(self, chunks: List[str]) -> List[str]:
+        """
+        Summaries for each chunk, served from the cache where possible so an
+        edited article only re-summarizes the chunks that changed
+        """
+        summaries = [None] * len(chunks)
+        keys = [None] * len(chunks)
+        missing = []
+        
+        for i, chunk in enumerate(chunks):
+            if self.cache is not None:
+                keys[i] = SummaryCache.make_key(chunk, self.model_name + ':chunk',
+                                                self.chunk_max_length, self.chunk_min_length)
+                cached = self.cache.get(keys[i])
+                if cached is not None:
+                    summaries[i] = cached['summary']
+                    continue
+            missing.append(i)
+        
+        token_counts = [self.backend.estimate_tokens(chunks[i]) for i in missing]
+        for batch in plan_batches(missing, token_counts, self.max_batch_tokens, self.max_batch_size):
+            generated = self.backend.generate_batch(
+                [chunks[i] for i in batch], self.chunk_max_length, self.chunk_min_length
+            )
+            for i, summary in zip(batch, generated):
+                summaries[i] = summary
+                if keys[i] is not None:
+                    self.cache.set(keys[i], {'summary': summary})
+        
+        return summaries
+    
+    def _finish_article(self, job: Dict[str, Any], summary) -> Dict[str, Any]:
+        """
+        Post-process raw model output (one summary per job['lengths'] entry
+        when set) into the result contract and cache it
+        """
+        card = None
+        if job['lengths'] is not None:
+            summary, card = summary
+        
+        with metrics.stage('post_process'):
+            summary = self.post_process_summary(summary, job['title'])
+            if card is not None:
+                card = self.post_process_summary(card, job['title'])
+        
+        result = {
+            'success': True,
+            'summary': summary,
+            'original_title': job['title'],
+            'method': 'sshleifer_model',
+            'model': self.model_name,
+            'backend': self.backend.name,
+            'content_fingerprint': job['fingerprint'],
+            'topics': job['topics']
+        }
+        if job['chunks'] is not None:
+            result['chunks'] = len(job['chunks'])
+        if self.lengths is not None:
+            result['summaries'] = self.lengths.build(summary, card)
+        
+        # Only full-quality model output is cached; fallbacks should be retried
+        if job['cache_key'] is not None and job['cacheable']:
+            self.cache.set(job['cache_key'], result)
+        
+        metrics.count_result(result)
+        return result
+    
+    def _summarization_error(self, article_data: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """
+        Log an unexpected failure and fall back to an extractive summary
+        """
+        title = article_data.get('title', '')
+        content = article_data.get('content', '') or article_data.get('description', '') or article_data.get('summary', '')
+        
+        logger.error(f"Summarization error for '{title}': {str(error)}")
+        logger.error(traceback.format_exc())
+        
+        # Fallback to extractive summary
+        return self.fallback_summary(content, title)
     
     def post_process_summary(self, summary: str, title: str) -> str:
         """
         Post-process the generated summary for conservative news context
         """
         # Remove context prefix if it was added
-        summary = re.sub(r'^From a conservative perspective, this news story reports: ', '', summary, flags=re.IGNORECASE)
+        summary = strip_context_prefix(summary)
         
         # Ensure summary doesn't just repeat the title
         title_words = set(title.lower().split())
@@ -194,36 +564,55 @@ class AtlanticAnvilSummarizer:
         
         return summary
     
-    def fallback_summary(self, content: str, title: str) -> Dict[str, Any]:
+    def fallback_summary(self, content: str, title: str, method: str = 'extractive_fallback') -> Dict[str, Any]:
         """
         Fallback extractive summarization when API fails
         """
         try:
-            sentences = content.split('.')
-            sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
+            with metrics.stage('fallback'):
+                # Error paths pass raw content; normalization is memoized so clean input costs nothing
+                content = normalize_text(content).text
+                summary = self.extractive.summarize(content)
             
-            if len(sentences) >= 3:
-                # Take first 2-3 most informative sentences
-                summary = '. '.join(sentences[:2]) + '.'
-            elif len(sentences) >= 1:
-                summary = sentences[0] + '.'
-            else:
+            if not summary:
                 summary = content[:150] + '...' if len(content) > 150 else content
             
-            return {
+            result = {
                 'success': True,
                 'summary': summary,
                 'original_title': title,
-                'method': 'extractive_fallback'
+                'method': method
             }
+            if self.lengths is not None:
+                result['summaries'] = self.lengths.build(summary)
             
         except Exception as e:
             logger.error(f"Fallback summarization failed: {str(e)}")
-            return {
+            result = {
                 'success': False,
                 'error': str(e),
                 'original_title': title
             }
+        
+        metrics.count_result(result)
+        return result
+
+# Warm serverless instances reuse one summarizer: config, keyword list,
+# cache connection and the pooled HTTP session all survive between requests
+_SUMMARIZER = None
+_SUMMARIZER_LOCK = threading.Lock()
+
+
+def get_summarizer() -> AtlanticAnvilSummarizer:
+    """
+    Process-wide AtlanticAnvilSummarizer, built on first use
+    """
+    global _SUMMARIZER
+    with _SUMMARIZER_LOCK:
+        if _SUMMARIZER is None:
+            metrics.start_profiler_from_env()
+            _SUMMARIZER = AtlanticAnvilSummarizer()
+        return _SUMMARIZER
 
 def handler(request):
     """
@@ -261,8 +650,8 @@ def handler(request):
                 'body': json.dumps({'error': 'No data provided'})
             }
         
-        # Initialize summarizer
-        summarizer = AtlanticAnvilSummarizer()
+        # Reuse the warm summarizer
+        summarizer = get_summarizer()
         
         # Handle single article or multiple articles
         if isinstance(data, list):
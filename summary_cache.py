@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Summary Cache
+Content-addressed two-tier cache (in-memory LRU + SQLite) for article summaries
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(tempfile.gettempdir(), 'atlantic_anvil_summary_cache.sqlite3')
+
+
+class SummaryCache:
+    """
+    Two-tier summary cache keyed by a hash of the cleaned article content
+    plus the model settings that produced the summary.
+
+    The memory tier is a bounded LRU; the disk tier is a SQLite table that
+    survives process restarts and is shared between workers on one host.
+    """
+
+    def __init__(self, db_path: Optional[str] = DEFAULT_CACHE_PATH,
+                 max_memory_items: int = 1024,
+                 max_disk_items: int = 50000,
+                 ttl_seconds: int = 7 * 24 * 3600):
+        self.db_path = db_path
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self.ttl_seconds = ttl_seconds
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._writes_since_prune = 0
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'writes': 0,
+            'evictions': 0,
+            'expired': 0
+        }
+
+        if self.db_path:
+            try:
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+                self._conn.execute('PRAGMA journal_mode=WAL')
+                self._conn.execute(
+                    'CREATE TABLE IF NOT EXISTS summary_cache ('
+                    'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                    'created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+                )
+                self._conn.execute(
+                    'CREATE INDEX IF NOT EXISTS idx_summary_cache_accessed_at '
+                    'ON summary_cache(accessed_at)'
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Summary cache disk tier disabled ({self.db_path}): {str(e)}")
+                self._conn = None
+
+    @classmethod
+    def from_env(cls) -> Optional['SummaryCache']:
+        """
+        Build a cache from environment settings, or None if caching is disabled
+        """
+        if os.getenv('SUMMARIZE_CACHE_ENABLED', 'true').lower() in ('0', 'false', 'no'):
+            return None
+
+        return cls(
+            db_path=os.getenv('SUMMARIZE_CACHE_PATH', DEFAULT_CACHE_PATH) or None,
+            max_memory_items=int(os.getenv('SUMMARIZE_CACHE_MEMORY_ITEMS', 1024)),
+            max_disk_items=int(os.getenv('SUMMARIZE_CACHE_DISK_ITEMS', 50000)),
+            ttl_seconds=int(os.getenv('SUMMARIZE_CACHE_TTL_SECONDS', 7 * 24 * 3600))
+        )
+
+    @staticmethod
+    def make_key(clean_content: str, model_name: str, max_length: int, min_length: int) -> str:
+        """
+        Content-addressed key: identical cleaned bodies summarized with the
+        same model settings share one entry regardless of source or title
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{model_name}\x00{max_length}\x00{min_length}\x00".encode('utf-8'))
+        digest.update(clean_content.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result, promoting disk hits into the memory tier
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.stats['hits'] += 1
+                    self.stats['memory_hits'] += 1
+                    return dict(value)
+
+                del self._memory[key]
+                self.stats['expired'] += 1
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        'SELECT value, created_at FROM summary_cache WHERE key = ?', (key,)
+                    ).fetchone()
+
+                    if row is not None:
+                        value_json, created_at = row
+                        if now - created_at <= self.ttl_seconds:
+                            self._conn.execute(
+                                'UPDATE summary_cache SET accessed_at = ? WHERE key = ?', (now, key)
+                            )
+                            self._conn.commit()
+
+                            value = json.loads(value_json)
+                            self._remember(key, created_at, value)
+                            self.stats['hits'] += 1
+                            self.stats['disk_hits'] += 1
+                            return dict(value)
+
+                        self._conn.execute('DELETE FROM summary_cache WHERE key = ?', (key,))
+                        self._conn.commit()
+                        self.stats['expired'] += 1
+                except sqlite3.Error as e:
+                    logger.warning(f"Summary cache read failed: {str(e)}")
+
+            self.stats['misses'] += 1
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """
+        Store a result in both tiers
+        """
+        now = time.time()
+
+        with self._lock:
+            self._remember(key, now, dict(value))
+            self.stats['writes'] += 1
+
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO summary_cache (key, value, created_at, accessed_at) '
+                        'VALUES (?, ?, ?, ?)',
+                        (key, json.dumps(value), now, now)
+                    )
+                    self._conn.commit()
+
+                    # Amortize size-based eviction over many writes
+                    self._writes_since_prune += 1
+                    if self._writes_since_prune >= 100:
+                        self._prune_disk(now)
+                except sqlite3.Error as e:
+                    logger.warning(f"Summary cache write failed: {str(e)}")
+
+    def _remember(self, key: str, created_at: float, value: Dict[str, Any]):
+        """
+        Insert into the memory tier, evicting least recently used entries
+        """
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def _prune_disk(self, now: float):
+        """
+        Drop expired rows, then the least recently used rows over the size limit
+        """
+        self._writes_since_prune = 0
+
+        self._conn.execute('DELETE FROM summary_cache WHERE created_at < ?', (now - self.ttl_seconds,))
+
+        (count,) = self._conn.execute('SELECT COUNT(*) FROM summary_cache').fetchone()
+        overflow = count - self.max_disk_items
+        if overflow > 0:
+            self._conn.execute(
+                'DELETE FROM summary_cache WHERE key IN ('
+                'SELECT key FROM summary_cache ORDER BY accessed_at ASC LIMIT ?)',
+                (overflow,)
+            )
+            self.stats['evictions'] += overflow
+
+        self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return cache counters and hit rate
+        """
+        with self._lock:
+            stats = self.stats.copy()
+            stats['memory_items'] = len(self._memory)
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups > 0 else 0
+        return stats
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Summary Lengths
+Headline blurb, card and full summaries of an article from one inference pass
+"""
+
+import os
+import logging
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def trim_words(text: str, max_words: int) -> str:
+    """
+    text cut to at most max_words words, marked with an ellipsis when cut
+    """
+    words = text.split()
+    if len(words) <= max_words:
+        return text
+    return ' '.join(words[:max_words]).rstrip(',;:-') + '...'
+
+
+class SummaryLengths:
+    """
+    The summary sizes produced alongside the full summary.
+
+    The full summary keeps the summarizer's max/min length. The card is
+    generated in the same pass at card_max_length/card_min_length tokens
+    (see SummarizationBackend.generate_lengths), or trimmed extractively
+    from the full summary when no model card exists (fallbacks, reduced
+    tiers). The headline blurb is always extractive: the most central
+    sentence of the card, cut to headline_words, so it costs no inference.
+    """
+
+    def __init__(self, extractive, card_max_length: int = 60, card_min_length: int = 20,
+                 headline_words: int = 25):
+        self.extractive = extractive
+        self.card_max_length = card_max_length
+        self.card_min_length = min(card_min_length, card_max_length)
+        self.headline_words = headline_words
+        # Word budget of an extractive card; BPE averages ~1.3 tokens per word
+        self.card_words = max(headline_words, int(card_max_length / 1.3))
+
+    @classmethod
+    def from_env(cls, extractive) -> Optional['SummaryLengths']:
+        """
+        Lengths from SUMMARIZE_CARD_* / SUMMARIZE_HEADLINE_WORDS; None unless
+        SUMMARIZE_SUMMARY_LENGTHS is on
+        """
+        if os.getenv('SUMMARIZE_SUMMARY_LENGTHS', 'false').lower() not in ('1', 'true', 'yes'):
+            return None
+
+        return cls(
+            extractive,
+            card_max_length=int(os.getenv('SUMMARIZE_CARD_MAX_LENGTH', 60)),
+            card_min_length=int(os.getenv('SUMMARIZE_CARD_MIN_LENGTH', 20)),
+            headline_words=int(os.getenv('SUMMARIZE_HEADLINE_WORDS', 25))
+        )
+
+    @property
+    def card_length(self) -> Tuple[int, int]:
+        return self.card_max_length, self.card_min_length
+
+    def model_lengths(self, max_length: int, min_length: int) -> List[Tuple[int, int]]:
+        """
+        (max_length, min_length) of each model-generated size: full, then card
+        """
+        return [(max_length, min_length), self.card_length]
+
+    def card(self, summary: str) -> str:
+        """
+        Extractive card from a longer summary
+        """
+        if len(summary.split()) <= self.card_words:
+            return summary
+        card = self.extractive.summarize(summary, max_sentences=2, max_words=self.card_words) or summary
+        return trim_words(card, self.card_words)
+
+    def headline(self, text: str) -> str:
+        sentence = self.extractive.summarize(text, max_sentences=1, max_words=self.headline_words) or text
+        return trim_words(sentence, self.headline_words)
+
+    def build(self, summary: str, card: Optional[str] = None) -> Dict[str, str]:
+        """
+        {headline, card, full} for a finished summary and, if the model made one, its card
+        """
+        card = card or self.card(summary)
+        return {
+            'headline': self.headline(card),
+            'card': card,
+            'full': summary
+        }
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Summary Tiering
+Routes each article in a batch to the full model, a cheaper model
+setting or extractive summarization, within a per-batch latency budget
+"""
+
+import os
+import math
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Any, Tuple
+
+from priority_scheduler import PriorityScheduler
+from text_processing import normalize_text
+
+logger = logging.getLogger(__name__)
+
+FULL = 'full'
+FAST = 'fast'
+EXTRACTIVE = 'extractive'
+
+
+class TierRouter:
+    """
+    Per-batch tier assignment under a latency budget.
+
+    Every article is guaranteed at least the extractive tier. Articles are
+    then upgraded in order of value (priority score from recency,
+    engagement and source weight, plus keyword hits, discounted for very
+    short articles) while their estimated cost fits the batch's compute
+    budget: budget_seconds of wall time across `parallelism` concurrent
+    requests. Full-tier articles get the configured beams and length;
+    fast-tier articles get fast_beams and a shorter summary.
+
+    Cost per article is learned online: an EWMA of observed seconds per
+    tier, scaled by input length relative to that tier's average. After
+    each batch its wall time is compared with the SLO and the budget scale
+    adapts AIMD-style: overshoot cuts it by a third, on-time batches
+    slowly restore it. Below overload_scale the full tier is switched
+    off, so every model article runs with reduced beams and length.
+    """
+
+    def __init__(self, slo_seconds: float = 10.0, budget_seconds: Optional[float] = None,
+                 parallelism: int = 5, max_length: int = 150, min_length: int = 50,
+                 fast_beams: int = 1, fast_length_ratio: float = 0.6,
+                 overload_scale: float = 0.5, scheduler: Optional[PriorityScheduler] = None,
+                 keyword_scorer=None):
+        self.slo_seconds = slo_seconds
+        # Headroom for estimation error and fallbacks
+        self.budget_seconds = budget_seconds if budget_seconds is not None else slo_seconds * 0.8
+        self.parallelism = max(1, parallelism)
+        self.overload_scale = overload_scale
+        self.scheduler = scheduler or PriorityScheduler()
+        self.keyword_scorer = keyword_scorer
+
+        self.generation = {
+            FULL: None,
+            FAST: {'max_length': max(20, int(max_length * fast_length_ratio)),
+                   'min_length': max(10, int(min_length * fast_length_ratio)),
+                   'num_beams': fast_beams}
+        }
+
+        # Starting guesses; replaced by observations after the first batches
+        self._cost = {FULL: 2.0, FAST: 2.0 * fast_beams / 4.0, EXTRACTIVE: 0.005}
+        self._tokens = {FULL: 600.0, FAST: 600.0, EXTRACTIVE: 600.0}
+        self._alpha = 0.2
+        self.scale = 1.0
+
+        self._lock = threading.Lock()
+        self._batch_seconds = deque(maxlen=200)
+        self.last_plan = {}
+        self.stats = {
+            'batches': 0,
+            'slo_misses': 0,
+            FULL: 0,
+            FAST: 0,
+            EXTRACTIVE: 0
+        }
+
+    @classmethod
+    def from_env(cls, summarizer, parallelism: int,
+                 scheduler: Optional[PriorityScheduler] = None) -> Optional['TierRouter']:
+        """
+        Router from SUMMARIZE_TIER_* settings; None unless SUMMARIZE_TIERING is on
+        """
+        if os.getenv('SUMMARIZE_TIERING', 'false').lower() not in ('1', 'true', 'yes'):
+            return None
+
+        budget = float(os.getenv('SUMMARIZE_TIER_BUDGET_SECONDS', 0))
+        return cls(
+            slo_seconds=float(os.getenv('SUMMARIZE_TIER_SLO_SECONDS', 10)),
+            budget_seconds=budget or None,
+            parallelism=parallelism,
+            max_length=summarizer.max_length,
+            min_length=summarizer.min_length,
+            fast_beams=int(os.getenv('SUMMARIZE_TIER_FAST_BEAMS', 1)),
+            fast_length_ratio=float(os.getenv('SUMMARIZE_TIER_FAST_LENGTH_RATIO', 0.6)),
+            scheduler=scheduler,
+            keyword_scorer=summarizer.keyword_scorer
+        )
+
+    def _features(self, article: Dict[str, Any]) -> Tuple[float, int]:
+        """
+        (value, estimated input tokens) from cheap article features
+        """
+        content = article.get('content', '') or article.get('description', '') or article.get('summary', '')
+        normalized = normalize_text(content)
+
+        value = self.scheduler.score(article)
+        if self.keyword_scorer is not None:
+            match = self.keyword_scorer.score(normalized.text)
+            value += 0.05 * min(6, sum(match.distinct.values()))
+
+        # Short articles lose little from an extractive summary
+        value *= min(1.0, normalized.word_count / 200.0)
+        return value, min(1024, int(normalized.word_count * 1.3) + 2)
+
+    def estimate(self, tier: str, tokens: int) -> float:
+        average = self._tokens[tier]
+        return self._cost[tier] * (0.5 + 0.5 * tokens / average)
+
+    def route(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Copies of the articles annotated with their '_tier' and '_tokens'
+        """
+        tiers, tokens = self._plan(articles)
+        return [dict(article, _tier=tier, _tokens=count) for article, tier, count in zip(articles, tiers, tokens)]
+
+    def assign(self, articles: List[Dict[str, Any]]) -> List[str]:
+        """
+        Tier for each article, in input order
+        """
+        return self._plan(articles)[0]
+
+    def _plan(self, articles: List[Dict[str, Any]]) -> Tuple[List[str], List[int]]:
+        with self._lock:
+            scale = self.scale
+
+        compute_budget = self.budget_seconds * self.parallelism * scale
+        overloaded = scale < self.overload_scale
+        features = [self._features(article) for article in articles]
+        tiers = [EXTRACTIVE] * len(articles)
+
+        spent = sum(self.estimate(EXTRACTIVE, tokens) for _, tokens in features)
+        for index in sorted(range(len(articles)), key=lambda i: -features[i][0]):
+            tokens = features[index][1]
+            base = self.estimate(EXTRACTIVE, tokens)
+            for tier in ((FAST,) if overloaded else (FULL, FAST)):
+                cost = self.estimate(tier, tokens) - base
+                if spent + cost <= compute_budget:
+                    tiers[index] = tier
+                    spent += cost
+                    break
+
+        counts = {tier: tiers.count(tier) for tier in (FULL, FAST, EXTRACTIVE)}
+        with self._lock:
+            for tier, count in counts.items():
+                self.stats[tier] += count
+            self.last_plan = {
+                'articles': len(articles),
+                'tiers': counts,
+                'budget_seconds': round(compute_budget / self.parallelism, 3),
+                'estimated_seconds': round(spent / self.parallelism, 3),
+                'budget_used': round(spent / compute_budget, 3) if compute_budget > 0 else None,
+                'scale': round(scale, 3),
+                'overloaded': overloaded
+            }
+
+        if overloaded:
+            logger.warning(f"Tiering overloaded (budget scale {scale:.2f}); full model tier disabled")
+        return tiers, [tokens for _, tokens in features]
+
+    def observe(self, tier: str, tokens: int, seconds: float):
+        """
+        Feed back the measured time of one summarized article, in
+        request-slot seconds
+        """
+        with self._lock:
+            self._cost[tier] += self._alpha * (seconds - self._cost[tier])
+            self._tokens[tier] += self._alpha * (max(1, tokens) - self._tokens[tier])
+
+    def finish_batch(self, seconds: float):
+        """
+        Record a batch's wall time and adapt the budget scale to the SLO
+        """
+        with self._lock:
+            self._batch_seconds.append(seconds)
+            self.stats['batches'] += 1
+            if seconds > self.slo_seconds:
+                self.stats['slo_misses'] += 1
+                self.scale = max(0.05, self.scale * 0.67)
+            else:
+                self.scale = min(1.0, self.scale + 0.05)
+
+            if self.last_plan:
+                self.last_plan['actual_seconds'] = round(seconds, 3)
+                self.last_plan['actual_budget_used'] = round(
+                    seconds / self.budget_seconds, 3) if self.budget_seconds else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self.stats.copy()
+            stats['slo_seconds'] = self.slo_seconds
+            stats['scale'] = round(self.scale, 3)
+            stats['last_batch'] = dict(self.last_plan)
+            stats['cost_estimates'] = {tier: round(cost, 4) for tier, cost in self._cost.items()}
+            latencies = sorted(self._batch_seconds)
+
+        if latencies:
+            stats['batch_p50_seconds'] = round(latencies[len(latencies) // 2], 3)
+            stats['batch_p99_seconds'] = round(latencies[min(len(latencies) - 1, math.ceil(len(latencies) * 0.99) - 1)], 3)
+        return stats
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Summary Writeback
+Buffers summarization results and writes them to articles and
+summarization_queue as batched upserts
+"""
+
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+
+def result_to_row(result: Dict[str, Any], claimed_by: Optional[str] = None,
+                  retries_left: bool = True) -> Dict[str, Any]:
+    """
+    Writeback row for one BatchSummarizer result. Extractive fallbacks and
+    failures stay pending so the queue worker retries the model later.
+    """
+    row = {
+        'article_id': result.get('article_id'),
+        'summary': None,
+        'content_fingerprint': None,
+        'error_message': None,
+        'claimed_by': claimed_by,
+        'processed_at': result.get('processed_at') or datetime.now().isoformat()
+    }
+
+    if result.get('success'):
+        row['summary'] = result.get('summary')
+        row['content_fingerprint'] = result.get('content_fingerprint')
+        # Card and headline sizes (summary_lengths) go out in the same row as the full summary
+        sizes = result.get('summaries') or {}
+        row['summary_card'] = sizes.get('card')
+        row['summary_headline'] = sizes.get('headline')
+        if result.get('method') == 'extractive_fallback' and retries_left:
+            row['status'] = 'pending'
+            row['error_message'] = 'Extractive fallback used; retrying model'
+        else:
+            row['status'] = 'completed'
+    else:
+        row['status'] = 'pending' if retries_left else 'failed'
+        row['error_message'] = result.get('error', 'Unknown summarization error')
+
+    return row
+
+
+class SummaryWriter:
+    """
+    Write-behind buffer in front of QueueStore.upsert_results.
+
+    Rows are keyed by article id, so a newer result replaces a buffered
+    older one. The buffer is flushed once it holds batch_size rows or its
+    oldest row is flush_interval seconds old, as one multi-row statement
+    per table per batch_size rows. The upserts are idempotent: a row only
+    applies if its processed_at is newer than the stored one and the queue
+    row is not leased to a different worker, so a flush retried after a
+    partial failure changes nothing twice.
+    """
+
+    def __init__(self, store, batch_size: int = 500, flush_interval: float = 2.0):
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._buffer = {}
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        self.stats = {
+            'buffered': 0,
+            'flushes': 0,
+            'rows_written': 0,
+            'failed_flushes': 0,
+            'flush_seconds': 0.0
+        }
+
+    @classmethod
+    def from_env(cls, store) -> 'SummaryWriter':
+        return cls(
+            store,
+            batch_size=int(os.getenv('SUMMARIZE_WRITEBACK_BATCH_SIZE', 500)),
+            flush_interval=float(os.getenv('SUMMARIZE_WRITEBACK_FLUSH_SECONDS', 2.0))
+        )
+
+    def add(self, row: Dict[str, Any]):
+        if row.get('article_id') is None:
+            return
+
+        with self._lock:
+            if not self._buffer:
+                self._oldest = time.monotonic()
+            self._buffer[row['article_id']] = row
+            self.stats['buffered'] += 1
+
+        self.maybe_flush()
+
+    def add_many(self, rows: List[Dict[str, Any]]):
+        for row in rows:
+            self.add(row)
+
+    def add_results(self, results: List[Dict[str, Any]], claimed_by: Optional[str] = None):
+        self.add_many([result_to_row(result, claimed_by) for result in results])
+
+    def due(self) -> bool:
+        with self._lock:
+            if not self._buffer:
+                return False
+            return (len(self._buffer) >= self.batch_size
+                    or time.monotonic() - self._oldest >= self.flush_interval)
+
+    def maybe_flush(self) -> int:
+        """
+        Flush if the size or age trigger fired; errors are logged and the
+        rows stay buffered for the next attempt
+        """
+        if not self.due():
+            return 0
+        try:
+            return self.flush()
+        except Exception as e:
+            logger.error(f"Summary writeback failed, {len(self)} rows kept for retry: {str(e)}")
+            return 0
+
+    def flush(self) -> int:
+        """
+        Write everything buffered; returns the number of rows written.
+        On failure the unwritten rows go back in the buffer and the error is raised.
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows = list(self._buffer.values())
+                self._buffer = {}
+                self._oldest = None
+
+            written = 0
+            start = time.perf_counter()
+            try:
+                for i in range(0, len(rows), self.batch_size):
+                    batch = rows[i:i + self.batch_size]
+                    self.store.upsert_results(batch)
+                    written += len(batch)
+            except Exception:
+                self.stats['failed_flushes'] += 1
+                self._requeue(rows[written:])
+                raise
+            finally:
+                self.stats['flush_seconds'] += time.perf_counter() - start
+                self.stats['rows_written'] += written
+
+            if rows:
+                self.stats['flushes'] += 1
+            return written
+
+    def _requeue(self, rows: List[Dict[str, Any]]):
+        with self._lock:
+            for row in rows:
+                # Don't clobber a newer result that arrived during the flush
+                self._buffer.setdefault(row['article_id'], row)
+            if self._buffer and self._oldest is None:
+                self._oldest = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.copy()
+        stats['pending'] = len(self)
+        stats['flush_seconds'] = round(stats['flush_seconds'], 4)
+        return stats
+
+    def close(self):
+        self.flush()
+        self.store.close()
+
+
+# Warm instances keep one store connection and writer between requests
+_SUMMARY_WRITER = None
+_SUMMARY_WRITER_LOCK = threading.Lock()
+
+
+def get_summary_writer() -> Optional[SummaryWriter]:
+    """
+    Process-wide writer over the configured queue store, or None when no
+    database is configured or SUMMARIZE_WRITEBACK is off
+    """
+    global _SUMMARY_WRITER
+    if os.getenv('SUMMARIZE_WRITEBACK', 'true').lower() not in ('1', 'true', 'yes'):
+        return None
+
+    with _SUMMARY_WRITER_LOCK:
+        if _SUMMARY_WRITER is None:
+            from queue_worker import store_from_env
+            store = store_from_env()
+            if store is None:
+                return None
+            _SUMMARY_WRITER = SummaryWriter.from_env(store)
+        return _SUMMARY_WRITER
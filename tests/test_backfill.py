@@ -0,0 +1,112 @@
+import glob
+import json
+import os
+
+import pytest
+
+from backfill import Backfill, ShardedResultWriter, iter_jsonl
+
+
+class Killed(BaseException):
+    """Stands in for the process dying"""
+
+
+class FakeBatchProcessor:
+    def __init__(self, fail_on_batch=None):
+        self.batches = 0
+        self.fail_on_batch = fail_on_batch
+
+    def reset_stats(self):
+        pass
+
+    def process_batch(self, articles):
+        self.batches += 1
+        if self.batches == self.fail_on_batch:
+            raise Killed()
+        return [{'article_id': article['id'], 'success': True, 'summary': 'summary'} for article in articles]
+
+
+def write_dump(path, count):
+    with open(path, 'w') as f:
+        for i in range(count):
+            f.write(json.dumps({'id': f"a{i}", 'content': f"article {i} " * 5}) + '\n')
+            if i % 7 == 3:
+                f.write('\n{not json\n')
+
+
+def read_results(directory):
+    ids = []
+    for path in sorted(glob.glob(os.path.join(directory, 'results-*.jsonl'))):
+        with open(path) as f:
+            ids.extend(json.loads(line)['article_id'] for line in f)
+    return ids
+
+
+def kill_at_checkpoint(backfill, call):
+    """Die on the given save_checkpoint call: its chunk's results are written and synced, the checkpoint isn't"""
+    save = backfill.save_checkpoint
+    calls = [0]
+
+    def dying_save(complete=False):
+        calls[0] += 1
+        if calls[0] == call:
+            raise Killed()
+        save(complete)
+
+    backfill.save_checkpoint = dying_save
+
+
+@pytest.mark.parametrize('kill', [('process', 1), ('process', 4), ('checkpoint', 1), ('checkpoint', 3),
+                                  ('checkpoint', 4)])
+def test_kill_and_resume_writes_each_result_once(tmp_path, kill):
+    dump = str(tmp_path / 'articles.jsonl')
+    output = str(tmp_path / 'out')
+    write_dump(dump, 23)
+
+    where, n = kill
+    first = Backfill(dump, output, FakeBatchProcessor(fail_on_batch=n if where == 'process' else None),
+                     chunk_size=4, shard_size=5)
+    if where == 'checkpoint':
+        kill_at_checkpoint(first, n)
+    first.load_checkpoint()
+    with pytest.raises(Killed):
+        first.run()
+
+    resumed = Backfill(dump, output, FakeBatchProcessor(), chunk_size=4, shard_size=5)
+    assert resumed.load_checkpoint() == os.path.exists(os.path.join(output, 'checkpoint.json'))
+    report = resumed.run()
+
+    ids = read_results(output)
+    assert sorted(ids) == sorted(f"a{i}" for i in range(23))
+    assert len(ids) == len(set(ids))
+    assert report['complete']
+    assert report['summarized'] == 23
+    assert report['invalid'] == 3  # counted once, even where a chunk was redone
+
+
+def test_iter_jsonl_resumes_from_any_offset(tmp_path):
+    dump = str(tmp_path / 'articles.jsonl')
+    write_dump(dump, 10)
+    items = list(iter_jsonl(dump))
+    assert [article['id'] for _, article in items] == [f"a{i}" for i in range(10)]
+
+    for index, (offset, _) in enumerate(items):
+        rest = [article['id'] for _, article in iter_jsonl(dump, offset)]
+        assert rest == [f"a{i}" for i in range(index + 1, 10)]
+
+
+def test_restore_truncates_and_drops_later_shards(tmp_path):
+    writer = ShardedResultWriter(str(tmp_path), shard_size=2)
+    writer.write([{'article_id': 1}, {'article_id': 2}, {'article_id': 3}])
+    writer.sync()
+    state = writer.state()
+    writer.write([{'article_id': 4}, {'article_id': 5}, {'article_id': 6}])
+    writer.close()
+
+    restored = ShardedResultWriter(str(tmp_path), shard_size=2)
+    restored.restore(state)
+    restored.write([{'article_id': 'x'}])
+    restored.close()
+
+    assert read_results(str(tmp_path)) == [1, 2, 3, 'x']
+    assert not os.path.exists(restored.path(2))
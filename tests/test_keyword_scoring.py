@@ -0,0 +1,36 @@
+from keyword_scoring import DEFAULT_LEXICON, KeywordLexicon, CONTEXT_CATEGORY
+
+
+def baseline_distinct(text, terms):
+    # The original context check: how many of the category's keywords occur in the text
+    return sum(1 for term in terms if term in text.lower())
+
+
+def test_nested_terms_count_once_per_category():
+    lexicon = KeywordLexicon.from_config(DEFAULT_LEXICON)
+    text = 'President Trump spoke. Later, Trump met Republican leaders.'
+    match = lexicon.score(text)
+
+    assert match.distinct[CONTEXT_CATEGORY] == 2  # trump, republican
+    assert match.distinct['trump'] == 2  # trump, president trump
+
+
+def test_distinct_matches_baseline_keyword_count():
+    lexicon = KeywordLexicon.from_config(DEFAULT_LEXICON)
+    texts = [
+        'President Trump said the border security bill protects liberty.',
+        'The GOP and conservative groups rallied for the Second Amendment.',
+        'Nothing relevant here at all.'
+    ]
+    for text in texts:
+        match = lexicon.score(text)
+        assert match.distinct.get(CONTEXT_CATEGORY, 0) == baseline_distinct(text, DEFAULT_LEXICON[CONTEXT_CATEGORY])
+
+
+def test_nested_term_still_scores_its_category():
+    lexicon = KeywordLexicon.from_config(DEFAULT_LEXICON)
+    match = lexicon.score('president trump')
+
+    assert match.hits == {'president trump': 1}
+    assert match.scores[CONTEXT_CATEGORY] == 1.0
+    assert match.distinct[CONTEXT_CATEGORY] == 1
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+import near_duplicates
+from near_duplicates import NearDuplicateIndex
+
+
+def words(count, seed):
+    rng = random.Random(seed)
+    return ' '.join(f'word{rng.randrange(2000)}' for _ in range(count))
+
+
+@pytest.mark.parametrize('count', [1, 2, 3, 60, 2500])
+def test_numpy_signature_matches_pure_python(monkeypatch, count):
+    pytest.importorskip('numpy')
+    index = NearDuplicateIndex(None)
+    text = words(count, seed=count)
+
+    vectorized = index.signature(text)
+    monkeypatch.setattr(near_duplicates, 'USE_NUMPY', False)
+    assert index.signature(text) == vectorized
+
+
+def test_readding_an_article_keeps_member_count():
+    index = NearDuplicateIndex(None)
+    text = words(80, seed=1)
+    cluster_id = index.assign('a', text)
+
+    assert index.assign('a', text) == cluster_id
+    assert index.assign('b', text) == cluster_id
+    assert index.get_stats()['indexed_articles'] == 2
+
+
+def test_assign_prunes_expired_clusters(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(near_duplicates.time, 'time', lambda: clock[0])
+    index = NearDuplicateIndex(None, ttl_seconds=60)
+
+    first = index.assign('a', words(80, seed=1))
+    clock[0] += 3600
+    index.assign('b', words(80, seed=2))
+
+    assert index.get_stats()['clusters'] == 1
+    assert index.assign('c', words(80, seed=1)) != first
@@ -0,0 +1,42 @@
+import gc
+
+from priority_scheduler import PriorityScheduler
+
+
+def article(article_id, views=0):
+    return {'id': article_id, 'views_count': views, 'published_at': '2024-01-01T00:00:00Z'}
+
+
+def test_spawned_children_do_not_share_entries():
+    parent = PriorityScheduler()
+    first, second = parent.spawn(), parent.spawn()
+    first.push(article('a'))
+    second.push(article('b'))
+
+    assert first.pop()['id'] == 'a'
+    assert first.pop() is None
+    assert second.pop()['id'] == 'b'
+
+
+def test_parent_reports_depth_of_live_children():
+    parent = PriorityScheduler()
+    child = parent.spawn()
+    child.push_many([article('a'), article('b')])
+
+    assert parent.get_stats()['depth'] == 2
+    assert parent.get_stats()['enqueued'] == 2
+
+    child.pop()
+    assert parent.get_stats()['depth'] == 1
+
+    # An abandoned child's leftovers stop counting once it is collected
+    del child
+    gc.collect()
+    assert parent.get_stats()['depth'] == 0
+
+
+def test_pop_order_follows_priority():
+    scheduler = PriorityScheduler().spawn()
+    scheduler.push_many([article('quiet', views=0), article('popular', views=10000)])
+
+    assert [item['id'] for item in scheduler.pop_batch(2)] == ['popular', 'quiet']
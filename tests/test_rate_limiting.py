@@ -0,0 +1,37 @@
+from rate_limiting import CircuitBreaker
+
+
+def open_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    return breaker
+
+
+def test_only_the_probe_can_release_it():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    allowed, early = breaker.admit()  # admitted while closed: not a probe
+    assert allowed and early is None
+
+    breaker.record_failure()
+    allowed, probe = breaker.admit()
+    assert allowed and probe is not None
+    assert breaker.admit() == (False, None)
+
+    # A stale token leaves the running probe in place
+    breaker.release_probe(probe - 1)
+    assert breaker.admit() == (False, None)
+
+    breaker.release_probe(probe)
+    allowed, second = breaker.admit()
+    assert allowed and second != probe
+
+
+def test_released_token_is_stale_after_a_verdict():
+    breaker = open_breaker()
+    _, probe = breaker.admit()
+    breaker.record_failure()
+
+    _, next_probe = breaker.admit()
+    breaker.release_probe(probe)
+    assert breaker.admit() == (False, None)
+    assert next_probe is not None
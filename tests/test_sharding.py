@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+import sharding
+from sharding import HashRing, RING_SIZE
+
+
+def covering(ring):
+    intervals = sorted((start, end, node) for node in ring.nodes for start, end in ring.ranges(node))
+    return intervals
+
+
+@pytest.mark.parametrize('nodes, vnodes', [(1, 1), (1, 64), (2, 1), (3, 8), (5, 64)])
+def test_ranges_cover_the_ring_exactly_once(nodes, vnodes):
+    ring = HashRing([f"worker-{i}" for i in range(nodes)], vnodes=vnodes)
+    intervals = covering(ring)
+
+    assert intervals[0][0] == 0
+    assert intervals[-1][1] == RING_SIZE
+    for (_, end, _), (start, _, _) in zip(intervals, intervals[1:]):
+        assert end == start  # no gap, no overlap
+    for start, end, _ in intervals:
+        assert start < end
+
+
+def test_single_node_owns_the_whole_ring():
+    ring = HashRing(['only'], vnodes=16)
+    assert ring.ranges('only') == [(0, RING_SIZE)]
+
+
+def test_owner_agrees_with_ranges(monkeypatch):
+    ring = HashRing([f"worker-{i}" for i in range(4)], vnodes=16)
+    ranges = {node: ring.ranges(node) for node in ring.nodes}
+
+    # Let integer keys stand for their own ring position to probe the arc edges
+    position_of = sharding.ring_position
+    monkeypatch.setattr(sharding, 'ring_position', lambda key: key if isinstance(key, int) else position_of(key))
+
+    points = [position for position, _ in ring._points]
+    rng = random.Random(0)
+    probes = {0, 1, RING_SIZE - 1} | {rng.randrange(RING_SIZE) for _ in range(500)}
+    for point in points:
+        probes.update(p for p in (point - 1, point, point + 1) if 0 <= p < RING_SIZE)
+
+    for position in probes:
+        owner = ring.owner(position)
+        assert any(start <= position < end for start, end in ranges[owner]), position
+
+
+def test_removing_a_node_only_moves_its_own_keys():
+    nodes = [f"worker-{i}" for i in range(4)]
+    ring = HashRing(nodes)
+    keys = [f"article-{i}" for i in range(2000)]
+    before = {key: ring.owner(key) for key in keys}
+
+    ring.remove('worker-2')
+    for key in keys:
+        if before[key] != 'worker-2':
+            assert ring.owner(key) == before[key]
+        else:
+            assert ring.owner(key) != 'worker-2'
+
+
+def test_empty_ring_has_no_owner():
+    ring = HashRing()
+    assert ring.owner('anything') is None
+    assert ring.ranges('nobody') == []
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Atlantic Anvil News - Text Processing
+Precompiled, single-pass text normalization shared by the summarization stages
+"""
+
+import re
+import zlib
+from functools import lru_cache
+from typing import List
+
+# HTML tags and wire-service credits are dropped in the same substitution pass
+_STRIP_RE = re.compile(r'<[^>]+>|\((?:Reuters|AP|AFP)\)')
+
+# Everything from the first trailer marker onwards is boilerplate
+_TRAILER_RE = re.compile(r'Read more:|Source:')
+
+CONTEXT_PREFIX = "From a conservative perspective, this news story reports: "
+_CONTEXT_PREFIX_RE = re.compile('^' + re.escape(CONTEXT_PREFIX), re.IGNORECASE)
+
+
+class NormalizedText:
+    """
+    Cleaned article text plus the intermediate results every stage needs.
+    Words come from the same split that normalized the whitespace; lowercase
+    text and sentence segments are computed at most once, on first use.
+    """
+
+    __slots__ = ('text', 'words', '_lower', '_sentences')
+
+    def __init__(self, text: str, words: List[str]):
+        self.text = text
+        self.words = words
+        self._lower = None
+        self._sentences = None
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def sentences(self) -> List[str]:
+        """
+        Stripped '.'-delimited segments (empty segments dropped)
+        """
+        if self._sentences is None:
+            self._sentences = split_sentences(self.text)
+        return self._sentences
+
+
+@lru_cache(maxsize=256)
+def normalize_text(text: str) -> NormalizedText:
+    """
+    Strip HTML, wire credits and trailers, and collapse whitespace.
+
+    One regex pass removes tags and credits, one search finds the trailer,
+    and a single split both normalizes whitespace and yields the word list.
+    Results are memoized so the dedup, cache-key and inference stages share
+    the work for the same article body.
+    """
+    if not text or not isinstance(text, str):
+        return NormalizedText('', [])
+
+    text = _STRIP_RE.sub('', text)
+
+    trailer = _TRAILER_RE.search(text)
+    if trailer is not None:
+        text = text[:trailer.start()]
+
+    words = text.split()
+    return NormalizedText(' '.join(words), words)
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split on '.' and strip, the segmentation the summary post-processing uses
+    """
+    return [segment for segment in (s.strip() for s in text.split('.')) if segment]
+
+
+def strip_context_prefix(summary: str) -> str:
+    """
+    Remove the framing prefix added by enhance_conservative_context
+    """
+    return _CONTEXT_PREFIX_RE.sub('', summary, count=1)
+
+
+# Sentence boundary: whitespace following terminal punctuation (punctuation is kept)
+_SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])\s+|(?<=[a-z0-9][.!?])(?=[A-Z])')
+
+
+def segment_sentences(text: str) -> List[str]:
+    """
+    Sentences with their terminal punctuation kept, for extractive output
+    """
+    return [sentence.strip() for sentence in _SENTENCE_BOUNDARY_RE.split(text) if sentence.strip()]
+
+
+def chunk_text(text: str, max_words: int) -> List[str]:
+    """
+    Split text into sentence-aligned chunks of at most max_words words.
+
+    Once a chunk is half full it is closed after any sentence whose hash hits
+    a fixed residue, so boundaries depend on local content rather than on
+    the article's start. An edit then only changes the chunks around it and
+    the rest keep their cached summaries. A single sentence longer than the
+    budget is cut on word boundaries.
+    """
+    chunks = []
+    current = []
+    current_words = 0
+    min_words = max_words // 2
+
+    for sentence in _SENTENCE_BOUNDARY_RE.split(text):
+        words = sentence.split()
+        if not words:
+            continue
+
+        if current and current_words + len(words) > max_words:
+            chunks.append(' '.join(current))
+            current = []
+            current_words = 0
+
+        while len(words) > max_words:
+            chunks.append(' '.join(words[:max_words]))
+            words = words[max_words:]
+
+        current.extend(words)
+        current_words += len(words)
+
+        if current_words >= min_words and zlib.crc32(sentence.encode('utf-8')) % 4 == 0:
+            chunks.append(' '.join(current))
+            current = []
+            current_words = 0
+
+    if current:
+        chunks.append(' '.join(current))
+
+    return chunks